@@ -1,4 +1,5 @@
 from data.ability_data import ABILITY_DATA
+from combat_events import get_combat_events, PROC, REFLECT
 
 def ability_handler(phase):
     def decorator(fn):
@@ -6,21 +7,32 @@ def ability_handler(phase):
         return fn
     return decorator
 
+def _emit_proc(context, ability_id, level):
+    events = get_combat_events()
+    if events.active:
+        player = context["player"]
+        events.emit(PROC, player.id, getattr(context.get("target"), "id", None), level, ability_id)
+
+def _emit_reflect(context, attacker, amount, ability_id):
+    events = get_combat_events()
+    if events.active:
+        events.emit(REFLECT, context["player"].id, attacker.id, amount, ability_id)
+
 @ability_handler("pre_damage")
 def handle_sharpness(context, level):
     context["base_damage"] += 5 * level
-    print(f"Applying sharpness effect at level {level}, new base damage: {context['base_damage']}")
+    _emit_proc(context, "sharpness", level)
 
 @ability_handler("pre_crit")
 def handle_crit_boost(context, level):
     context["crit_chance"] += 5 * level
-    print(f"Applying crit boost effect at level {level}, new crit chance: {context['crit_chance']}%")
+    _emit_proc(context, "crit_boost", level)
 
 @ability_handler("post_crit")
 def handle_first_hit_bonus(context, level):
     if context.get("is_first_hit", False):
         bonus_multiplier = 1.5 + 0.1 * (level - 1)
-        print(f"Applying first hit bonus effect at level {level}, multiplier: {bonus_multiplier}")
+        _emit_proc(context, "first_hit_bonus", level)
         context["damage"] *= bonus_multiplier
 
 @ability_handler("post_damage")
@@ -36,21 +48,20 @@ def handle_lifesteal(context, level):
     max_allowed_heal = int(player_max_hp * 0.10)
     heal_amount = min(heal_amount, max_allowed_heal)
 
-    print(f"Healing for {heal_amount} due to lifesteal (enemy_max_hp: {enemy_max_hp}, player_max_hp: {player_max_hp})")
-    context["player"].combat.heal(heal_amount)
+    context["player"].combat.heal(heal_amount, reason="lifesteal")
 
 @ability_handler("on_kill")
 def handle_speed_on_kill(context, level):
     player = context["player"]
     player.stats.add_temp_stat_bonus("speed", 10 * level, duration=3.0)
-    print(f"Applying speed on kill effect at level {level}, speed bonus: {10 * level}")
+    _emit_proc(context, "speed_on_kill", level)
 
 @ability_handler("on_hit_received")
 def handle_thorns(context, level):
     attacker = context["attacker"]
     reflect_damage = int(context["incoming_damage"] * (0.1 * level))
     attacker.hit(reflect_damage)
-    print(f"Reflecting {reflect_damage} damage back to attacker due to thorns at level {level}")
+    _emit_reflect(context, attacker, reflect_damage, "thorns")
 
 @ability_handler("periodic")
 def handle_slime_regen(context, level):
@@ -63,8 +74,7 @@ def handle_slime_regen(context, level):
 
     if now - last_tick >= interval:
         heal_amount = int(context["combat_entity"].max_hp * regen_percent)
-        context["combat_entity"].heal(heal_amount)
-        print(f"Regenerating {heal_amount} HP due to slime regeneration at level {level}")
+        context["combat_entity"].heal(heal_amount, reason="slime_regen")
         return True
     return False
 
@@ -76,7 +86,7 @@ def handle_bone_thorns(context, level):
     attacker = context["attacker"]
     reflect_damage = int(context["incoming_damage"] * reflect_percent)
     attacker.hit(reflect_damage)
-    print(f"Reflecting {reflect_damage} damage back to attacker due to bone thorns at level {level}")
+    _emit_reflect(context, attacker, reflect_damage, "bone_thorns")
 
 @ability_handler("on_hit_received")
 def handle_slime_shield(context, level):
@@ -94,7 +104,7 @@ def handle_slime_shield(context, level):
     # Apply reduction
     reduction_factor = (1.0 - reduction_percent / 100.0)
     context["incoming_damage"] *= reduction_factor
-    print(f"Reducing damage from slime by {reduction_percent}%, new incoming damage: {context['incoming_damage']}")
+    _emit_proc(context, "slime_shield", level)
 
 @ability_handler("post_damage")
 def handle_chain_lightning(context, level):
@@ -105,7 +115,7 @@ def handle_chain_lightning(context, level):
     if not zone:
         return
 
-    print(f"Handling chain lightning for target {target_enemy.id} at level {level}")
+    _emit_proc(context, "chain_lightning", level)
 
     current_source = target_enemy
     chained_enemies = {target_enemy}
@@ -117,16 +127,15 @@ def handle_chain_lightning(context, level):
 
     for bounce in range(level):
         # Find nearest un-hit enemy
-        nearby_enemies = [
-            e for e in zone.enemies
-            if e not in chained_enemies and e.combat.hp > 0
-            and e.distance_to(current_source) <= 200
-        ]
+        source_x, source_y = current_source.rect.center
+        nearby_enemies = zone.enemy_grid.nearest(
+            source_x, source_y, k=1, max_distance=200,
+            predicate=lambda e: e not in chained_enemies and e.combat.hp > 0
+        )
 
         if not nearby_enemies:
             break
 
-        nearby_enemies.sort(key=lambda e: e.distance_to(current_source))
         chain_target = nearby_enemies[0]
 
         damage = int(base_damage * current_percent)
@@ -140,8 +149,6 @@ def handle_chain_lightning(context, level):
                 "to_pos": chain_target.rect.center,
             })
 
-        print(f"Chain Lightning bounce {bounce + 1} → dealing {damage} to {chain_target.id}")
-
         chained_enemies.add(chain_target)
         current_source = chain_target
 
@@ -161,8 +168,9 @@ def handle_phoenix_aura(context, level):
 
     if now - last_tick >= interval:
         if zone:
-            for enemy in zone.enemies:
-                if enemy.combat.hp > 0 and enemy.distance_to(player) <= 100:
+            player_x, player_y = player.rect.center
+            for enemy in zone.enemy_grid.query_radius(player_x, player_y, 100):
+                if enemy.combat.hp > 0:
                     result = enemy.combat.take_damage(
                         aoe_damage, attacker_entity=player, reason="phoenix_aura"
                     )
@@ -190,23 +198,23 @@ def handle_cleave(context, level):
     percent = 0.15 * level  # 15%, 30%, 45%
     affected = 0
 
-    for enemy in zone.enemies:
+    origin_x, origin_y = origin_target.rect.center
+    for enemy in zone.enemy_grid.query_radius(origin_x, origin_y, base_radius):
         if enemy == origin_target or enemy.combat.hp <= 0:
             continue
-        if origin_target.distance_to(enemy) <= base_radius:
-            cleave_damage = int(final_damage * percent)
-            result = enemy.combat.take_damage(
-                cleave_damage, attacker_entity=player, reason="cleave"
-            )
-            zone.pending_enemy_results.append(result)
+        cleave_damage = int(final_damage * percent)
+        result = enemy.combat.take_damage(
+            cleave_damage, attacker_entity=player, reason="cleave"
+        )
+        zone.pending_enemy_results.append(result)
 
-            if "effect_hooks" in context:
-                zone.queue_effect("cleave_hit", {
-                    "x": enemy.rect.centerx,
-                    "y": enemy.rect.centery,
-                })
+        if "effect_hooks" in context:
+            zone.queue_effect("cleave_hit", {
+                "x": enemy.rect.centerx,
+                "y": enemy.rect.centery,
+            })
 
-            affected += 1
+        affected += 1
 
     if affected > 0 and "effect_hooks" in context:
         zone.queue_effect("cleave", {
@@ -214,7 +222,8 @@ def handle_cleave(context, level):
             "y": origin_target.rect.centery,
         })
 
-    print(f"[Cleave] Hit {affected} enemies around {origin_target.id} for {percent:.0%} of {final_damage} damage")
+    if affected > 0:
+        _emit_proc(context, "cleave", level)
 
 ABILITY_HANDLERS = {
     "sharpness": handle_sharpness,
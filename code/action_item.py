@@ -1,7 +1,10 @@
 import pygame
-import random
 
 from utils import calculate_shake_intensity, UseResult
+from rng import get_rng
+from game_clock import get_ticks
+
+_rng = get_rng("combat")
 
 class ActionItem:
     def __init__(self, id, radius, delay, damage, knockback=300, skill="combat"):
@@ -22,7 +25,7 @@ class ActionItem:
         attack_speed = player.stats.total_stats.get("attack_speed", 0)
         multiplier = 1 + attack_speed / 100
         effective_delay = self.delay / multiplier
-        elapsed = pygame.time.get_ticks() - last
+        elapsed = get_ticks() - last
         return min(elapsed / effective_delay, 1.0)
 
     def use(self, player, zone, camera, play_sound_fn, dt, target):
@@ -60,7 +63,7 @@ class ActionItem:
 
         crit = False
         if context["crit_chance"] > 0:
-            if random.random() < context["crit_chance"] / 100:
+            if _rng.random() < context["crit_chance"] / 100:
                 damage *= 1 + context["crit_damage"] / 100
                 crit = True
 
@@ -72,10 +75,10 @@ class ActionItem:
         multiplier = 1 + attack_speed / 100
         effective_delay = self.delay / multiplier
 
-        return pygame.time.get_ticks() - last >= effective_delay
+        return get_ticks() - last >= effective_delay
     
     def trigger(self, player):
-        self._last_used = pygame.time.get_ticks()
+        self._last_used = get_ticks()
         player.item_cooldowns[self.id] = self._last_used
 
     @property
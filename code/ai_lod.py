@@ -0,0 +1,103 @@
+import numpy as np
+
+AI_LOD_NEAR = 0
+AI_LOD_MID = 1
+AI_LOD_FAR = 2
+AI_LOD_TIER_NAMES = ("near", "mid", "far")
+
+AI_LOD_NEAR_RADIUS = 450
+AI_LOD_MID_RADIUS = 900
+AI_LOD_MID_INTERVAL = 3  # frames between AI ticks
+AI_LOD_FAR_INTERVAL = 12
+AI_LOD_NEAR_BUDGET = 300  # max enemies per tier; the farthest overflow drops a tier
+AI_LOD_MID_BUDGET = 1500
+
+class AILodScheduler:
+    """Decides which enemies run their AI (behaviour, FSM, combat tick) this frame.
+
+    Near or on-screen enemies tick every frame, mid-range enemies every few frames and
+    distant ones rarely. Skipped frames accumulate dt in the pool so a tick always
+    covers the full elapsed time. Movement itself still integrates every frame in
+    EnemyPool.step, so slower tiers just steer less often.
+    """
+
+    def __init__(self, near_radius=AI_LOD_NEAR_RADIUS, mid_radius=AI_LOD_MID_RADIUS,
+                 mid_interval=AI_LOD_MID_INTERVAL, far_interval=AI_LOD_FAR_INTERVAL,
+                 near_budget=AI_LOD_NEAR_BUDGET, mid_budget=AI_LOD_MID_BUDGET):
+        self.near_radius = near_radius
+        self.mid_radius = mid_radius
+        self.mid_interval = mid_interval
+        self.far_interval = far_interval
+        self.near_budget = near_budget
+        self.mid_budget = mid_budget
+
+        self.frame = 0
+        self.tier = np.zeros(0, dtype=np.int8)  # per pool slot, from the last schedule()
+        self.tier_counts = {name: 0 for name in AI_LOD_TIER_NAMES}
+        self.ticked = 0
+
+    def _apply_budget(self, tier, level, budget, dist_sq, visible):
+        members = np.flatnonzero(tier == level)
+        if budget is None or len(members) <= budget:
+            return
+
+        # Keep on-screen enemies first, then the closest.
+        order = np.lexsort((dist_sq[members], ~visible[members]))
+        tier[members[order[budget:]]] = level + 1
+
+    def schedule(self, pool, dt, player_center, camera):
+        """Returns (slots, dts): the pool slots to update this frame and the dt each should use."""
+        n = pool.count
+        if not n:
+            self.tier = np.zeros(0, dtype=np.int8)
+            self.tier_counts = {name: 0 for name in AI_LOD_TIER_NAMES}
+            self.ticked = 0
+            return [], []
+
+        size = pool.size[:n]
+        pos = pool.pos[:n]
+        centre_x = pos[:, 0] + size[:, 0] / 2
+        centre_y = pos[:, 1] + size[:, 1] / 2
+
+        px, py = player_center
+        dist_sq = (centre_x - px) ** 2 + (centre_y - py) ** 2
+
+        left = -camera.offset.x
+        top = -camera.offset.y
+        visible = (
+            (pos[:, 0] + size[:, 0] >= left) & (pos[:, 0] <= left + camera.viewport_width)
+            & (pos[:, 1] + size[:, 1] >= top) & (pos[:, 1] <= top + camera.viewport_height)
+        )
+
+        tier = np.full(n, AI_LOD_FAR, dtype=np.int8)
+        tier[dist_sq <= self.mid_radius * self.mid_radius] = AI_LOD_MID
+        tier[visible | (dist_sq <= self.near_radius * self.near_radius)] = AI_LOD_NEAR
+
+        self._apply_budget(tier, AI_LOD_NEAR, self.near_budget, dist_sq, visible)
+        self._apply_budget(tier, AI_LOD_MID, self.mid_budget, dist_sq, visible)
+
+        # Stagger slower tiers by slot so their ticks spread across frames.
+        phase = np.arange(self.frame, self.frame + n)
+        due = (
+            (tier == AI_LOD_NEAR)
+            | ((tier == AI_LOD_MID) & (phase % self.mid_interval == 0))
+            | ((tier == AI_LOD_FAR) & (phase % self.far_interval == 0))
+        )
+
+        ai_dt = pool.ai_dt[:n]
+        ai_dt += dt
+        slots = np.flatnonzero(due)
+        dts = ai_dt[slots]
+        ai_dt[slots] = 0.0
+
+        self.tier = tier
+        counts = np.bincount(tier, minlength=3)
+        self.tier_counts = {name: int(counts[i]) for i, name in enumerate(AI_LOD_TIER_NAMES)}
+        self.ticked = len(slots)
+        self.frame += 1
+
+        return slots.tolist(), dts.tolist()
+
+    def slots_within(self, level):
+        """Pool slots whose tier was `level` or nearer at the last schedule()."""
+        return np.flatnonzero(self.tier <= level)
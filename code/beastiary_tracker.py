@@ -74,8 +74,13 @@ class BeastiaryTracker:
         return self.enemy_kill_counts.get(enemy_id, 0)
 
     def update_enemy_kill_count(self, enemy_id, new_value):
+        old_level, _ = self.get_enemy_beastiary_level(enemy_id)
         self.enemy_kill_counts[enemy_id] = new_value
 
+        new_level, _ = self.get_enemy_beastiary_level(enemy_id)
+        if new_level != old_level:
+            self.player.stats.invalidate()
+
     def check_total_beastiary_rewards(self, handle_gainxp_fn=None, message_log_callback=None):
         total_level = self.get_total_beastiary_level()
         for stat, bonus in self.beastiary_bonuses.items():
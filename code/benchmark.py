@@ -0,0 +1,451 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from constants import *
+from combat_entity import CombatResult
+from ability_handlers import handle_chain_lightning, handle_phoenix_aura
+from simulation import create_simulation, chase_nearest_enemy
+from ui.tooltip_context import TooltipContext
+from ui.tooltip_builder import build_tooltip_lines
+from input_source import mouse_down
+
+BENCH_SEED = 1234
+BENCH_MIN_TIME = 0.5  # seconds spent timing each scenario
+BENCH_MIN_ITERATIONS = 5
+BENCH_MAX_ITERATIONS = 20000
+BENCH_WARMUP_ITERATIONS = 3
+BENCH_RESULTS_DIR = "bench_results"
+
+BENCH_HUGE_HP = 10 ** 12
+
+_screen = None
+
+def _get_screen():
+    global _screen
+    if _screen is None:
+        pygame.display.init()
+        _screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return _screen
+
+def _new_game(zone_id="starter_zone", num_enemies=None, events=None):
+    _get_screen()
+    game, clock, input_source = create_simulation(BENCH_SEED, events)
+
+    zone = game.zones[zone_id]
+    if num_enemies is not None:
+        zone.num_enemies = num_enemies
+
+    game._change_zone(zone_id)
+
+    # One real frame so per-frame state (popup offsets, stat snapshot, ...) exists.
+    game.update(clock.tick() / 1000, clock)
+    return game, clock, input_source
+
+def _crowd_around(zone, x, y, radius):
+    # Deterministically pack every enemy into a disc so area abilities have targets.
+    count = len(zone.enemies)
+    for i, enemy in enumerate(zone.enemies):
+        angle = i * 2.399963  # golden angle
+        dist = radius * math.sqrt((i + 0.5) / count)
+        enemy.set_pos(x + math.cos(angle) * dist - enemy.rect.width / 2, y + math.sin(angle) * dist - enemy.rect.height / 2)
+        enemy.rect.topleft = (int(enemy.pos.x), int(enemy.pos.y))
+        enemy.combat.hp = BENCH_HUGE_HP
+        zone.enemy_grid.move(enemy)
+
+def scenario_graveyard_frame(num_enemies):
+    def setup():
+        game, clock, input_source = _new_game("graveyard", num_enemies, [mouse_down(0, (0, 0))])
+        screen = _get_screen()
+
+        def op():
+            dt = clock.tick() / 1000
+            chase_nearest_enemy(game, input_source)
+            game.handle_events(input_source.poll_events())
+            game.update(dt, clock)
+            game.draw(screen)
+
+        return op
+    return setup
+
+def scenario_zone_update(num_enemies):
+    def setup():
+        game, clock, _ = _new_game("graveyard", num_enemies)
+        zone = game.current_zone
+
+        def op():
+            zone.update(clock.tick() / 1000, game.player, game.camera, game.sound_manager)
+
+        return op
+    return setup
+
+def scenario_chain_lightning(level, num_enemies=60):
+    def setup():
+        game, clock, _ = _new_game("graveyard", num_enemies)
+        zone = game.current_zone
+        player = game.player
+        px, py = player.rect.center
+        _crowd_around(zone, px, py, 400)
+
+        target = zone.enemy_grid.nearest(px, py)[0]
+
+        def op():
+            context = {
+                "player": player,
+                "target": target,
+                "damage": 100,
+                "zone": zone,
+                "effect_hooks": [],
+            }
+            handle_chain_lightning(context, level)
+            zone.pending_enemy_results.clear()
+            zone.effect_hooks.clear()
+
+        return op
+    return setup
+
+def scenario_phoenix_aura(num_enemies):
+    def setup():
+        game, clock, _ = _new_game("graveyard", num_enemies)
+        zone = game.current_zone
+        player = game.player
+        px, py = player.rect.center
+        _crowd_around(zone, px, py, 150)
+
+        def op():
+            clock.tick()
+            context = {
+                "player": player,
+                "combat_entity": player.combat,
+                "now": clock.get_ticks(),
+                "last_tick": -BENCH_HUGE_HP,
+                "level": 4,
+                "zone": zone,
+                "effect_hooks": [],
+            }
+            handle_phoenix_aura(context, 4)
+            zone.pending_enemy_results.clear()
+            zone.effect_hooks.clear()
+
+        return op
+    return setup
+
+def scenario_flush_multikill(kills):
+    def setup():
+        game, clock, _ = _new_game("graveyard", 25)
+        zone = game.current_zone
+        player = game.player
+
+        def before():
+            zone.pending_enemy_results.clear()
+            while zone.spawn_director.queue:  # refill the zone so every iteration has targets
+                zone.spawn_director.update(player, now=math.inf)
+            for enemy in zone.enemies[:kills]:
+                enemy.combat.hp = 0
+                enemy.combat.last_damage_taken = 50
+                zone.pending_enemy_results.append(CombatResult(
+                    target=enemy,
+                    attacker=player,
+                    final_damage=50,
+                    final_hit=True,
+                    final_xp={"combat": enemy.reward_xp},
+                    reason="cleave",
+                ))
+
+        def op():
+            zone.flush_combat_results(game)
+
+        return op, before
+    return setup
+
+def scenario_tooltip_enchanted_slime_sword():
+    def setup():
+        game, clock, _ = _new_game()
+        player = game.player
+
+        item_id = None
+        for instance_id, instance in player.inventory.item_instances.items():
+            if instance.item_id == "slime_sword" and instance.metadata.get("enchantments"):
+                item_id = f"slime_sword__instance__{instance_id}"
+                break
+
+        tooltip = {
+            "type": "item",
+            "data": player.inventory.get_item_full_data(item_id),
+            "position": (400, 300),
+            "required_states": {game.state},
+        }
+
+        def op():
+            ctx = TooltipContext(font=game.font, player=player, **tooltip)
+            build_tooltip_lines(tooltip, ctx)
+
+        return op
+    return setup
+
+def scenario_inventory_draw(num_instances):
+    def setup():
+        game, clock, _ = _new_game()
+        screen = _get_screen()
+        player = game.player
+
+        enchanted = {"enchantments": [{"id": "sharpness", "level": 1}]}
+        for i in range(num_instances):
+            item_id = ("slime_sword", "bone_plate", "iron_pickaxe", "phoenix_crown")[i % 4]
+            player.inventory.add_item(item_id, amount=1, metadata=enchanted)
+
+        ui = game.inventoryui
+
+        def op():
+            ui.update()
+            ui.draw(screen)
+
+        return op
+    return setup
+
+def scenario_popups(count):
+    def setup():
+        game, clock, _ = _new_game()
+        popups = game.popups
+        px, py = game.player.rect.center
+
+        def before():
+            popups.clear()
+            for i in range(count):
+                popups.spawn_damage(px + (i % 40) * 12 - 240, py + (i // 40) * 6 - 150, i % 97)
+
+        def op():
+            popups.update(1 / 144)
+            popups.draw(game.surface, game.camera)
+
+        return op, before
+    return setup
+
+def scenario_particles(count):
+    def setup():
+        game, clock, _ = _new_game()
+        zone = game.current_zone
+        particles = zone.particles
+        px, py = game.player.rect.center
+
+        def before():
+            particles.clear()
+            for i in range(count // 10):
+                angle = i * 2.399963
+                zone.spawn_particles(px + math.cos(angle) * 300, py + math.sin(angle) * 300, (180, 0, 0), px, py, 10, 60.0, 60.0)
+            particles.update(0)
+
+        def op():
+            particles.update(1 / 144)
+            particles.draw(game.surface, game.camera)
+
+        return op, before
+    return setup
+
+def scenario_projectiles(count):
+    def setup():
+        game, clock, _ = _new_game()
+        zone = game.current_zone
+        projectiles = zone.projectiles
+        player = game.player
+        player.combat.hp = BENCH_HUGE_HP
+        px, py = player.rect.center
+
+        def before():
+            # Boss-style rings closing in on the player.
+            projectiles.clear()
+            for ring in range(count // 100):
+                dist = 80 + ring * 8
+                for i in range(100):
+                    angle = i * 2 * math.pi / 100 + ring * 0.1
+                    x, y = px + math.cos(angle) * dist, py + math.sin(angle) * dist
+                    projectiles.fire(None, "arrow", x, y, angle + math.pi, 1)
+            projectiles.life[:projectiles.count] = 60.0
+
+        def op():
+            projectiles.update(1 / 144, player)
+            projectiles.draw(game.surface, game.camera)
+
+        return op, before
+    return setup
+
+SCENARIOS = {}
+
+for count in (25, 250, 2500):
+    SCENARIOS[f"graveyard_frame_{count}"] = scenario_graveyard_frame(count)
+
+SCENARIOS["zone_update_5000"] = scenario_zone_update(5000)
+
+for level in range(1, 11):
+    SCENARIOS[f"chain_lightning_lv{level}"] = scenario_chain_lightning(level)
+
+for count in (25, 250, 1000):
+    SCENARIOS[f"phoenix_aura_tick_{count}"] = scenario_phoenix_aura(count)
+
+for kills in (1, 6):
+    SCENARIOS[f"flush_combat_results_{kills}_kills"] = scenario_flush_multikill(kills)
+
+SCENARIOS["popups_2000"] = scenario_popups(2000)
+SCENARIOS["particles_50k"] = scenario_particles(50000)
+SCENARIOS["projectiles_5000"] = scenario_projectiles(5000)
+SCENARIOS["tooltip_enchanted_slime_sword"] = scenario_tooltip_enchanted_slime_sword()
+SCENARIOS["inventory_draw_10k"] = scenario_inventory_draw(10000)
+
+def _unpack(prepared):
+    if isinstance(prepared, tuple):
+        return prepared
+    return prepared, None
+
+def _time_scenario(setup):
+    op, before = _unpack(setup())
+
+    for _ in range(BENCH_WARMUP_ITERATIONS):
+        if before:
+            before()
+        op()
+
+    total_ns = 0
+    iterations = 0
+    while iterations < BENCH_MAX_ITERATIONS and (iterations < BENCH_MIN_ITERATIONS or total_ns < BENCH_MIN_TIME * 1e9):
+        if before:
+            before()
+        start = time.perf_counter_ns()
+        op()
+        total_ns += time.perf_counter_ns() - start
+        iterations += 1
+
+    return total_ns / iterations, iterations
+
+def _measure_allocations(setup, iterations):
+    # Separate pass: tracemalloc slows everything down, so it never overlaps the timing pass.
+    op, before = _unpack(setup())
+
+    for _ in range(BENCH_WARMUP_ITERATIONS):
+        if before:
+            before()
+        op()
+
+    tracemalloc.start()
+    peak_total = 0
+    retained_total = 0
+
+    for _ in range(iterations):
+        if before:
+            before()
+        # Collect on both sides so cyclic garbage from earlier ops, or freed by this
+        # one, doesn't show up as retained memory.
+        gc.collect()
+        tracemalloc.reset_peak()
+        start_size, _ = tracemalloc.get_traced_memory()
+        op()
+        _, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        end_size, _ = tracemalloc.get_traced_memory()
+        peak_total += peak - start_size
+        retained_total += end_size - start_size
+
+    tracemalloc.stop()
+    return peak_total / iterations, retained_total / iterations
+
+def run_benchmarks(name_filter=None):
+    results = {}
+
+    for name, setup in SCENARIOS.items():
+        if name_filter and name_filter not in name:
+            continue
+
+        ns_per_op, iterations = _time_scenario(setup)
+        alloc_iterations = max(1, min(iterations, 200))
+        alloc_bytes, retained_bytes = _measure_allocations(setup, alloc_iterations)
+
+        results[name] = {
+            "ns_per_op": ns_per_op,
+            "iterations": iterations,
+            "alloc_bytes_per_op": alloc_bytes,
+            "retained_bytes_per_op": retained_bytes,
+        }
+        print(f"{name:<36} {ns_per_op:>16,.0f} ns/op {alloc_bytes / 1024:>12,.1f} KiB/op {retained_bytes / 1024:>+10,.1f} KiB retained/op  ({iterations} iters)")
+
+    return results
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def save_results(results, path=None):
+    revision = _git_revision()
+    if path is None:
+        os.makedirs(BENCH_RESULTS_DIR, exist_ok=True)
+        path = os.path.join(BENCH_RESULTS_DIR, f"{revision}.json")
+
+    payload = {
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+    return path
+
+def compare_results(base_path, head_path):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+
+    print(f"{'scenario':<36} {base['revision']:>14} {head['revision']:>14} {'delta':>9}")
+    for name, head_result in head["results"].items():
+        base_result = base["results"].get(name)
+        if not base_result:
+            print(f"{name:<36} {'-':>14} {head_result['ns_per_op']:>14,.0f}")
+            continue
+
+        delta = (head_result["ns_per_op"] - base_result["ns_per_op"]) / base_result["ns_per_op"] * 100
+        print(f"{name:<36} {base_result['ns_per_op']:>14,.0f} {head_result['ns_per_op']:>14,.0f} {delta:>+8.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-frame hot paths.")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run")
+    run.add_argument("--filter", default=None)
+    run.add_argument("--out", default=None)
+
+    compare = sub.add_parser("compare")
+    compare.add_argument("base")
+    compare.add_argument("head")
+
+    sub.add_parser("list")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        compare_results(args.base, args.head)
+    elif args.command == "list":
+        for name in SCENARIOS:
+            print(name)
+    else:
+        results = run_benchmarks(getattr(args, "filter", None))
+        path = save_results(results, getattr(args, "out", None))
+        print(f"Saved results to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import pygame
-import random
+from rng import get_rng
+
+_rng = get_rng("effects")
 
 class Camera:
     def __init__(self, offset, viewport_width, viewport_height):
@@ -8,6 +10,7 @@ class Camera:
 
         self.offset = pygame.Vector2(offset)
         self._base_offset = pygame.Vector2(0, 0)
+        self.scale = 1.0  # output px per screen px; Game lowers it while drawing a down-scaled world
 
         self.shake_timer = 0.0
         self.shake_magnitude = 0.0
@@ -15,13 +18,21 @@ class Camera:
 
     def apply(self, target):
         if isinstance(target, pygame.Rect):
-            return target.move(self.offset)
+            moved = target.move(self.offset)
+            if self.scale == 1.0:
+                return moved
+            s = self.scale
+            return pygame.Rect(int(moved.x * s), int(moved.y * s), max(1, round(moved.w * s)), max(1, round(moved.h * s)))
         elif isinstance(target, (pygame.Vector2, tuple)):
-            return pygame.Vector2(target) + self.offset
+            return (pygame.Vector2(target) + self.offset) * self.scale
         return target
 
+    def view_rect(self):
+        """The world-space rect currently on screen."""
+        return pygame.Rect(-self.offset.x, -self.offset.y, self.viewport_width, self.viewport_height)
+
     def reverse(self, pos):
-        return (pos[0] + self.offset.x, pos[1] + self.offset.y)
+        return ((pos[0] + self.offset.x) * self.scale, (pos[1] + self.offset.y) * self.scale)
 
     def shake(self, magnitude=8, duration=0.25):
         self.shake_magnitude = magnitude
@@ -38,8 +49,8 @@ class Camera:
             t = self.shake_timer / self.shake_duration
             eased = self.shake_magnitude * (t ** 2)
             shake = pygame.Vector2(
-                random.uniform(-eased, eased),
-                random.uniform(-eased, eased)
+                _rng.uniform(-eased, eased),
+                _rng.uniform(-eased, eased)
             )
             self.offset = self._base_offset + shake
         else:
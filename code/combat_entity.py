@@ -4,6 +4,9 @@ import pygame
 
 from ability_handlers import ABILITY_HANDLERS
 from dataclasses import dataclass, field
+from game_clock import get_ticks
+from tracer import get_tracer
+from combat_events import get_combat_events, DAMAGE, HEAL, KILL, REVIVE
 
 @dataclass
 class CombatResult:
@@ -17,7 +20,7 @@ class CombatResult:
 KNOCKBACK_FRICTION = 5
 
 class CombatEntity:
-    def __init__(self, owner, hp, max_hp=None, max_hp_getter=None, weight=1.0, regen_rate=None, regen_rate_getter=None, regen_interval=1000, damage_reduction_fn=None):
+    def __init__(self, owner, hp, max_hp=None, max_hp_getter=None, weight=1.0, regen_rate=None, regen_rate_getter=None, regen_interval=1000, damage_reduction_fn=None, knockback_fn=None):
         self.owner = owner
         self.hp = hp
         self._max_hp_fixed = max_hp
@@ -36,6 +39,16 @@ class CombatEntity:
         self._active_effects = []
         
         self.damage_reduction_fn = damage_reduction_fn
+        self.knockback_fn = knockback_fn  # if set, the owner stores and integrates knockback itself
+
+    def reset(self):
+        """Restore full health and clear per-life state so a pooled owner can be reused."""
+        self.hp = self.max_hp
+        self.knockback_vector = pygame.Vector2(0, 0)
+        self.just_took_damage = False
+        self.last_damage_taken = 0
+        self._last_regen = 0
+        self._last_periodic_tick_times.clear()
 
     @property
     def max_hp(self):
@@ -47,7 +60,8 @@ class CombatEntity:
         self._active_effects = list(effects)
 
     def update(self, dt):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
+        tracer = get_tracer()
 
         for effect in self._active_effects:
             handler_fn = ABILITY_HANDLERS.get(effect["id"])
@@ -66,7 +80,11 @@ class CombatEntity:
                 "effect_hooks": []
             }
 
-            triggered = handler_fn(context, level=effect["tier"])
+            if tracer.recording:
+                with tracer.span(handler_fn.__name__, "ability", {"level": effect["tier"]}):
+                    triggered = handler_fn(context, level=effect["tier"])
+            else:
+                triggered = handler_fn(context, level=effect["tier"])
 
             if triggered:
                 self._last_periodic_tick_times[effect["id"]] = now
@@ -74,13 +92,28 @@ class CombatEntity:
 
         self.update_regen()
         self.clamp_hp_to_max()
-        self.apply_knockback(dt)
+        if not self.knockback_fn:
+            self.apply_knockback(dt)
 
     def apply_combat_phase(self, phase, context):
+        tracer = get_tracer()
+        if tracer.recording:
+            with tracer.span("apply_combat_phase", "combat", {"phase": phase}):
+                self._apply_combat_phase(phase, context, tracer)
+            return
+
+        self._apply_combat_phase(phase, context)
+
+    def _apply_combat_phase(self, phase, context, tracer=None):
         for effect in self._active_effects:
             handler_fn = ABILITY_HANDLERS.get(effect["id"])
             if handler_fn and getattr(handler_fn, "phase", None) == phase:
-                handler_fn(context, level=effect["tier"])
+                if tracer is None:
+                    handler_fn(context, level=effect["tier"])
+                    continue
+
+                with tracer.span(handler_fn.__name__, "ability", {"level": effect["tier"]}):
+                    handler_fn(context, level=effect["tier"])
 
     def take_damage(self, amount, knockback_vector=pygame.Vector2(0, 0), attacker_entity=None, reason=None):
         reduction = self.damage_reduction_fn() if self.damage_reduction_fn else 0.0
@@ -95,10 +128,13 @@ class CombatEntity:
         self.apply_combat_phase("on_hit_received", context)
 
         final_incoming_damage = context.get("incoming_damage", reduced_amount)
-        print(f"CombatEntity {self.owner.id} took {final_incoming_damage} damage (reduced from {amount} by {reduction * 100:.2f}%)")
 
+        was_alive = self.hp > 0
         self.hp -= final_incoming_damage
-        self.knockback_vector = knockback_vector / self.weight
+        if self.knockback_fn:
+            self.knockback_fn(knockback_vector / self.weight)
+        else:
+            self.knockback_vector = knockback_vector / self.weight
         self.just_took_damage = True
         self.last_damage_taken = int(round(final_incoming_damage))
 
@@ -114,28 +150,41 @@ class CombatEntity:
         if result.final_hit and xp is not None:
             result.final_xp["combat"] = xp
 
+        events = get_combat_events()
+        if events.active:
+            attacker_id = getattr(attacker_entity, "id", None)
+            events.emit(DAMAGE, attacker_id, self.owner.id, final_incoming_damage, reason)
+            if was_alive and self.hp <= 0:
+                events.emit(KILL, attacker_id, self.owner.id, self.last_damage_taken, reason)
+
         return result
 
     def revive(self):
-        print(f"CombatEntity {self.owner.id} revived")
         self.hp = self.max_hp
 
+        events = get_combat_events()
+        if events.active:
+            events.emit(REVIVE, None, self.owner.id)
+
     def update_regen(self):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
         regen_rate = self.regen_rate_getter() if self.regen_rate_getter else self.regen_rate
 
         if regen_rate > 0 and self.hp < self.max_hp:
             if now - self._last_regen >= self.regen_interval:
-                self.heal(regen_rate)
+                self.heal(regen_rate, reason="regen")
                 self._last_regen = now
 
-    def heal(self, amount):
+    def heal(self, amount, reason=None):
         if amount <= 0:
             return
-        
-        print(f"CombatEntity {self.owner.id} healed for {amount} HP")
+
         self.hp = min(self.max_hp, self.hp + amount)
 
+        events = get_combat_events()
+        if events.active:
+            events.emit(HEAL, None, self.owner.id, amount, reason)
+
     def apply_knockback(self, dt):
         self.owner.pos += self.knockback_vector * dt
         self.knockback_vector *= math.exp(-KNOCKBACK_FRICTION * dt)
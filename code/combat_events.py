@@ -0,0 +1,122 @@
+import os
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+from game_clock import get_ticks
+
+COMBAT_EVENT_BUFFER_SIZE = 4096
+COMBAT_EVENT_EXPORT_DIR = "logs"
+
+DAMAGE = "damage"
+HEAL = "heal"
+REFLECT = "reflect"
+PROC = "proc"
+KILL = "kill"
+REVIVE = "revive"
+
+# source/target are entity ids; detail is the ability id or damage reason.
+CombatEvent = namedtuple("CombatEvent", ["kind", "time", "source", "target", "amount", "detail"])
+
+COMBAT_EVENT_FORMATS = {
+    DAMAGE: "{target} took {amount:.1f} damage from {source} ({detail})",
+    HEAL: "{target} healed for {amount} HP ({detail})",
+    REFLECT: "{source} reflected {amount} damage to {target} ({detail})",
+    PROC: "{detail} Lv {amount} triggered for {source}",
+    KILL: "{source} killed {target} ({detail})",
+    REVIVE: "{target} revived",
+}
+
+def format_combat_event(event):
+    fields = {name: "-" if value is None else value for name, value in event._asdict().items()}
+    text = COMBAT_EVENT_FORMATS[event.kind].format(**fields)
+    return f"[{event.time / 1000:.2f}s] {text}"
+
+class CombatEventLog:
+    """Dispatches combat events to subscribed sinks. Call sites check `active` first so
+    nothing is built when no sink is attached."""
+
+    def __init__(self):
+        self.sinks = []
+        self.active = False
+
+    def subscribe(self, sink):
+        if sink not in self.sinks:
+            self.sinks.append(sink)
+        self.active = True
+        return sink
+
+    def unsubscribe(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+        self.active = bool(self.sinks)
+
+    def emit(self, kind, source, target, amount=0, detail=None):
+        event = CombatEvent(kind, get_ticks(), source, target, amount, detail)
+        for sink in self.sinks:
+            sink(event)
+
+class CombatEventBuffer:
+    """Ring buffer sink; formatting happens only when lines are read."""
+
+    def __init__(self, capacity=COMBAT_EVENT_BUFFER_SIZE):
+        self.events = deque(maxlen=capacity)
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def __len__(self):
+        return len(self.events)
+
+    def clear(self):
+        self.events.clear()
+
+    def recent_lines(self, count):
+        start = max(0, len(self.events) - count)
+        return [format_combat_event(self.events[i]) for i in range(start, len(self.events))]
+
+class CombatEventFileWriter:
+    """Sink that formats and appends events to a text file on a background thread."""
+
+    def __init__(self, path=None):
+        if path is None:
+            os.makedirs(COMBAT_EVENT_EXPORT_DIR, exist_ok=True)
+            path = os.path.join(COMBAT_EVENT_EXPORT_DIR, f"combat_{time.strftime('%Y%m%d_%H%M%S')}.log")
+
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __call__(self, event):
+        self._queue.put(event)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        with open(self.path, "a") as f:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    break
+                f.write(format_combat_event(event))
+                f.write("\n")
+
+class CombatEventTotals:
+    """Analytics sink: running amount and count per (kind, detail)."""
+
+    def __init__(self):
+        self.totals = {}
+
+    def __call__(self, event):
+        key = (event.kind, event.detail)
+        count, amount = self.totals.get(key, (0, 0))
+        self.totals[key] = (count + 1, amount + event.amount)
+
+_combat_events = CombatEventLog()
+
+def get_combat_events():
+    return _combat_events
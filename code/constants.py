@@ -1,6 +1,8 @@
 # Screen & Layout
 SCREEN_WIDTH, SCREEN_HEIGHT = 1366, 768
 VIEWPORT_WIDTH, VIEWPORT_HEIGHT = 1000, 768
+RENDER_SCALE = 1.0  # internal resolution of the world viewport (e.g. 0.5, 0.75); trades sharpness for fill rate
+RENDER_SCALE_SMOOTH = False  # upscale the world with smoothscale (blurrier, slower) instead of scale
 FONT_SIZE = 30
 
 # Player
@@ -44,6 +46,13 @@ HOTBAR_EQUIP_LABEL_COLOUR = (200, 200, 200)
 HOTBAR_EQUIP_PANEL_BORDER_COLOUR = (255, 255, 255)
 HOTBAR_EQUIP_PANEL_BORDER_WIDTH = 2
 
+# combat event debug panel
+COMBAT_EVENT_PANEL_WIDTH = 520
+COMBAT_EVENT_PANEL_LINES = 12
+
+# debug drawing
+DEBUG_DRAW_ATTACK_RADIUS = False  # outline every on-screen enemy's attack_radius
+
 SKILL_COLOURS = {
     "combat": (255, 100, 100),
     "mining": (100, 200, 255),
@@ -0,0 +1,99 @@
+# Movement behaviours referenced by ENEMY_DATA[...]["behaviour"]. Each one is compiled
+# once into a shared StateMachine (see state_machine.get_behaviour); "type" picks the
+# State class from state.STATE_TYPES and the remaining keys are its fields.
+ENEMY_BEHAVIOUR_DATA = {
+    "slime": {
+        "initial": "idle",
+        "states": {
+            "idle": {
+                "type": "idle",
+                "duration_range": (1.0, 1.5),
+                "next_state": "squash",
+            },
+            "squash": {
+                "type": "squash",
+                "duration": 0.7,
+                "next_state": "leap",
+            },
+            "leap": {
+                "type": "leap",
+                "duration": 0.3,
+                "leap_strength": 4.0,
+                "decel_factor": 0.02,
+                "next_state": "wander",
+                "sound_id": "slime_jump",
+            },
+            "wander": {
+                "type": "wander",
+                "speed_multiplier": 0.2,
+                "duration_range": (2.0, 5.0),
+                "next_state": "idle",
+            },
+        },
+    },
+    "spider": {
+        "initial": "wander",
+        "states": {
+            "wander": {
+                "type": "wander",
+                "speed_multiplier": 0.8,
+                "duration_range": (1.0, 2.0),
+                "next_state": "zigzag",
+            },
+            "zigzag": {
+                "type": "zigzag",
+                "speed_multiplier": 1.5,
+                "segment_duration_range": (0.1, 0.3),
+                "total_duration_range": (1.0, 1.5),
+                "next_state": "leap",
+            },
+            "leap": {
+                "type": "leap",
+                "duration": 0.3,
+                "leap_strength": 7.0,
+                "decel_factor": 0.2,
+                "next_state": "wander",
+                "sound_id": "spider_jump",
+                "target": "player",
+                "target_radius": 200,
+                "requires_los": True,
+            },
+        },
+    },
+    "zombie": {
+        "initial": "chase",
+        "states": {
+            "chase": {
+                "type": "chase",
+                "radius": 250,
+                "speed_multiplier": 1.5,
+                "fallback": "wander",
+                "requires_los": True,
+            },
+            "wander": {
+                "type": "wander",
+                "speed_multiplier": 0.5,
+                "duration_range": (1.0, 2.0),
+                "next_state": "chase",
+            },
+        },
+    },
+    "skeleton": {
+        "initial": "strafe",
+        "states": {
+            "strafe": {
+                "type": "strafe",
+                "radius": 180,
+                "fallback": "wander",
+                "duration": 2.0,
+                "requires_los": True,
+            },
+            "wander": {
+                "type": "wander",
+                "speed_multiplier": 0.6,
+                "duration_range": (1.0, 2.0),
+                "next_state": "strafe",
+            },
+        },
+    },
+}
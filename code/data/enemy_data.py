@@ -4,6 +4,7 @@ ENEMY_DATA = {
     "slime": {
         "name": "Slime",
         "type": "mob",
+        "behaviour": "slime",
         "size": 20,
         "colour": (0, 255, 0),
         "sounds": {
@@ -55,6 +56,7 @@ ENEMY_DATA = {
     "zombie": {
         "name": "Zombie",
         "type": "mob",
+        "behaviour": "zombie",
         "size": 30,
         "colour": (100, 200, 100),
         "sounds": {
@@ -80,6 +82,7 @@ ENEMY_DATA = {
     "spider": {
         "name": "Spider",
         "type": "mob",
+        "behaviour": "spider",
         "size": 24,
         "colour": (30, 30, 30),
         "level": 8,
@@ -87,6 +90,7 @@ ENEMY_DATA = {
         "damage": 25,
         "speed": 120,
         "weight": 1.2,
+        "ranged": {"projectile": "web_shot", "damage": 8, "range": 180, "cooldown": 2500},
         "xp": 20,
         "coins": 50,
         "drop_table": {
@@ -102,6 +106,7 @@ ENEMY_DATA = {
     "red_spider": {
         "name": "Red Spider",
         "type": "mob",
+        "behaviour": "spider",
         "size": 32,
         "colour": (100, 30, 30),
         "level": 15,
@@ -109,6 +114,7 @@ ENEMY_DATA = {
         "damage": 80,
         "speed": 140,
         "weight": 1.6,
+        "ranged": {"projectile": "web_shot", "damage": 20, "range": 200, "cooldown": 2500, "count": 3, "spread": 0.3},
         "xp": 30,
         "coins": 70,
         "drop_table": {
@@ -124,6 +130,7 @@ ENEMY_DATA = {
     "skeleton": {
         "name": "Skeleton",
         "type": "mob",
+        "behaviour": "skeleton",
         "size": 28,
         "colour": (240, 240, 240),
         "sounds": {
@@ -134,6 +141,7 @@ ENEMY_DATA = {
         "damage": 15,
         "speed": 90,
         "weight": 1.0,
+        "ranged": {"projectile": "arrow", "damage": 12, "range": 260, "cooldown": 1500},
         "xp": 20,
         "coins": 30,
         "drop_table": {
@@ -149,6 +157,7 @@ ENEMY_DATA = {
     "ghoul": {
         "name": "Ghoul",
         "type": "mob",
+        "behaviour": "zombie",
         "size": 25,
         "colour": (130, 200, 100),
         "sounds": {
@@ -174,6 +183,7 @@ ENEMY_DATA = {
     "corrupted_soul": {
         "name": "Corrupted Soul",
         "type": "mob",
+        "behaviour": "zombie",
         "size": 30,
         "colour": (130, 150, 100),
         "sounds": {
@@ -0,0 +1,19 @@
+# Static zone obstacles, placed via ZONE_DATA[...]["obstacles"] as (type, x, y, width, height).
+# Solid obstacles are baked into the zone's TileGrid and block players and enemies.
+OBSTACLE_DATA = {
+    "wall": {
+        "name": "Wall",
+        "colour": (90, 90, 110),
+        "solid": True,
+    },
+    "gravestone": {
+        "name": "Gravestone",
+        "colour": (120, 120, 120),
+        "solid": True,
+    },
+    "web": {
+        "name": "Web",
+        "colour": (200, 200, 210),
+        "solid": True,
+    },
+}
@@ -0,0 +1,21 @@
+# Projectile types fired by enemies with a "ranged" entry in ENEMY_DATA.
+# speed is px/s, life is seconds before the projectile fizzles, knockback is the
+# push applied to the player on hit (before the player's weight).
+PROJECTILE_DATA = {
+    "arrow": {
+        "name": "Arrow",
+        "speed": 420,
+        "radius": 3,
+        "life": 1.5,
+        "colour": (210, 190, 140),
+        "knockback": 120,
+    },
+    "web_shot": {
+        "name": "Web Shot",
+        "speed": 260,
+        "radius": 6,
+        "life": 1.2,
+        "colour": (235, 235, 235),
+        "knockback": 40,
+    },
+}
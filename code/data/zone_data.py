@@ -31,6 +31,7 @@ ZONE_DATA = [
         "connections": {
             "left": "starter_zone",
         },
+        "obstacles": [],
         "type": "combat",
         "requirements": {"combat": 2}
     },
@@ -46,6 +47,7 @@ ZONE_DATA = [
         "connections": {
             "right": "starter_zone",
         },
+        "obstacles": [],
         "type": "combat",
         "requirements": {"combat": 3 }
     },
@@ -61,6 +63,7 @@ ZONE_DATA = [
         "connections": {
             "bottom": "starter_zone",
         },
+        "obstacles": [],
         "type": "combat",
         "requirements": {"combat": 5}
     },
@@ -6,13 +6,13 @@ from format import *
 from ui.tooltip_builder import queue_tooltip
 from gamestate import GameState
 from player_inventory import ItemFullData
+from text_cache import blit_alpha, render_text
 
 def draw_typed_text(surface, font, segments, x, y, alpha=255):
     current_x = x
     for text, colour in segments:
-        surf = font.render(text, True, colour[:3]).convert_alpha()
-        surf.set_alpha(alpha)
-        surface.blit(surf, (current_x, y))
+        surf = render_text(font, text, colour[:3])
+        blit_alpha(surface, surf, (current_x, y), alpha)
         current_x += surf.get_width()
 
 def get_completion_bar_rect(panel_x, panel_y, panel_width, panel_height, padding=12, width=200, height=30):
@@ -41,7 +41,7 @@ def draw_button(surface, rect, text, font, mouse_pos, base_col=(50, 50, 50), tex
     if text_col is None:
         text_col = get_contrasting_text_colour(bg_colour)
 
-    text_surf = font.render(text, True, text_col)
+    text_surf = render_text(font, text, text_col)
     text_x = rect.x + (rect.width - text_surf.get_width()) // 2
     text_y = rect.y + (rect.height - text_surf.get_height()) // 2
     surface.blit(text_surf, (text_x, text_y))
@@ -58,7 +58,7 @@ def draw_progress_bar(surface, rect, progress, colour, border_colour=(255,255,25
     pygame.draw.rect(surface, colour, fill_rect)
 
     if text and font:
-        label = font.render(text, True, (255, 255, 255))
+        label = render_text(font, text, (255, 255, 255))
         surface.blit(label, (
             rect.centerx - label.get_width() // 2,
             rect.centery - label.get_height() // 2
@@ -1,13 +1,17 @@
 import math
-import random
 import pygame
 
 from data.enemy_data import ENEMY_DATA
 from draw_helpers import draw_progress_bar
-from state_machine import StateMachine
-from state import *
+from render_queue import RENDER_LAYER_ENEMY, RENDER_LAYER_HP_BAR
+from state_machine import Blackboard, get_behaviour
 from combat_entity import CombatEntity
 from base_entity import BaseEntity
+from game_clock import get_ticks
+from rng import get_rng
+
+_ai_rng = get_rng("ai")
+_drop_rng = get_rng("drops")
 
 class EnemyContext:
     def __init__(self, zone, player, camera, zone_size):
@@ -16,179 +20,11 @@ class EnemyContext:
         self.camera = camera
         self.zone_size = zone_size
 
-class MovementBehaviour:
-    def __init__(self):
-        self.initialized = False
-
-    def update(self, enemy, dt, ctx):
-        pass
-
-    def consume_effects(self):
-        return self.ctx.consume_effects()
-
-class MovementContext:
-    def __init__(self, player):
-        self.vector = pygame.Vector2()
-
-        self.player = player
-
-        self.pending_effects = []
-
-        self.fsm = None
-
-    def queue_effect(self, effect_type, **kwargs):
-        self.pending_effects.append({"type": effect_type, **kwargs})
-
-    def consume_effects(self):
-        effects = self.pending_effects
-        self.pending_effects = []
-        return effects
-
-class SpiderMovementBehaviour(MovementBehaviour):
-    def __init__(self, player):
-        super().__init__()
-        
-        self.ctx = MovementContext(player)
-        self.fsm = StateMachine()
-        self.ctx.fsm = self.fsm
-
-        self.fsm.add_state(WanderState(
-            name="wander",
-            speed_multiplier=0.8,
-            duration_range=(1.0, 2.0),
-            next_state="zigzag"
-        ))
-
-        self.fsm.add_state(ZigzagState(
-            name="zigzag",
-            speed_multiplier=1.5,
-            segment_duration_range=(0.1, 0.3),
-            total_duration_range=(1.0, 1.5),
-            next_state="leap"
-        ))
-
-        self.fsm.add_state(LeapState(
-            name="leap",
-            duration=0.3,
-            leap_strength=7.0,
-            decel_factor=0.2,
-            next_state="wander",
-            sound_id="spider_jump",
-            target_func=lambda e, ctx: ctx.player.pos,
-            target_radius=200
-        ))
-
-    def update(self, enemy, dt, ctx):
-        if not self.initialized:
-            self.fsm.change_state("wander", enemy, self.ctx)
-            self.initialized = True
-
-        self.fsm.update(enemy, dt, self.ctx)
-
-class SlimeMovementBehaviour(MovementBehaviour):
-    def __init__(self, player):
-        super().__init__()
-
-        self.ctx = MovementContext(player)
-        self.fsm = StateMachine()
-        self.ctx.fsm = self.fsm
-
-        self.fsm.add_state(IdleState(
-            name="idle",
-            duration_range=(1.0, 1.5),
-            next_state="squash"
-        ))
-
-        self.fsm.add_state(SquashState(
-            name="squash",
-            duration=0.7,
-            next_state="leap"
-        ))
-
-        self.fsm.add_state(LeapState(
-            name="leap",
-            duration=0.3,
-            leap_strength=4.0,
-            decel_factor=0.02,
-            next_state="wander",
-            sound_id="slime_jump"
-        ))
-
-        self.fsm.add_state(WanderState(
-            name="wander",
-            speed_multiplier=0.2,
-            duration_range=(2.0, 5.0),
-            next_state="idle"
-        ))
-
-    def update(self, enemy, dt, zone_ctx):
-        if not self.initialized:
-            self.fsm.change_state("idle", enemy, self.ctx)
-            self.initialized = True
-
-        self.fsm.update(enemy, dt, self.ctx)
-    
-class ZombieMovementBehaviour(MovementBehaviour):
-    def __init__(self, player):
-        super().__init__()
-
-        self.ctx = MovementContext(player)
-        self.fsm = StateMachine()
-        self.ctx.fsm = self.fsm
-
-        self.ctx.fsm.add_state(ChaseState(
-            name="chase",
-            radius=250,
-            speed_multiplier=1.5,
-            fallback="wander"
-        ))
-
-        self.ctx.fsm.add_state(WanderState(
-            name="wander",
-            speed_multiplier=0.5,
-            duration_range=(1.0, 2.0),
-            next_state="chase"
-        ))
-
-    def update(self, enemy, dt, zone_ctx):
-        if not self.initialized:
-            self.ctx.fsm.change_state("chase", enemy, self.ctx)
-            self.initialized = True
-
-        self.ctx.fsm.update(enemy, dt, self.ctx)
-
-class SkeletonMovementBehaviour(MovementBehaviour):
-    def __init__(self, player):
-        super().__init__()
-
-        self.ctx = MovementContext(player)
-        self.fsm = StateMachine()
-        self.ctx.fsm = self.fsm
-
-        self.ctx.fsm.add_state(StrafeState(
-            name="strafe",
-            radius=180,
-            fallback="wander",
-            duration=2.0,
-        ))
-
-        self.ctx.fsm.add_state(WanderState(
-            name="wander",
-            speed_multiplier=0.6,
-            duration_range=(1.0, 2.0),
-            next_state="strafe"
-        ))
-
-    def update(self, enemy, dt, zone_ctx):
-        if not self.initialized:
-            self.ctx.fsm.change_state("strafe", enemy, self.ctx)
-            self.initialized = True
-
-        self.ctx.fsm.update(enemy, dt, self.ctx)
-
 class Enemy(BaseEntity):
-    def __init__(self, x, y, enemy_id, zone):
+    def __init__(self, x, y, enemy_id, zone, player=None):
         data = ENEMY_DATA[enemy_id]
+        self._detached_pool = None  # holds the enemy's last state while it is dead; see EnemyPool.remove
+        zone.enemy_pool.allocate(self)  # pos/dx/dy live in the zone's pool from here on
         super().__init__(enemy_id, x, y, data["size"], data["size"], zone, type=data.get("type", "mob"))
         self.name = data["name"]
 
@@ -214,18 +50,27 @@ class Enemy(BaseEntity):
         self._last_contact_hit = 0 # attack cooldown for attacking player
         self.attack_radius = 25
 
+        self.ranged = data.get("ranged")  # projectile attack, fired through zone.projectiles
+        self._last_shot = 0
+
         self.combat = CombatEntity(
             owner=self,
             hp=data["hp"],
             max_hp=data["hp"],
             weight=data["weight"],
             regen_rate=data.get("regen", 0), # you can add this to ENEMY_DATA optionally
-            regen_interval=1000
+            regen_interval=1000,
+            knockback_fn=self._set_knockback
         )
+        self._pool.size[self._slot] = self.rect.size
+        self._pool.rect_pos[self._slot] = self.rect.topleft
+        self._pool.weight[self._slot] = self.combat.weight
         
         self.was_hit = False
         
-        self.movement_behaviour = None  # Optional AI
+        # Optional AI: a shared state graph plus this enemy's own blackboard
+        behaviour_id = data.get("behaviour")
+        self.blackboard = Blackboard(get_behaviour(behaviour_id), player) if behaviour_id else None
 
         # @temp stops legacy items crashing drop_items
         if isinstance(self.drop_table, list):
@@ -233,28 +78,99 @@ class Enemy(BaseEntity):
                 "common": self.drop_table
             }
 
+    def reset(self, x, y, player):
+        """Bring a dead enemy back as a fresh spawn at (x, y), reusing this instance."""
+        self.zone.enemy_pool.allocate(self)
+        self.set_pos(x, y)
+        self.rect.topleft = (x, y)
+        self._pool.size[self._slot] = self.rect.size
+        self._pool.rect_pos[self._slot] = self.rect.topleft
+        self._pool.weight[self._slot] = self.combat.weight
+        self.attack_radius = 25
+
+        self.current_colour = self.base_colour
+        self.change_dir_timer = 0
+        self.damage_cooldown = 0
+        self._last_contact_hit = 0
+        self._last_shot = 0
+        self.was_hit = False
+
+        self.combat.reset()
+        if self.blackboard:
+            self.blackboard.reset(player)
+
+    # Movement state is stored in the zone's EnemyPool; these are views onto one slot.
+    @property
+    def pos(self):
+        """A copy of the pool row: `enemy.pos.x += 5` changes nothing. Assign a whole
+        position (`enemy.pos = ...`, `enemy.pos += ...`) or use set_pos()/move()."""
+        return pygame.Vector2(self._pool.pos[self._slot])
+
+    @pos.setter
+    def pos(self, value):
+        self._pool.pos[self._slot] = value
+
+    def set_pos(self, x, y):
+        row = self._pool.pos[self._slot]
+        row[0] = x
+        row[1] = y
+
+    def move(self, dx, dy):
+        row = self._pool.pos[self._slot]
+        row[0] += dx
+        row[1] += dy
+
+    @property
+    def dx(self):
+        return float(self._pool.vel[self._slot, 0])
+
+    @dx.setter
+    def dx(self, value):
+        self._pool.vel[self._slot, 0] = value
+
+    @property
+    def dy(self):
+        return float(self._pool.vel[self._slot, 1])
+
+    @dy.setter
+    def dy(self, value):
+        self._pool.vel[self._slot, 1] = value
+
+    @property
+    def attack_radius(self):
+        return float(self._pool.attack_radius[self._slot])
+
+    @attack_radius.setter
+    def attack_radius(self, value):
+        self._pool.attack_radius[self._slot] = value
+
+    def _set_knockback(self, vector):
+        self._pool.knockback[self._slot] = vector
+
     def update(self, dt, ctx: EnemyContext):
+        # Movement, knockback and the contact check run batched in EnemyPool.step.
         self._update_damage_colour(dt)
 
-        if self.movement_behaviour:
-            self.movement_behaviour.update(self, dt, ctx)
+        blackboard = self.blackboard
+        if blackboard:
+            blackboard.fsm.update(self, dt, blackboard)
         else:
             self.wander(dt)
 
-        enemy_pos = pygame.Vector2(self.rect.center)
-        player_pos = pygame.Vector2(ctx.player.rect.center)
-
-        if enemy_pos.distance_to(player_pos) <= self.attack_radius:
-            self._try_deal_contact_damage(ctx.player)
-
         self.combat.update(dt)
 
-        self._apply_movement(dt, ctx.zone_size)
+        if self.ranged:
+            self._try_fire_projectile(ctx.player)
+
+        if blackboard and blackboard.pending_effects:
+            for effect in blackboard.consume_effects():
+                self.handle_effect(effect, dt, ctx)
 
-        self._sync_rect_to_pos()
+    def handle_effect(self, effect, dt, ctx):
+        pass  # effects queued by FSM states (leap landing particles, sounds)
 
     def _try_deal_contact_damage(self, player):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
 
         if now - self._last_contact_hit >= 1000: 
             direction = pygame.Vector2(player.rect.center) - pygame.Vector2(self.rect.center)
@@ -264,6 +180,27 @@ class Enemy(BaseEntity):
             player.combat.take_damage(damage, direction, attacker_entity=self)
             self._last_contact_hit = now
 
+    def _try_fire_projectile(self, player):
+        ranged = self.ranged
+        now = get_ticks()
+        if now - self._last_shot < ranged["cooldown"]:
+            return
+
+        ex, ey = self.rect.center
+        px, py = player.rect.center
+        dx, dy = px - ex, py - ey
+        if dx * dx + dy * dy > ranged["range"] ** 2 or not self.zone.los.visible(ex, ey, px, py):
+            return
+
+        # A fan of `count` shots, `spread` radians apart, centred on the player.
+        aim = math.atan2(dy, dx)
+        count = ranged.get("count", 1)
+        spread = ranged.get("spread", 0.0)
+        angles = [aim + spread * (i - (count - 1) / 2) for i in range(count)]
+
+        self.zone.projectiles.fire(self, ranged["projectile"], ex, ey, angles, ranged["damage"])
+        self._last_shot = now
+
     def _update_damage_colour(self, dt):
         if self.damage_cooldown > 0:
             t = self.damage_cooldown / self.max_damage_cooldown_duration
@@ -278,35 +215,13 @@ class Enemy(BaseEntity):
     def wander(self, dt):
         self.change_dir_timer -= dt
         if self.change_dir_timer <= 0:
-            angle = random.uniform(0, 2 * math.pi)
+            angle = _ai_rng.uniform(0, 2 * math.pi)
             self.dx = self.speed * math.cos(angle)
             self.dy = self.speed * math.sin(angle)
-            self.change_dir_timer = random.uniform(0.75, 1.5)
-
-    def _apply_movement(self, dt, zone_size):
-        self.pos.x += self.dx * dt
-        self.pos.y += self.dy * dt
-
-        max_x = zone_size - self.rect.width
-        max_y = zone_size - self.rect.height
-
-        if self.pos.x < 0 or self.pos.x > max_x:
-            self.pos.x = max(0, min(self.pos.x, max_x))
-            self.dx = -self.dx
-
-        if self.pos.y < 0 or self.pos.y > max_y:
-            self.pos.y = max(0, min(self.pos.y, max_y))
-            self.dy = -self.dy
-
-        if abs(self.dx) < 0.02: self.dx = 0
-        if abs(self.dy) < 0.02: self.dy = 0
-
-    def _apply_knockback(self, dt):
-        self.pos += self.knockback_vector * dt
-        self.knockback_vector *= math.exp(-KNOCKBACK_FRICTION * dt)
+            self.change_dir_timer = _ai_rng.uniform(0.75, 1.5)
 
     def _sync_rect_to_pos(self):
-        self.rect.topleft = (int(self.pos.x), int(self.pos.y))
+        self.rect.topleft = (int(self._pool.rect_pos[self._slot, 0]), int(self._pool.rect_pos[self._slot, 1]))
 
     def draw_hp_bar(self, screen, camera):
         if self.combat.hp == self.combat.max_hp:
@@ -336,12 +251,24 @@ class Enemy(BaseEntity):
     def debug_draw_attack_radius(self, screen, camera):
         pos = pygame.Vector2(self.rect.center)
         screen_pos = camera.apply(pos)
-        pygame.draw.circle(screen, (255, 0, 0), screen_pos, self.attack_radius, 3)
+        pygame.draw.circle(screen, (255, 0, 0), screen_pos, self.attack_radius * camera.scale, 3)
 
     def draw(self, screen, camera, font):
         self.draw_base(screen, camera, font)
         self.draw_hp_bar(screen, camera)
-        self.debug_draw_attack_radius(screen, camera)
+
+    def submit_sprites(self, queue):
+        """Batched draw(): queue the body and HP bar on a RenderQueue."""
+        rect = self.rect
+        queue.submit(RENDER_LAYER_ENEMY, queue.rect_sprite(self.current_colour, rect.width, rect.height), rect.x, rect.y)
+
+        if self.combat.hp == self.combat.max_hp:
+            return
+
+        progress = self.combat.hp / self.combat.max_hp
+        fill_width = min(rect.width, max(0, int(rect.width * progress)))
+        bar = queue.bar_sprite(rect.width, 5, fill_width, (0, 200, 0), (0, 0, 0), (120, 0, 0))
+        queue.submit(RENDER_LAYER_HP_BAR, bar, rect.centerx - rect.width // 2, rect.top - 2)
 
     def hit(self, amount, knockback_vector=pygame.Vector2(0, 0)): # return true on death
         self.combat.take_damage(amount, knockback_vector)
@@ -367,8 +294,8 @@ class Enemy(BaseEntity):
                     adjusted_chance = base_chance * (1 + magic_find / 100)
                     adjusted_chance = min(adjusted_chance, 0.05)
 
-                if random.random() <= adjusted_chance:
-                    amount = random.randint(*quantity)
+                if _drop_rng.random() <= adjusted_chance:
+                    amount = _drop_rng.randint(*quantity)
                     result[item_id] = {
                         "qty": amount,
                         "tier": tier,
@@ -377,73 +304,57 @@ class Enemy(BaseEntity):
 
 class Zombie(Enemy):
     def __init__(self, x, y, player, zone):
-        super().__init__(x, y, "zombie", zone)
-        self.movement_behaviour = ZombieMovementBehaviour(player)
+        super().__init__(x, y, "zombie", zone, player)
 
 class Ghoul(Enemy):
     def __init__(self, x, y, player, zone):
-        super().__init__(x, y, "ghoul", zone)
-        self.movement_behaviour = ZombieMovementBehaviour(player)
+        super().__init__(x, y, "ghoul", zone, player)
 
 class CorruptedSoul(Enemy):
     def __init__(self, x, y, player, zone):
-        super().__init__(x, y, "corrupted_soul", zone)
-        self.movement_behaviour = ZombieMovementBehaviour(player)
+        super().__init__(x, y, "corrupted_soul", zone, player)
 
 class Skeleton(Enemy):
     def __init__(self, x, y, player, zone):
-        super().__init__(x, y, "skeleton", zone)
-        self.movement_behaviour = SkeletonMovementBehaviour(player)
+        super().__init__(x, y, "skeleton", zone, player)
 
 class Spider(Enemy):
     def __init__(self, x, y, player, zone):
-        super().__init__(x, y, "spider", zone)
-        self.movement_behaviour = SpiderMovementBehaviour(player)
-
-    def update(self, dt, ctx):
-        super().update(dt, ctx)
-
-        if hasattr(self.movement_behaviour, "consume_effects"):
-            for effect in self.movement_behaviour.consume_effects():
-                if effect["type"] == "sound":
-                    ctx.sound_manager.queue_positional(
-                        effect["id"],
-                        effect["pos"],
-                        ctx.player.rect.center,
-                        400
-                    )
+        super().__init__(x, y, "spider", zone, player)
+
+    def handle_effect(self, effect, dt, ctx):
+        if effect["type"] == "sound":
+            ctx.sound_manager.queue_positional(
+                effect["id"],
+                effect["pos"],
+                ctx.player.rect.center,
+                400
+            )
 
 class RedSpider(Enemy):
     def __init__(self, x, y, player, zone):
-        super().__init__(x, y, "red_spider", zone)
-        self.movement_behaviour = SpiderMovementBehaviour(player)
+        super().__init__(x, y, "red_spider", zone, player)
 
 class Slime(Enemy):
     def __init__(self, x, y, player, zone):
-        super().__init__(x, y, "slime", zone)
-        self.movement_behaviour = SlimeMovementBehaviour(player)
-
-    def update(self, dt, ctx):
-        super().update(dt, ctx)
-
-        if hasattr(self.movement_behaviour, "consume_effects"):
-            for effect in self.movement_behaviour.consume_effects():
-                if effect["type"] == "particles":
-                    ctx.zone.spawn_particles(
-                        x=effect["pos"][0],
-                        y=effect["pos"][1],
-                        colour=effect.get("colour", (255, 255, 255)),
-                        source_x=effect["pos"][0],
-                        source_y=effect["pos"][1],
-                        count=effect.get("count", 8),
-                        life_min=effect.get("life_min", 0.08),
-                        life_max=effect.get("life_max", 0.15),
-                        dt=dt
-                    )
-                elif effect["type"] == "sound":
-                    ctx.sound_manager.queue_positional(
-                        effect["id"],
-                        effect["pos"],
-                        ctx.player.rect.center,
-                        400
-                    )
\ No newline at end of file
+        super().__init__(x, y, "slime", zone, player)
+
+    def handle_effect(self, effect, dt, ctx):
+        if effect["type"] == "particles":
+            ctx.zone.spawn_particles(
+                x=effect["pos"][0],
+                y=effect["pos"][1],
+                colour=effect.get("colour", (255, 255, 255)),
+                source_x=effect["pos"][0],
+                source_y=effect["pos"][1],
+                count=effect.get("count", 8),
+                life_min=effect.get("life_min", 0.08),
+                life_max=effect.get("life_max", 0.15)
+            )
+        elif effect["type"] == "sound":
+            ctx.sound_manager.queue_positional(
+                effect["id"],
+                effect["pos"],
+                ctx.player.rect.center,
+                400
+            )
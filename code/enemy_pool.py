@@ -0,0 +1,249 @@
+import math
+
+import numpy as np
+
+from combat_entity import KNOCKBACK_FRICTION
+
+ENEMY_POOL_INITIAL_CAPACITY = 64
+ENEMY_MIN_VELOCITY = 0.02  # smaller velocity components snap to 0
+ENEMY_SEPARATION_CELL_SIZE = 32  # neighbour grid cell; at least the largest enemy's width
+ENEMY_SEPARATION_MAX_NEIGHBOURS = 6  # per neighbouring cell, bounds the cost in dense crowds
+ENEMY_SEPARATION_STRENGTH = 0.5  # fraction of the overlap resolved per frame
+
+_FORWARD_CELLS = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))  # half the 3x3 block; pairs are symmetric
+
+class EnemyPool:
+    """Per-zone structure-of-arrays store for enemy movement state.
+
+    Each enemy owns one slot; Enemy.pos, dx, dy and attack_radius read and write
+    these arrays, so FSM states keep working per enemy while step() moves everyone
+    in one batch. Slots are kept dense by swapping the last enemy into a freed slot.
+    """
+
+    def __init__(self, zone_size, capacity=ENEMY_POOL_INITIAL_CAPACITY):
+        self.zone_size = zone_size
+        self.count = 0
+        self.entities = []
+        self.tiles = None  # the zone's TileGrid, if it has solid obstacles
+
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.knockback = np.zeros((capacity, 2))
+        self.size = np.zeros((capacity, 2), dtype=np.intp)
+        self.attack_radius = np.zeros(capacity)
+        self.weight = np.ones(capacity)
+        self.rect_pos = np.zeros((capacity, 2), dtype=np.intp)  # rect.topleft as last synced
+        self.ai_dt = np.zeros(capacity)  # dt accumulated since the enemy's last AI tick
+
+        self._arrays = ("pos", "vel", "knockback", "size", "attack_radius", "weight", "rect_pos", "ai_dt")
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        for name in self._arrays:
+            old = getattr(self, name)
+            new = np.zeros((len(old) * 2,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def allocate(self, enemy):
+        if self.count == len(self.pos):
+            self._grow()
+
+        slot = self.count
+        for name in self._arrays:
+            getattr(self, name)[slot] = 0
+
+        self.entities.append(enemy)
+        self.count += 1
+
+        enemy._pool = self
+        enemy._slot = slot
+        return slot
+
+    def remove(self, enemy):
+        """Free the enemy's slot. The enemy keeps its last state in a private pool so
+        anything still holding it (pending combat results, popups) can read it."""
+        slot = enemy._slot
+        last = self.count - 1
+
+        # One single-slot pool per enemy, made on its first death and reused after.
+        detached = enemy._detached_pool
+        if detached is None:
+            detached = enemy._detached_pool = EnemyPool(self.zone_size, capacity=1)
+        detached.count = 0
+        detached.entities.clear()
+        detached.allocate(enemy)
+        for name in self._arrays:
+            getattr(detached, name)[0] = getattr(self, name)[slot]
+
+        if slot != last:
+            for name in self._arrays:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            moved = self.entities[last]
+            self.entities[slot] = moved
+            moved._slot = slot
+
+        self.entities.pop()
+        self.count -= 1
+
+    def step(self, dt, player_center, separate=None):
+        """Integrate knockback and movement for every enemy. Crowd separation runs over
+        the `separate` slots (default: all), before positions are clamped and committed.
+
+        Returns (contact, moved): slots whose centre was within attack_radius of the
+        player before moving, and slots whose integer rect position changed.
+        """
+        n = self.count
+        if not n:
+            return [], []
+
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+        knockback = self.knockback[:n]
+        size = self.size[:n]
+
+        # Contact uses the pre-move rect centre, as the per-enemy check used to.
+        px, py = player_center
+        offset_x = pos[:, 0].astype(np.intp) + size[:, 0] // 2 - px
+        offset_y = pos[:, 1].astype(np.intp) + size[:, 1] // 2 - py
+        radius = self.attack_radius[:n]
+        contact = np.flatnonzero(offset_x * offset_x + offset_y * offset_y <= radius * radius)
+
+        start = pos.copy()
+        pos += knockback * dt
+        knockback *= math.exp(-KNOCKBACK_FRICTION * dt)
+
+        pos += vel * dt
+        if separate is None:
+            pos += self.separation(pos, size, self.weight[:n])
+        elif len(separate):
+            pos[separate] += self.separation(pos[separate], size[separate], self.weight[separate])
+
+        if self.tiles is not None and self.tiles.solid_tiles:
+            self._collide_tiles(start, pos, vel, size)
+
+        max_pos = self.zone_size - size
+        out_of_bounds = (pos < 0) | (pos > max_pos)
+        np.clip(pos, 0, max_pos, out=pos)
+        np.negative(vel, out=vel, where=out_of_bounds)
+        vel[np.abs(vel) < ENEMY_MIN_VELOCITY] = 0
+
+        rect_pos = self.rect_pos[:n]
+        new_rect_pos = pos.astype(np.intp)
+        moved = np.flatnonzero((new_rect_pos != rect_pos).any(axis=1))
+        rect_pos[:] = new_rect_pos
+
+        return contact.tolist(), moved.tolist()
+
+    def _collide_tiles(self, start, pos, vel, size):
+        """Undo the x and then the y part of this frame's move for enemies whose leading
+        edge entered a solid tile, bouncing their velocity like the zone bounds do.
+        Only enemies whose leading edge crossed into a new tile are looked up."""
+        tiles = self.tiles
+        ts = tiles.tile_size
+
+        for axis in (0, 1):
+            old = start[:, axis].astype(np.intp)
+            new = pos[:, axis].astype(np.intp)
+            length = size[:, axis]
+            forward = new > old
+            old_edge = np.where(forward, old + length - 1, old) // ts
+            new_edge = np.where(forward, new + length - 1, new)
+            crossed = np.flatnonzero((new_edge // ts) != old_edge)
+            if not len(crossed):
+                continue
+
+            # The other axis uses its pre-move value for x, and the resolved x for y.
+            other = 1 - axis
+            across = (pos if axis else start)[crossed, other].astype(np.intp)
+            blocked = tiles.edges_blocked(new_edge[crossed], across, size[crossed, other], axis == 0)
+            hit = crossed[blocked]
+            pos[hit, axis] = start[hit, axis]
+            vel[hit, axis] = -vel[hit, axis]
+
+    def separation(self, pos, size, weight):
+        """Displacements that push overlapping enemies apart, treating each as a circle
+        of its half width. Enemies are bucketed into a grid and each one is only paired
+        with the first few enemies of its own and four neighbouring cells (the other four
+        see it from their side), so the cost stays linear however dense the crowd is.
+        Of each overlap, an enemy takes the share given by the other's weight."""
+        n = len(pos)
+        push = np.zeros((n, 2))
+        if n < 2:
+            return push
+
+        cell_size = ENEMY_SEPARATION_CELL_SIZE
+        cols = self.zone_size // cell_size + 1
+        centre = pos + size / 2
+        cell = np.clip((centre // cell_size).astype(np.intp), 0, cols - 1)
+        key = cell[:, 1] * cols + cell[:, 0]
+
+        # Work in cell order so each cell's enemies are one contiguous run. Coordinates
+        # are kept as 1-D arrays because gathering rows of an (n, 2) array is much slower.
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        cell_x = cell[order, 0]
+        cell_y = cell[order, 1]
+        x = centre[order, 0]
+        y = centre[order, 1]
+        radius = size[order, 0] / 2
+        weight = weight[order]
+
+        starts = []
+        counts = []
+        owners = []
+        for ox, oy in _FORWARD_CELLS:
+            nx = cell_x + ox
+            ny = cell_y + oy
+            valid = np.flatnonzero((nx >= 0) & (nx < cols) & (ny < cols))
+            neighbour_key = ny[valid] * cols + nx[valid]
+            end = np.searchsorted(key, neighbour_key, "right")
+            if ox or oy:
+                start = np.searchsorted(key, neighbour_key, "left")
+            else:
+                start = valid + 1  # own cell: only the enemies after this one
+            starts.append(start)
+            counts.append(np.clip(end - start, 0, ENEMY_SEPARATION_MAX_NEIGHBOURS))
+            owners.append(valid)
+
+        counts = np.concatenate(counts)
+        total = int(counts.sum())
+        if not total:
+            return push
+
+        first = np.cumsum(counts) - counts
+        i = np.repeat(np.concatenate(owners), counts)
+        j = np.repeat(np.concatenate(starts) - first, counts) + np.arange(total)
+
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        dist_sq = dx * dx + dy * dy
+        reach = radius[i] + radius[j]
+        hit = np.flatnonzero(dist_sq < reach * reach)
+        if not len(hit):
+            return push
+
+        i = i[hit]
+        j = j[hit]
+        dx = dx[hit]
+        dy = dy[hit]
+        dist = np.sqrt(dist_sq[hit])
+        overlap = reach[hit] - dist
+
+        # Enemies on exactly the same spot split along x.
+        stacked = dist == 0
+        dx[stacked] = 1.0
+        dist[stacked] = 1.0
+
+        wi = weight[i]
+        wj = weight[j]
+        overlap *= ENEMY_SEPARATION_STRENGTH / (dist * (wi + wj))
+        dx *= overlap
+        dy *= overlap
+
+        push[order, 0] = np.bincount(i, dx * wj, minlength=n) - np.bincount(j, dx * wi, minlength=n)
+        push[order, 1] = np.bincount(i, dy * wj, minlength=n) - np.bincount(j, dy * wi, minlength=n)
+        return push
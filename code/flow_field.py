@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+
+FLOW_FIELD_CELL_SIZE = 32
+FLOW_FIELD_RADIUS = 512  # px around the player covered by the field; chase radii are far smaller
+
+_DIAGONAL = math.sqrt(2)
+_NEIGHBOURS = (
+    (-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+    (-1, -1, _DIAGONAL), (-1, 1, _DIAGONAL), (1, -1, _DIAGONAL), (1, 1, _DIAGONAL),
+)
+
+class FlowField:
+    """Grid of unit directions leading to the player's cell.
+
+    The field covers a window of `radius` px around the player and is rebuilt only
+    when the player enters another cell or the blocked cells change (invalidate()), so
+    any number of chasers pay one rebuild plus an O(1) direction_at() lookup each, and
+    the rebuild cost doesn't grow with the zone. Diagonal steps may not cut blocked
+    corners.
+    """
+
+    def __init__(self, zone_size, cell_size=FLOW_FIELD_CELL_SIZE, radius=FLOW_FIELD_RADIUS):
+        self.zone_size = zone_size
+        self.cell_size = cell_size
+        self.cols = max(1, -(-zone_size // cell_size))
+        self.reach = max(1, radius // cell_size)  # window half-size in cells
+        self.blocked = np.zeros((self.cols, self.cols), dtype=bool)  # [row, col]
+
+        self.target_cell = None
+        self.origin = (0, 0)  # window's top-left cell
+        self.width = 0
+        self.height = 0
+        self.distance = None  # [row, col] within the window
+        self.directions = []
+        self.rebuilds = 0
+
+    def cell_of(self, x, y):
+        last = self.cols - 1
+        col = min(max(int(x // self.cell_size), 0), last)
+        row = min(max(int(y // self.cell_size), 0), last)
+        return row, col
+
+    def set_blocked(self, blocked):
+        self.blocked = np.asarray(blocked, dtype=bool)
+        self.invalidate()
+
+    def invalidate(self):
+        self.target_cell = None
+
+    def update(self, target_x, target_y):
+        cell = self.cell_of(target_x, target_y)
+        if cell != self.target_cell:
+            self.target_cell = cell
+            self._rebuild()
+
+    def direction_at(self, x, y):
+        """Unit (dx, dy) to follow from (x, y), or None in the target cell or where the
+        target is unreachable (callers then steer straight at the target)."""
+        row, col = self.cell_of(x, y)
+        row -= self.origin[0]
+        col -= self.origin[1]
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.directions[row * self.width + col]
+        return None
+
+    def _shifted(self, padded, dy, dx):
+        h, w = padded.shape
+        return padded[1 + dy:h - 1 + dy, 1 + dx:w - 1 + dx]
+
+    def _rebuild(self):
+        row, col = self.target_cell
+        top = max(row - self.reach, 0)
+        left = max(col - self.reach, 0)
+        blocked = self.blocked[top:row + self.reach + 1, left:col + self.reach + 1].copy()
+        blocked[row - top, col - left] = False  # the player can stand in a partly blocked cell
+        h, w = blocked.shape
+
+        open_cells = np.zeros((h + 2, w + 2), dtype=bool)  # the padding border counts as blocked
+        open_cells[1:-1, 1:-1] = ~blocked
+
+        # A step is allowed between open cells and, for diagonals, only if both
+        # orthogonal cells it passes between are open too.
+        steps = []
+        for dy, dx, cost in _NEIGHBOURS:
+            allowed = self._shifted(open_cells, dy, dx) & ~blocked
+            if dy and dx:
+                allowed &= self._shifted(open_cells, dy, 0) & self._shifted(open_cells, 0, dx)
+            steps.append((dy, dx, cost, allowed))
+
+        dist = np.full((h + 2, w + 2), np.inf)
+        dist[row - top + 1, col - left + 1] = 0.0
+        core = dist[1:-1, 1:-1]
+
+        # Relax until stable; converges in about as many passes as the longest path,
+        # and no shortest path can visit more than every cell in the window.
+        for _ in range(h * w):
+            best = core.copy()
+            for dy, dx, cost, allowed in steps:
+                candidate = self._shifted(dist, dy, dx) + cost
+                np.minimum(best, candidate, out=best, where=allowed)
+            if np.array_equal(best, core):
+                break
+            core[:] = best
+
+        # Direction: descent towards lower neighbours, weighted by how much lower they are.
+        dir_x = np.zeros((h, w))
+        dir_y = np.zeros((h, w))
+        with np.errstate(invalid="ignore"):
+            for dy, dx, cost, allowed in steps:
+                drop = np.where(allowed, (core - self._shifted(dist, dy, dx)) / cost, 0.0)
+                np.nan_to_num(drop, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+                np.maximum(drop, 0.0, out=drop)
+                dir_x += drop * dx / cost
+                dir_y += drop * dy / cost
+
+        length = np.hypot(dir_x, dir_y)
+        usable = (length > 0) & np.isfinite(core)
+        length[~usable] = 1.0
+        dir_x /= length
+        dir_y /= length
+
+        self.origin = (top, left)
+        self.width = w
+        self.height = h
+        self.distance = core.copy()
+        self.directions = [
+            (x, y) if ok else None
+            for x, y, ok in zip(dir_x.ravel().tolist(), dir_y.ravel().tolist(), usable.ravel().tolist())
+        ]
+        self.rebuilds += 1
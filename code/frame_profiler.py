@@ -0,0 +1,195 @@
+import csv
+import os
+import time
+from collections import deque
+
+import pygame
+
+from tracer import get_tracer
+from text_cache import render_text
+from surface_pool import get_surface_pool
+
+PROFILER_HISTORY_FRAMES = 300
+PROFILER_OVERLAY_REFRESH_FRAMES = 15
+PROFILER_OVERLAY_BG_COLOUR = (0, 0, 0, 170)
+PROFILER_OVERLAY_TEXT_COLOUR = (220, 220, 220)
+PROFILER_OVERLAY_WARN_COLOUR = (255, 120, 80)
+PROFILER_OVERLAY_PADDING = 8
+PROFILER_OVERLAY_MAX_SIZE = (600, 720)  # one pooled surface this size; rows beyond it are clipped
+PROFILER_FRAME_BUDGET_MS = 7.0
+PROFILER_EXPORT_DIR = "profiles"
+
+class _Scope:
+    __slots__ = ("profiler", "name", "starts")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.starts = []  # one per open `with`, so the scope can be re-entered
+
+    def __enter__(self):
+        self.starts.append(time.perf_counter_ns())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        start = self.starts.pop()
+        elapsed = time.perf_counter_ns() - start
+        # A nested scope of the same name is already inside the outer one's time.
+        if not self.starts:
+            current = self.profiler._current
+            current[self.name] = current.get(self.name, 0) + elapsed
+
+        tracer = get_tracer()
+        if tracer.recording:
+            tracer.complete(self.name, "frame", start, elapsed)
+        return False
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+class FrameProfiler:
+    def __init__(self, history=PROFILER_HISTORY_FRAMES, enabled=True):
+        self.enabled = enabled
+        self.frames = deque(maxlen=history)  # per frame: ({phase: ms}, {counter: value})
+        self.phase_order = []
+        self.counters = {}
+
+        self._scopes = {}
+        self._current = {}
+        self._frame_start = 0
+        self._frame_index = 0
+
+        self._overlay_surface = None
+        self._overlay_area = None
+        self._overlay_age = PROFILER_OVERLAY_REFRESH_FRAMES
+
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+
+        scope = self._scopes.get(name)
+        if scope is None:
+            scope = _Scope(self, name)
+            self._scopes[name] = scope
+            self.phase_order.append(name)
+        return scope
+
+    def count(self, name, value):
+        self.counters[name] = value
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._current = {}
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+
+        frame_ns = time.perf_counter_ns() - self._frame_start
+        phases = {name: ns / 1e6 for name, ns in self._current.items()}
+        phases["frame"] = frame_ns / 1e6
+
+        tracer = get_tracer()
+        if tracer.recording:
+            tracer.complete("frame", "frame", self._frame_start, frame_ns, {"index": self._frame_index})
+
+        self.frames.append((self._frame_index, phases, dict(self.counters)))
+        self._frame_index += 1
+        self._overlay_age += 1
+
+    def get_phase_stats(self, name):
+        values = sorted(phases.get(name, 0.0) for _, phases, _ in self.frames)
+        if not values:
+            return 0.0, 0.0, 0.0
+
+        mean = sum(values) / len(values)
+        p95 = values[int(0.95 * (len(values) - 1))]
+        return mean, p95, values[-1]
+
+    def export_csv(self, path=None):
+        if path is None:
+            os.makedirs(PROFILER_EXPORT_DIR, exist_ok=True)
+            path = os.path.join(PROFILER_EXPORT_DIR, f"frame_profile_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+
+        phase_names = ["frame"] + self.phase_order
+        counter_names = sorted({name for _, _, counters in self.frames for name in counters})
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame_index"] + [f"{name}_ms" for name in phase_names] + counter_names)
+            for index, phases, counters in self.frames:
+                writer.writerow(
+                    [index]
+                    + [f"{phases.get(name, 0.0):.4f}" for name in phase_names]
+                    + [counters.get(name, "") for name in counter_names]
+                )
+
+        return path
+
+    def _build_overlay(self, font):
+        rows = [("phase", "mean", "p95", "max")]
+        warn_rows = set()
+
+        for name in ["frame"] + self.phase_order:
+            mean, p95, peak = self.get_phase_stats(name)
+            if name == "frame" and p95 > PROFILER_FRAME_BUDGET_MS:
+                warn_rows.add(len(rows))
+            rows.append((name, f"{mean:.2f}", f"{p95:.2f}", f"{peak:.2f}"))
+
+        rows.append(("", "", "", ""))
+        for name, value in self.counters.items():
+            rows.append((name, str(value), "", ""))
+
+        column_widths = [max(font.size(row[i])[0] for row in rows) + PROFILER_OVERLAY_PADDING * 2 for i in range(4)]
+        line_height = font.get_height()
+
+        max_width, max_height = PROFILER_OVERLAY_MAX_SIZE
+        width = min(max_width, sum(column_widths) + PROFILER_OVERLAY_PADDING)
+        height = min(max_height, len(rows) * line_height + PROFILER_OVERLAY_PADDING * 2)
+
+        # Nothing else asks the pool for this size, so the overlay survives between rebuilds.
+        surface = get_surface_pool().get(PROFILER_OVERLAY_MAX_SIZE, pygame.SRCALPHA)
+        area = pygame.Rect(0, 0, width, height)
+        surface.fill(PROFILER_OVERLAY_BG_COLOUR, area)
+
+        y = PROFILER_OVERLAY_PADDING
+        for row_index, row in enumerate(rows):
+            colour = PROFILER_OVERLAY_WARN_COLOUR if row_index in warn_rows else PROFILER_OVERLAY_TEXT_COLOUR
+            x = PROFILER_OVERLAY_PADDING
+            for column_index, text in enumerate(row):
+                if text:
+                    surface.blit(render_text(font, text, colour), (x, y))
+                x += column_widths[column_index]
+            y += line_height
+
+        return surface, area
+
+    def draw_overlay(self, screen, font, pos):
+        # Rebuilding every frame would make the overlay show up in its own numbers.
+        if self._overlay_surface is None or self._overlay_age >= PROFILER_OVERLAY_REFRESH_FRAMES:
+            self._overlay_surface, self._overlay_area = self._build_overlay(font)
+            self._overlay_age = 0
+
+        screen.blit(self._overlay_surface, pos, self._overlay_area)
+
+_profiler = FrameProfiler()
+
+def get_profiler():
+    return _profiler
+
+def set_profiler(profiler):
+    global _profiler
+    _profiler = profiler
+
+def profile_scope(name):
+    return _profiler.scope(name)
@@ -8,31 +8,40 @@ from ui.inventoryui import InventoryUI
 from ui.beastiaryui import BeastiaryUI
 from data.item_data import *
 from zone import Zone
+from spawn_director import SPAWN_RESPAWN_DELAY, SPAWN_RATE
 from data.zone_data import ZONE_DATA
 from zone_transition import ZoneTransition
 from utils import *
 from draw_helpers import *
 from ui.tooltip_context import TooltipContext
 from ui.tooltip_builder import *
-from ui.popup import Popup
+from ui.popup import PopupManager
 from format import format_number_short, describe_stat_bonus, get_skill_colour
 from sound_manager import SoundManager
 from ui.message_log import MessageLog
 from ui.pickup_log import PickupLog
 from experience import *
+from frame_profiler import get_profiler, profile_scope
+from tracer import get_tracer
+from combat_events import get_combat_events, CombatEventBuffer
+from text_cache import render_text, get_text_cache, get_sys_font
+from input_source import get_mouse_pos
+from render_queue import get_render_queue, RENDER_LAYER_PLAYER
+from surface_pool import get_surface_pool
 
 class Game:
-    def __init__(self):
-        self.font = pygame.font.SysFont(None, FONT_SIZE)
+    def __init__(self, headless=False):
+        self.headless = headless
+        self.font = get_sys_font(None, FONT_SIZE)
 
         self.state = GameState.PLAYING
 
-        self.surface = pygame.Surface((VIEWPORT_WIDTH, VIEWPORT_HEIGHT))
+        self.set_render_scale(RENDER_SCALE)
 
         self.zones = {}
         self.current_zone = None
-        self.zone_font = pygame.font.SysFont("serif", 48)
-        self.zone_subtitle_font = pygame.font.SysFont("serif", 24)
+        self.zone_font = get_sys_font("serif", 48)
+        self.zone_subtitle_font = get_sys_font("serif", 24)
         self.transition = ZoneTransition(VIEWPORT_WIDTH, VIEWPORT_HEIGHT, self.zone_font, self.zone_subtitle_font)
         self.load_zones()
 
@@ -44,10 +53,9 @@ class Game:
         self.pickup_log = PickupLog(self.font)
         self.message_log = MessageLog(font=self.font)
 
-        self.damage_popups = []
-        self.xp_popups = []
+        self.popups = PopupManager()
 
-        self.sound_manager = SoundManager()
+        self.sound_manager = SoundManager(muted=headless)
 
         self.inventoryui = InventoryUI(self.player, self.font, self.sound_manager)
         self.beastiary_ui = BeastiaryUI(self.player, self.font)
@@ -55,8 +63,26 @@ class Game:
         self.damage_overlay_alpha = 0
         self.damage_overlay_decay_rate = 300
 
+        self.profiler = get_profiler()
+        self.show_profiler_overlay = False
+        self.tracer = get_tracer()
+        self.combat_event_buffer = CombatEventBuffer()
+        self.show_combat_events = False
+
+        self.dirty_rects = None  # screen regions present() pushes to the display; None = all of it
+        self._ui_pane_signature = None
+
         self._change_zone("starter_zone")
 
+    def set_render_scale(self, scale):
+        """Render the world at scale x the viewport's resolution and upscale it when
+        compositing; the UI stays at native resolution."""
+        self.render_scale = scale
+        size = (max(1, round(VIEWPORT_WIDTH * scale)), max(1, round(VIEWPORT_HEIGHT * scale)))
+        self.surface = pygame.Surface(size)
+        self._upscaled_surface = pygame.Surface((VIEWPORT_WIDTH, VIEWPORT_HEIGHT)) if scale != 1.0 else None
+        get_render_queue().set_scale(scale)
+
     def load_zones(self):
         for z in ZONE_DATA:
             self.zones[z["id"]] = Zone(
@@ -71,6 +97,11 @@ class Game:
                 name=z.get("name", "NONAME"),
                 type=z.get("type", "combat"),
                 requirements=z.get("requirements", {}),
+                respawn_delay=z.get("respawn_delay", SPAWN_RESPAWN_DELAY),
+                spawn_rate=z.get("spawn_rate", SPAWN_RATE),
+                max_enemies=z.get("max_enemies"),
+                waves=z.get("waves"),
+                obstacles=z.get("obstacles"),
             )
         
     def _change_zone(self, next_zone_id, exit_direction=None):
@@ -156,6 +187,31 @@ class Game:
     def handle_keydown_event(self, key):
         active_ui = self.get_active_ui()
 
+        if key == pygame.K_F3:
+            self.show_profiler_overlay = not self.show_profiler_overlay
+            return
+        if key == pygame.K_F4:
+            path = self.profiler.export_csv()
+            self.message_log.queue([("Frame profile saved to ", "white"), (path, "number")])
+            return
+        if key == pygame.K_F5:
+            if self.tracer.recording:
+                path = self.tracer.stop()
+                self.message_log.queue([("Trace saved to ", "white"), (path, "number")])
+            else:
+                self.tracer.start()
+                self.message_log.queue([("Trace recording started", "white")])
+            return
+        if key == pygame.K_F6:
+            # The buffer is only subscribed while visible so combat pays nothing otherwise.
+            self.show_combat_events = not self.show_combat_events
+            if self.show_combat_events:
+                get_combat_events().subscribe(self.combat_event_buffer)
+            else:
+                get_combat_events().unsubscribe(self.combat_event_buffer)
+                self.combat_event_buffer.clear()
+            return
+
         key_to_state_toggle = {
             pygame.K_TAB: GameState.INVENTORY,
             pygame.K_b: GameState.BEASTIARY,
@@ -207,7 +263,7 @@ class Game:
         ]
 
     def spawn_xp_popup(self, x, y, offset_y, label, colour):
-        self.xp_popups.append(Popup(x, y + offset_y, label, colour=colour))
+        self.popups.spawn_xp(x, y + offset_y, label, colour)
         return offset_y + 28
 
     def handle_gainxp(self, skill, amount, origin=None):
@@ -308,7 +364,7 @@ class Game:
         if not enemy:
             return
 
-        self.damage_popups.append(Popup(enemy.pos.x, enemy.pos.y, enemy.combat.last_damage_taken))
+        self.popups.spawn_damage(enemy.pos.x, enemy.pos.y, enemy.combat.last_damage_taken)
 
         if enemy.sounds.get("hit"):
             self.sound_manager.queue(enemy.sounds["hit"])
@@ -360,17 +416,18 @@ class Game:
     def update(self, dt, clock):
         clear_tooltips()
 
-        self.mouse_pos = pygame.mouse.get_pos()
+        self.mouse_pos = get_mouse_pos()
         self.mouse_world = pygame.Vector2(self.mouse_pos) - self.camera.offset
 
         if self.state != GameState.PLAYING:
             return
         
-        self.hovered_target, self.target_pos, self.target_radius = self.player.get_target_info(
-            self.current_zone, self.mouse_world, self.player.active_item.skill
-        )
+        with profile_scope("player_update"):
+            self.hovered_target, self.target_pos, self.target_radius = self.player.get_target_info(
+                self.current_zone, self.mouse_world, self.player.active_item.skill
+            )
 
-        self.player.update(dt, self.current_zone.size)
+            self.player.update(dt, self.current_zone.size)
 
         if self.player.combat.hp <= 0:
             self.player.combat.revive()
@@ -387,36 +444,48 @@ class Game:
         self.camera.update(dt, self.player.rect)
 
         if not self.state == GameState.PAUSED:
-            self.current_zone.update(dt, self.player, self.camera, self.sound_manager)
+            with profile_scope("zone_update"):
+                self.current_zone.update(dt, self.player, self.camera, self.sound_manager)
 
-        self.handle_zone_transition(dt)
+        with profile_scope("zone_transition"):
+            self.handle_zone_transition(dt)
 
         item = self.player.active_item
 
-        should_use = self.mouse_held and item.ready(self.player)
+        with profile_scope("combat"):
+            should_use = self.mouse_held and item.ready(self.player)
 
-        if should_use and self.hovered_target:
-            if item.skill == "combat":
-                item.trigger(self.player)
-                self.current_zone.process_combat(self.player, self.hovered_target, item, self.camera, dt)
+            if should_use and self.hovered_target:
+                if item.skill == "combat":
+                    item.trigger(self.player)
+                    self.current_zone.process_combat(self.player, self.hovered_target, item, self.camera, dt)
 
-        self.current_zone.flush_combat_results(self)
+        pending = self.current_zone.pending_enemy_results
+        if pending and self.tracer.recording:
+            kills = sum(1 for result in pending if result.target.combat.hp <= 0)
+            self.tracer.instant("combat_results", "combat", {"results": len(pending), "kills": kills})
+
+        with profile_scope("flush_combat_results"):
+            self.current_zone.flush_combat_results(self)
         
         self.pickup_log.update()
 
-        for popup in self.damage_popups:
-            popup.update()
-
-        for popup in self.xp_popups:
-            popup.update()
-
-        self.damage_popups = [p for p in self.damage_popups if p.is_alive()]
-        self.xp_popups = [p for p in self.xp_popups if p.is_alive()]
+        with profile_scope("popups_update"):
+            self.popups.update(dt)
 
         self._popup_offsets = {}
 
         self.fps = clock.get_fps()
 
+        self.profiler.count("enemies", len(self.current_zone.enemies))
+        self.profiler.count("particles", len(self.current_zone.particles))
+        for tier, count in self.current_zone.ai_lod.tier_counts.items():
+            self.profiler.count(f"ai_{tier}", count)
+        self.profiler.count("ai_ticked", self.current_zone.ai_lod.ticked)
+        self.profiler.count("popups", len(self.popups))
+        self.profiler.count("effect_hooks", len(self.current_zone.effect_hooks))
+        self.profiler.count("text_cache_hit_%", int(get_text_cache().hit_rate() * 100))
+
     def draw_hotbar_slot(self, screen, x, y, index, item_id, selected):
         rect = pygame.Rect(x, y, HOTBAR_EQUIP_SLOT_SIZE, HOTBAR_EQUIP_SLOT_SIZE)
 
@@ -424,7 +493,7 @@ class Game:
         pygame.draw.rect(screen, slot_colour, rect)
         pygame.draw.rect(screen, HOTBAR_EQUIP_PANEL_BORDER_COLOUR, rect, HOTBAR_EQUIP_PANEL_BORDER_WIDTH)
 
-        number_label = self.font.render(str(index), True, HOTBAR_EQUIP_LABEL_COLOUR)
+        number_label = render_text(self.font, str(index), HOTBAR_EQUIP_LABEL_COLOUR)
         screen.blit(number_label, (x, y + HOTBAR_EQUIP_SLOT_SIZE + HOTBAR_EQUIP_LABEL_Y_SPACING))
 
         if item_id:
@@ -432,7 +501,7 @@ class Game:
             label = self.get_item_type_label(item.base_data)
 
             if label:
-                label_surf = self.font.render(label, True, (255, 255, 255))
+                label_surf = render_text(self.font, label, (255, 255, 255))
                 screen.blit(label_surf, (
                     rect.right - label_surf.get_width() - 4,
                     rect.bottom - label_surf.get_height() - 4
@@ -473,7 +542,7 @@ class Game:
         hp_bar_rect = pygame.Rect(x, y, width, height)
         draw_progress_bar(screen, hp_bar_rect, progress, (255, 80, 80), text=text, font=self.font)
 
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
         if hp_bar_rect.collidepoint(mouse_pos):
             healing_sources = self.player.stats.get_healing_sources()
 
@@ -504,13 +573,13 @@ class Game:
         return y
 
     def _draw_gold_and_action(self, screen, x, y):
-        gold = self.font.render(f"Gold: {self.player.gold}", True, UI_GOLD_TEXT_COLOUR)
+        gold = render_text(self.font, f"Gold: {self.player.gold}", UI_GOLD_TEXT_COLOUR)
         screen.blit(gold, (x, y))
         y += gold.get_height() + 4
 
         action = self.player.active_item.action.title()
         colour = SKILL_COLOURS.get(action.lower(), (255, 255, 255))
-        action_surf = self.font.render(f"Action: {action}", True, colour)
+        action_surf = render_text(self.font, f"Action: {action}", colour)
         screen.blit(action_surf, (x, y))
         y += action_surf.get_height() + 4
 
@@ -574,45 +643,55 @@ class Game:
             active_ui.update()
             active_ui.draw(screen)
 
+    def draw_tooltips(self, screen):
+        drawn = False
         for tooltip in get_tooltips():
             if self.state in tooltip.get("required_states", {}):
                 tooltip_ctx = TooltipContext(font=self.font, player=self.player, **tooltip)
                 lines = build_tooltip_lines(tooltip, tooltip_ctx)
                 draw_tooltip_lines(screen, lines, tooltip_ctx.font, tooltip["position"])
+                drawn = True
+        return drawn
 
     def _is_paused(self):
         return self.state not in (GameState.PLAYING, GameState.MESSAGE_LOG)
     
     def _draw_zone(self):
-        self.current_zone.draw(self.surface, self.camera, self.font, self.player, self.zones, self.sound_manager)
+        with profile_scope("zone_draw"):
+            self.current_zone.draw(self.surface, self.camera, self.font, self.player, self.zones)
+
+        with profile_scope("effect_hooks"):
+            self.current_zone.render_effect_hooks(self.surface, self.camera, self.font, self.player, self.sound_manager)
 
     def _draw_player(self):
-        pygame.draw.rect(self.surface, PLAYER_RECT_COLOUR, self.camera.apply(self.player.rect))
+        rect = self.player.rect
+        queue = get_render_queue()
+        queue.submit(RENDER_LAYER_PLAYER, queue.rect_sprite(PLAYER_RECT_COLOUR, rect.width, rect.height), rect.x, rect.y)
+        queue.flush(self.surface, self.camera)
 
     def _draw_attack_radius(self):
         if self.player.active_item:
             self.player.draw_attack_cooldown(self.surface, self.camera)
 
-    def _draw_popups(self):
-        for popup in self.damage_popups + self.xp_popups:
-            popup.draw(self.surface, self.camera, self.font)
+    def _draw_popups(self, surface):
+        self.popups.draw(surface, self.camera)
 
-    def _draw_damage_overlay(self):
+    def _draw_damage_overlay(self, surface):
         if self.damage_overlay_alpha <= 0:
             return
 
-        overlay = pygame.Surface((VIEWPORT_WIDTH, VIEWPORT_HEIGHT), pygame.SRCALPHA)
+        overlay = get_surface_pool().get((VIEWPORT_WIDTH, VIEWPORT_HEIGHT), pygame.SRCALPHA)
         overlay.fill((255, 0, 0, int(self.damage_overlay_alpha)))
-        self.surface.blit(overlay, (0, 0))
+        surface.blit(overlay, (0, 0))
 
     def _draw_pause_overlay(self, screen):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay = get_surface_pool().get((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 120))
         screen.blit(overlay, (0, 0))
 
         text_string = "PAUSED"
         text_colour = (255, 255, 255)
-        text_surface = self.font.render(text_string, True, text_colour)
+        text_surface = render_text(self.font, text_string, text_colour)
 
         screen.blit(
             text_surface,
@@ -623,11 +702,51 @@ class Game:
         )
 
     def _draw_ui(self, screen):
-        self.draw_all_ui(screen)
+        with profile_scope("ui"):
+            self.draw_all_ui(screen)
+
+        with profile_scope("tooltips"):
+            return self.draw_tooltips(screen)
+
+    def _ui_pane_state(self):
+        """Everything the UI pane shows, or None while it animates (pickup log fades)."""
+        if self.pickup_log.entries:
+            return None
+
+        player = self.player
+        return (
+            int(min(player.combat.hp, player.stats.total_stats.get("max_hp", 1))),
+            int(player.stats.total_stats.get("max_hp", 1)),
+            tuple(player.skills.get_skill_progress()),
+            player.gold,
+            player.active_item.action,
+            int(getattr(self, "fps", 0)),
+        )
+
+    def _dirty_rects(self, tooltips_drawn):
+        # Tooltips, menus, the pause overlay and the profiler can draw anywhere on
+        # screen; present the whole window then and for the next frame.
+        if tooltips_drawn or self.state != GameState.PLAYING or self.show_profiler_overlay:
+            self._ui_pane_signature = None
+            return None
+
+        # The world viewport changes every frame; the UI pane only when its contents do.
+        rects = [pygame.Rect(0, 0, VIEWPORT_WIDTH, VIEWPORT_HEIGHT)]
+        signature = self._ui_pane_state()
+        if signature is None or signature != self._ui_pane_signature:
+            rects.append(pygame.Rect(VIEWPORT_WIDTH, 0, UI_PANE_WIDTH, SCREEN_HEIGHT))
+        self._ui_pane_signature = signature
+        return rects
+
+    def present(self):
+        if self.dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty_rects)
 
     def _draw_fps(self, screen):
         fps = self.fps if hasattr(self, 'fps') else 0
-        text_surface = self.font.render(f"{int(fps)} FPS", True, (200, 200, 200))
+        text_surface = render_text(self.font, f"{int(fps)} FPS", (200, 200, 200))
 
         screen.blit(
             text_surface,
@@ -637,18 +756,50 @@ class Game:
             )
         )
 
+    def _draw_combat_events(self, screen):
+        lines = self.combat_event_buffer.recent_lines(COMBAT_EVENT_PANEL_LINES)
+        line_height = self.font.get_height()
+
+        panel = get_surface_pool().get((COMBAT_EVENT_PANEL_WIDTH, COMBAT_EVENT_PANEL_LINES * line_height + 16), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            panel.blit(render_text(self.font, line, (220, 220, 220)), (8, 8 + i * line_height))
+
+        screen.blit(panel, (VIEWPORT_WIDTH - COMBAT_EVENT_PANEL_WIDTH - 10, 10))
+
+    def _upscale_world(self):
+        """The viewport-sized surface holding the world pass, upscaled if render_scale < 1."""
+        if self._upscaled_surface is None:
+            return self.surface
+        with profile_scope("render_upscale"):
+            if RENDER_SCALE_SMOOTH:
+                pygame.transform.smoothscale(self.surface, (VIEWPORT_WIDTH, VIEWPORT_HEIGHT), self._upscaled_surface)
+            else:
+                pygame.transform.scale(self.surface, (VIEWPORT_WIDTH, VIEWPORT_HEIGHT), self._upscaled_surface)
+        return self._upscaled_surface
+
     def draw(self, screen):
         screen.fill((0, 0, 0))
 
         self.surface.fill((20, 20, 20))
 
+        # World geometry is drawn at render_scale; text popups and overlays stay native.
+        self.camera.scale = self.render_scale
         self._draw_zone()
         self._draw_player()
         self._draw_attack_radius()
-        self._draw_popups()
-        self._draw_damage_overlay()
+        self.camera.scale = 1.0
+
+        world = self._upscale_world()
+        if self.render_scale != 1.0:
+            self.current_zone.draw_enemy_labels(world, self.camera, self.font, self.player)
+
+        with profile_scope("popups_draw"):
+            self._draw_popups(world)
+
+        self._draw_damage_overlay(world)
 
-        screen.blit(self.surface, (0, 0))
+        screen.blit(world, (0, 0))
 
         self.player.draw_targeting_overlay(screen, self.camera, self.hovered_target, self.target_pos, self.target_radius)
 
@@ -657,8 +808,17 @@ class Game:
 
         self.transition.draw(screen)
 
-        self._draw_ui(screen)
+        tooltips_drawn = self._draw_ui(screen)
 
         self._draw_fps(screen)
 
-        self.sound_manager.flush()
\ No newline at end of file
+        if self.show_profiler_overlay:
+            self.profiler.draw_overlay(screen, self.font, (10, 10))
+
+        if self.show_combat_events:
+            self._draw_combat_events(screen)
+
+        self.dirty_rects = self._dirty_rects(tooltips_drawn)
+
+        with profile_scope("sound_flush"):
+            self.sound_manager.flush()
\ No newline at end of file
@@ -0,0 +1,37 @@
+import pygame
+
+class SimulatedClock:
+    # Drop-in for pygame.time.Clock that advances by a fixed step instead of waiting on the wall clock.
+    def __init__(self, framerate=144, start_ms=0):
+        self.framerate = framerate
+        self.now_ms = start_ms
+        self._last_step_ms = 0
+
+    def tick(self, framerate=0):
+        step_ms = 1000 / (framerate or self.framerate)
+        self.advance(step_ms)
+        return step_ms
+
+    def advance(self, ms):
+        self.now_ms += ms
+        self._last_step_ms = ms
+
+    def get_fps(self):
+        return 1000 / self._last_step_ms if self._last_step_ms else 0
+
+    def get_ticks(self):
+        return int(self.now_ms)
+
+_active_clock = None
+
+def set_clock(clock):
+    global _active_clock
+    _active_clock = clock
+
+def get_clock():
+    return _active_clock
+
+def get_ticks():
+    if _active_clock is None:
+        return pygame.time.get_ticks()
+    return _active_clock.get_ticks()
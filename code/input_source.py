@@ -0,0 +1,87 @@
+import pygame
+
+from game_clock import get_ticks
+
+class PygameInput:
+    def get_mouse_pos(self):
+        return pygame.mouse.get_pos()
+
+    def get_pressed_keys(self):
+        return pygame.key.get_pressed()
+
+    def poll_events(self):
+        return pygame.event.get()
+
+class HeldKeys:
+    def __init__(self, keys):
+        self.keys = keys
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+class ScriptedInput:
+    # Replays (time_ms, pygame.event.Event) pairs against the active game clock.
+    def __init__(self, events=None, mouse_pos=(0, 0)):
+        self.mouse_pos = mouse_pos
+        self.held_keys = set()
+        self.pending = sorted(events or [], key=lambda entry: entry[0])
+        self._next_index = 0
+
+    def schedule(self, time_ms, event):
+        self.pending.append((time_ms, event))
+        self.pending[self._next_index:] = sorted(self.pending[self._next_index:], key=lambda entry: entry[0])
+
+    def get_mouse_pos(self):
+        return self.mouse_pos
+
+    def get_pressed_keys(self):
+        return HeldKeys(self.held_keys)
+
+    def poll_events(self):
+        now = get_ticks()
+        events = []
+
+        while self._next_index < len(self.pending) and self.pending[self._next_index][0] <= now:
+            event = self.pending[self._next_index][1]
+            self._next_index += 1
+
+            if event.type == pygame.KEYDOWN:
+                self.held_keys.add(event.key)
+            elif event.type == pygame.KEYUP:
+                self.held_keys.discard(event.key)
+            elif event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self.mouse_pos = event.pos
+
+            events.append(event)
+
+        return events
+
+def key_down(time_ms, key):
+    return time_ms, pygame.event.Event(pygame.KEYDOWN, key=key)
+
+def key_up(time_ms, key):
+    return time_ms, pygame.event.Event(pygame.KEYUP, key=key)
+
+def mouse_move(time_ms, pos):
+    return time_ms, pygame.event.Event(pygame.MOUSEMOTION, pos=pos)
+
+def mouse_down(time_ms, pos, button=1):
+    return time_ms, pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button)
+
+def mouse_up(time_ms, pos, button=1):
+    return time_ms, pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=button)
+
+_active_input = PygameInput()
+
+def set_input_source(source):
+    global _active_input
+    _active_input = source
+
+def get_input_source():
+    return _active_input
+
+def get_mouse_pos():
+    return _active_input.get_mouse_pos()
+
+def get_pressed_keys():
+    return _active_input.get_pressed_keys()
@@ -0,0 +1,134 @@
+import numpy as np
+
+LOS_PRIME_RADIUS = 300  # px; covers the largest aggro/leash radius in ENEMY_BEHAVIOUR_DATA
+
+class LineOfSight:
+    """Line-of-sight queries against a zone's TileGrid.
+
+    Rays are walked tile by tile with DDA (Amanatides & Woo) between the centres of
+    the two endpoints' tiles, so every query between the same pair of tiles has the
+    same answer. visible() caches answers per tile pair until new_frame(); batch()
+    walks many rays at once with NumPy, and prime() uses it to answer every pooled
+    enemy near the player up front so the per-enemy FSM checks are cache hits. Zones
+    without solid tiles answer True for free.
+    """
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+        self.tile_size = tiles.tile_size
+        self.cols = tiles.cols
+        self.solid = tiles.unpack()  # [row, col] bools for the vectorised walk
+        self._solid_bytes = self.solid.tobytes()  # flat, for fast scalar lookups
+        self._cache = {}
+        self.casts = 0
+
+    def new_frame(self):
+        self._cache.clear()
+
+    def _tile(self, x, y):
+        last = self.cols - 1
+        return min(max(int(x) // self.tile_size, 0), last), min(max(int(y) // self.tile_size, 0), last)
+
+    def visible(self, x0, y0, x1, y1):
+        if not self.tiles.solid_tiles:
+            return True
+
+        key = self._tile(x0, y0) + self._tile(x1, y1)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._cast(*key)
+            self._cache[key] = result
+        return result
+
+    def _cast(self, col, row, end_col, end_row):
+        self.casts += 1
+        solid = self._solid_bytes
+        cols = self.cols
+
+        dx = end_col - col
+        dy = end_row - row
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Between tile centres, in units of the whole ray: tiles crossed per axis are
+        # |dx| and |dy|, and boundaries sit half a tile from each centre.
+        delta_x = 1 / abs(dx) if dx else float("inf")
+        delta_y = 1 / abs(dy) if dy else float("inf")
+        max_x = delta_x / 2
+        max_y = delta_y / 2
+
+        for _ in range(abs(dx) + abs(dy)):
+            if max_x < max_y:
+                col += step_x
+                max_x += delta_x
+            else:
+                row += step_y
+                max_y += delta_y
+            if solid[row * cols + col]:
+                return False
+        return True
+
+    def batch(self, xs, ys, target_x, target_y):
+        """Bool array: whether each (xs[i], ys[i]) can see (target_x, target_y)."""
+        n = len(xs)
+        if not self.tiles.solid_tiles or not n:
+            return np.ones(n, dtype=bool)
+
+        ts = self.tile_size
+        last = self.cols - 1
+        col = np.clip(np.asarray(xs, dtype=np.intp) // ts, 0, last)
+        row = np.clip(np.asarray(ys, dtype=np.intp) // ts, 0, last)
+        end_col, end_row = self._tile(target_x, target_y)
+
+        dx = end_col - col
+        dy = end_row - row
+        step_x = np.where(dx > 0, 1, -1)
+        step_y = np.where(dy > 0, 1, -1)
+        with np.errstate(divide="ignore"):
+            delta_x = 1.0 / np.abs(dx)
+            delta_y = 1.0 / np.abs(dy)
+        max_x = delta_x / 2
+        max_y = delta_y / 2
+
+        remaining = np.abs(dx) + np.abs(dy)
+        visible = np.ones(n, dtype=bool)
+        active = np.flatnonzero(remaining > 0)
+
+        while len(active):
+            go_x = max_x[active] < max_y[active]
+            ax = active[go_x]
+            ay = active[~go_x]
+            col[ax] += step_x[ax]
+            max_x[ax] += delta_x[ax]
+            row[ay] += step_y[ay]
+            max_y[ay] += delta_y[ay]
+
+            blocked = self.solid[row[active], col[active]]
+            visible[active[blocked]] = False
+            remaining[active] -= 1
+            active = active[~blocked & (remaining[active] > 0)]
+
+        return visible
+
+    def prime(self, pool, x, y, radius=LOS_PRIME_RADIUS):
+        """Answer LOS to (x, y) for every pooled enemy whose centre is within radius and
+        cache the answers. Returns (slots, visible) arrays."""
+        n = pool.count
+        centre = pool.rect_pos[:n] + pool.size[:n] // 2  # rect.center, as the FSM states use
+        offset = centre - (int(x), int(y))
+        slots = np.flatnonzero((offset * offset).sum(axis=1) <= radius * radius)
+        if not self.tiles.solid_tiles:
+            return slots, np.ones(len(slots), dtype=bool)
+
+        xs = centre[slots, 0]
+        ys = centre[slots, 1]
+        visible = self.batch(xs, ys, x, y)
+
+        ts = self.tile_size
+        last = self.cols - 1
+        target = self._tile(x, y)
+        cols = np.clip(xs // ts, 0, last).tolist()
+        rows = np.clip(ys // ts, 0, last).tolist()
+        cache = self._cache
+        for col, row, result in zip(cols, rows, visible.tolist()):
+            cache[(col, row) + target] = result
+        return slots, visible
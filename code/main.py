@@ -1,6 +1,7 @@
 import pygame
 from constants import SCREEN_WIDTH, SCREEN_HEIGHT
 from game import Game
+from frame_profiler import profile_scope
 
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -13,6 +14,8 @@ game = Game()
 running = True
 while running:
     dt = clock.tick(144) / 1000
+    game.profiler.begin_frame()
+
     events = pygame.event.get()
 
     for event in events:
@@ -23,6 +26,9 @@ while running:
     game.update(dt, clock)
     game.draw(screen)
 
-    pygame.display.flip()
+    with profile_scope("present"):
+        game.present()
+
+    game.profiler.end_frame()
 
 pygame.quit()
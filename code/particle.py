@@ -1,33 +1,146 @@
-import random
-import math
-
+import numpy as np
 import pygame
 
-class Particle:
-    def __init__(self, x, y, colour, source_x, source_y, life_min, life_max, dt):
-        self.x = x + random.randint(-4, 4)
-        self.y = y + random.randint(-4, 4)
-        self.life_min = max(life_min, dt * 0.4)
-        self.life_max = max(life_max, dt * 0.6)
+from rng import get_rng
+
+PARTICLE_CAPACITY = 50000
+PARTICLE_SIZE = 3
+PARTICLE_JITTER = 4
+PARTICLE_SPREAD = 0.5  # radians either side of the direction away from the source
+PARTICLE_SPEED_MIN = 1.5 * 220
+PARTICLE_SPEED_MAX = 2.0 * 220
+
+_rng = get_rng("particles")
+
+class ParticleSystem:
+    """Fixed-capacity structure-of-arrays particle pool.
+
+    Live particles occupy the first `count` slots of every array. Bursts are queued by
+    spawn() and materialised together at the next update/draw, so a frame full of
+    small bursts costs one batch of NumPy calls instead of one per burst.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.age = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.colour = np.zeros((capacity, 3), dtype=np.uint8)
+
+        self._arrays = (self.x, self.y, self.dx, self.dy, self.age, self.life, self.colour)
+        self._pending = []  # (x, y, source_x, source_y, count, life_min, life_max, r, g, b)
+        self._np_rng = np.random.default_rng(_rng.getrandbits(64))
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self._pending.clear()
+
+    def spawn(self, x, y, colour, source_x, source_y, count, life_min, life_max):
+        if count > 0:
+            self._pending.append((x, y, source_x, source_y, count, life_min, life_max, colour[0], colour[1], colour[2]))
+
+    def _flush_spawns(self):
+        if not self._pending:
+            return
+
+        bursts = np.array(self._pending, dtype=np.float64)
+        self._pending.clear()
 
-        angle = math.atan2(self.y - source_y, self.x - source_x)
-        spread = random.uniform(-0.5, 0.5)
-        speed = random.uniform(1.5, 2.0) * 220
+        counts = bursts[:, 4].astype(np.intp)
+        total = min(int(counts.sum()), self.capacity - self.count)
+        if total <= 0:
+            return
 
-        self.dx = math.cos(angle + spread) * speed
-        self.dy = math.sin(angle + spread) * speed
-        self.colour = colour
-        self.life = random.uniform(life_min, life_max)  # seconds
-        self.age = 0
+        rows = np.repeat(bursts, counts, axis=0)[:total]
+        rng = self._np_rng
+
+        x = rows[:, 0] + rng.integers(-PARTICLE_JITTER, PARTICLE_JITTER + 1, total)
+        y = rows[:, 1] + rng.integers(-PARTICLE_JITTER, PARTICLE_JITTER + 1, total)
+        angle = np.arctan2(y - rows[:, 3], x - rows[:, 2]) + rng.uniform(-PARTICLE_SPREAD, PARTICLE_SPREAD, total)
+        speed = rng.uniform(PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX, total)
+
+        start, end = self.count, self.count + total
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.dx[start:end] = np.cos(angle) * speed
+        self.dy[start:end] = np.sin(angle) * speed
+        self.age[start:end] = 0.0
+        self.life[start:end] = rng.uniform(rows[:, 5], rows[:, 6])
+        self.colour[start:end] = rows[:, 7:10]
+        self.count = end
 
     def update(self, dt):
-        self.x += self.dx * dt
-        self.y += self.dy * dt
-        self.age += dt
+        self._flush_spawns()
+
+        n = self.count
+        if not n:
+            return
+
+        self.x[:n] += self.dx[:n] * dt
+        self.y[:n] += self.dy[:n] * dt
+        self.age[:n] += dt
+
+        alive = self.age[:n] < self.life[:n]
+        if alive.all():
+            return
+
+        keep = np.flatnonzero(alive)
+        for array in self._arrays:
+            array[:len(keep)] = array[keep]
+        self.count = len(keep)
+
+    def draw(self, surface, camera):
+        self._flush_spawns()
+
+        n = self.count
+        if not n:
+            return
+
+        width, height = surface.get_size()
+        scale = camera.scale
+        size = max(1, round(PARTICLE_SIZE * scale))
+        xs = np.floor((self.x[:n] + camera.offset.x) * scale).astype(np.intp)
+        ys = np.floor((self.y[:n] + camera.offset.y) * scale).astype(np.intp)
+
+        visible = (xs >= 0) & (ys >= 0) & (xs <= width - size) & (ys <= height - size)
+        if not visible.any():
+            return
+
+        xs = xs[visible]
+        ys = ys[visible]
+        colours = self.colour[:n][visible]
+
+        # Write the squares straight into the pixel buffer instead of one draw.rect each.
+        if surface.get_bytesize() == 3:
+            pixels = pygame.surfarray.pixels3d(surface)
+        else:
+            pixels = pygame.surfarray.pixels2d(surface)
+            colours = _map_colours(surface, colours)
+
+        for ox in range(size):
+            column = xs + ox
+            for oy in range(size):
+                pixels[column, ys + oy] = colours
+        del pixels
 
-    def is_dead(self):
-        return self.age >= self.life
+def _map_colours(surface, colours):
+    """Vectorised Surface.map_rgb for an (n, 3) uint8 array."""
+    r_shift, g_shift, b_shift, _ = surface.get_shifts()
+    r_loss, g_loss, b_loss, _ = surface.get_losses()
+    alpha_mask = surface.get_masks()[3]
 
-    def draw(self, screen, camera):
-        screen_x, screen_y = camera.apply((self.x, self.y))
-        pygame.draw.rect(screen, self.colour, (screen_x, screen_y, 3, 3))
+    channels = colours.astype(np.uint32)
+    return (
+        ((channels[:, 0] >> r_loss) << r_shift)
+        | ((channels[:, 1] >> g_loss) << g_shift)
+        | ((channels[:, 2] >> b_loss) << b_shift)
+        | alpha_mask
+    )
@@ -12,6 +12,7 @@ from base_entity import BaseEntity
 from data.ability_data import ABILITY_DATA
 from data.enchantment_data import ENCHANTMENT_DATA
 from data.item_data import ITEMS
+from input_source import get_pressed_keys
 
 class Player(BaseEntity):
     def __init__(self, x, y, size, zone):
@@ -57,6 +58,7 @@ class Player(BaseEntity):
         self.discovered_zones = set()
 
         self.item_cooldowns = {}
+        self._active_effects_version = -1
 
         self.last_safe_zone_id = "starter_zone"
 
@@ -79,7 +81,7 @@ class Player(BaseEntity):
 
         # Step 2: gather targets
         if skill == "combat":
-            targets = [e for e in zone.enemies if targeting_pos.distance_to(pygame.Vector2(e.rect.center)) <= radius]
+            targets = zone.enemy_grid.query_radius(targeting_pos.x, targeting_pos.y, radius)
         else:
             targets = [n for n in zone.resource_nodes if not n.depleted and n.skill == skill and targeting_pos.distance_to(pygame.Vector2(n.rect.center)) <= radius]
 
@@ -106,9 +108,16 @@ class Player(BaseEntity):
         else:
             self.active_item = self.fist
 
+        self.stats.invalidate()
+
     def update(self, dt, zone_size):
-        self.combat.set_active_effects(self.stats.active_effects)
-        self.combat.update(dt)
+        self.stats.refresh()
+        if self._active_effects_version != self.stats.version:
+            self.combat.set_active_effects(self.stats.active_effects)
+            self._active_effects_version = self.stats.version
+
+        start_x, start_y = self.pos
+        self.combat.update(dt)  # may apply knockback
 
         direction = self._get_movement_direction()
 
@@ -119,6 +128,8 @@ class Player(BaseEntity):
             multiplier = max(0.1, min(3.0, multiplier))
             self.pos += direction * self.base_speed * multiplier * dt
 
+        self._resolve_obstacles(start_x, start_y)
+
         self._clamp_position_to_zone(zone_size)
 
     def draw_attack_cooldown(self, surface, camera):
@@ -190,6 +201,7 @@ class Player(BaseEntity):
         if instance_id in self.inventory.item_instances:
             self.inventory.item_instances[instance_id].metadata = metadata
             self.active_item_metadata = metadata
+            self.stats.invalidate()
 
     def get_active_item_effect_sources(self):
         """Returns all ability IDs tied to the active weapon via enchantments or extra_ability field."""
@@ -219,7 +231,7 @@ class Player(BaseEntity):
         return effect_ids
 
     def _get_movement_direction(self):
-        keys = pygame.key.get_pressed()
+        keys = get_pressed_keys()
         direction = pygame.Vector2(0, 0)
 
         if keys[pygame.K_w]:
@@ -233,6 +245,16 @@ class Player(BaseEntity):
 
         return direction
 
+    def _resolve_obstacles(self, start_x, start_y):
+        tiles = getattr(self.zone, "tiles", None)
+        if tiles is None or not tiles.solid_tiles:
+            return
+
+        if (self.pos.x, self.pos.y) != (start_x, start_y):
+            self.pos.x, self.pos.y = tiles.resolve_move(
+                start_x, start_y, self.pos.x, self.pos.y, self.rect.width, self.rect.height
+            )
+
     def _clamp_position_to_zone(self, zone_size):
         self.rect.topleft = (int(self.pos.x), int(self.pos.y))
         self.pos.x = max(0, min(self.pos.x, zone_size - self.rect.width))
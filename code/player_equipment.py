@@ -30,6 +30,7 @@ class PlayerEquipment:
         )
 
         self.player.inventory.remove_item(item_id)
+        self.player.stats.invalidate()
 
         return True
 
@@ -45,6 +46,7 @@ class PlayerEquipment:
         self.player.inventory.add_item(base_item_id, amount=1, metadata=metadata)
 
         self.slots[slot] = None
+        self.player.stats.invalidate()
         return True
     
     def get_all_equipped_enchantments(self):
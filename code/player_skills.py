@@ -2,6 +2,7 @@ import pygame
 from format import *
 from experience import *
 from dataclasses import dataclass
+from game_clock import get_ticks
 
 ONE_HOUR_MS = 3600000
 XP_LOG_RETENTION_MS = 2 * ONE_HOUR_MS
@@ -22,9 +23,13 @@ class PlayerSkills:
         self.xp_time_log = {skill: [] for skill in self.skill_xp}
 
     def gain_xp(self, skill, amount):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
+        old_level = self.get_skill_level(skill)
         self.skill_xp[skill] = self.skill_xp.get(skill, 0) + amount
 
+        if self.get_skill_level(skill) != old_level:
+            self.player.stats.invalidate()
+
         log = self.xp_time_log[skill]
         last_cum_xp = self._latest_cumulative_xp(log)
         new_cum_xp = last_cum_xp + amount
@@ -33,7 +38,7 @@ class PlayerSkills:
         self._prune_old_xp_entries(skill, XP_LOG_RETENTION_MS)
 
     def xp_per_hour(self, skill):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
         cutoff = now - ONE_HOUR_MS
 
         log = self.xp_time_log.get(skill, [])
@@ -93,7 +98,7 @@ class PlayerSkills:
         return self.skill_xp.get(skill, 0)
 
     def _prune_old_xp_entries(self, skill, retention_ms):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
         cutoff = now - retention_ms
 
         self.xp_time_log[skill] = [
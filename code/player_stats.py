@@ -1,10 +1,12 @@
 import pygame
 
 from dataclasses import dataclass
+from types import MappingProxyType
 from data.set_bonus_data import SET_BONUS_DATA
 from data.enchantment_data import ENCHANTMENT_DATA
 from data.ability_data import ABILITY_DATA
 from data.counter_data import COUNTER_DATA
+from game_clock import get_ticks
 
 @dataclass(frozen=True)
 class StatSourceEntry:
@@ -12,6 +14,20 @@ class StatSourceEntry:
     source_name: str
     amount: float
 
+class _StatBuild:
+    """Everything one pass over the stat sources produces; applied or discarded whole."""
+
+    def __init__(self, base_stats, collect_entries):
+        self.totals = dict(base_stats)
+        self.entries = {stat: [] for stat in base_stats} if collect_entries else None
+        self.effects = []
+        self.set_bonuses = {}
+
+    def add_source(self, stat, category, name, amount):
+        self.totals[stat] = self.totals.get(stat, 0) + amount
+        if self.entries is not None:
+            self.entries.setdefault(stat, []).append(StatSourceEntry(category, name, amount))
+
 class PlayerStats:
     def __init__(self, player):
         self.player = player
@@ -34,6 +50,13 @@ class PlayerStats:
         self.active_set_bonuses = {}
         self.temp_stat_bonuses = {}
 
+        # Stat snapshot, rebuilt only after invalidate() or when a temp bonus expires.
+        self.version = 0
+        self._dirty = True
+        self._snapshot = MappingProxyType(dict(self.base_stats))  # read-only; replaced on each rebuild
+        self._sources_version = -1
+        self._next_temp_expiry = None
+
         self.level_up_bonuses = {
             "combat": {"stat": "crit_chance", "per_level": 0.5},
             "mining": {"stat": "defense", "per_level": 5},
@@ -46,32 +69,62 @@ class PlayerStats:
             "enemy": {"strength": 1, "magic_find": 1},
         }
 
-    def _rebuild_stat_sources(self):
-        self.active_effects.clear()
+    def _rebuild_stat_sources(self, collect_entries=False):
+        """Run every source into a fresh _StatBuild; live state is left untouched."""
+        build = _StatBuild(self.base_stats, collect_entries)
 
-        self.stat_sources = {stat: [] for stat in self.base_stats}
+        self._add_level_up_bonuses(build)
+        self._add_active_item_bonuses(build)
+        self._add_equipment_bonuses(build)
+        self._add_equipment_set_bonuses(build)
+        self._add_beastiary_bonuses(build)
+        self._add_temp_stat_bonuses(build)
+        return build
 
-        self._add_level_up_bonuses()
-        self._add_active_item_bonuses()
-        self._add_equipment_bonuses()
-        self._add_equipment_set_bonuses()
-        self._add_beastiary_bonuses()
-        self._add_temp_stat_bonuses()
+    def invalidate(self):
+        self._dirty = True
+
+    def refresh(self):
+        if self._next_temp_expiry is not None and get_ticks() >= self._next_temp_expiry:
+            self._prune_temp_stat_bonuses()
+            self._dirty = True
+
+        if not self._dirty:
+            return
+
+        build = self._rebuild_stat_sources()
+        self._snapshot = MappingProxyType(build.totals)
+        self.active_effects[:] = build.effects
+        self.active_set_bonuses.clear()
+        self.active_set_bonuses.update(build.set_bonuses)
+        self._dirty = False
+        self.version += 1
+
+    def get_stat_sources(self, stat):
+        self.refresh()
+
+        # Breakdowns are only built when a tooltip asks, at most once per stats version.
+        if self._sources_version != self.version:
+            self.stat_sources = self._rebuild_stat_sources(collect_entries=True).entries
+            self._sources_version = self.version
+
+        return self.stat_sources.get(stat, [])
 
     def is_item_in_active_set(self, item_id):
+        self.refresh()
         for bonus in self.active_set_bonuses.values():
             if item_id in bonus["contributors"]:
                 return True
         return False
 
     def get_active_set_bonus_effect_ids(self):
+        self.refresh()
         effect_ids = []
         for bonus in self.active_set_bonuses.values():
             effect_ids.extend(bonus.get("effect_ids", []))
         return effect_ids
 
-    def _add_equipment_set_bonuses(self):
-        self.active_set_bonuses.clear()
+    def _add_equipment_set_bonuses(self, build):
         set_counts = {}
 
         # Count equipped items per set
@@ -105,44 +158,41 @@ class PlayerStats:
                     for stat, bonus in bonuses.items():
                         if stat in {"custom", "extra_ability"}:
                             continue  # custom logic handled separately
-                        entry = StatSourceEntry("set", f"{set_display_name} ({pieces_required} pcs)", bonus)
-                        self.stat_sources[stat].append(entry)
+                        build.add_source(stat, "set", f"{set_display_name} ({pieces_required} pcs)", bonus)
 
                     extra_ability = bonuses.get("extra_ability")
                     if extra_ability:
                         active_effect_ids.append(extra_ability)
-                        self.active_effects.append({
+                        build.effects.append({
                             "id": extra_ability,
                             "tier": pieces_required,
                             "set_name": set_display_name,
                         })
 
             # Cache active set bonus info
-            self.active_set_bonuses[set_name] = {
+            build.set_bonuses[set_name] = {
                 "count": count,
                 "contributors": contributors,
                 "effect_ids": active_effect_ids,
             }
 
-    def _add_temp_stat_bonuses(self):
-        now = pygame.time.get_ticks()
+    def _add_temp_stat_bonuses(self, build):
+        now = get_ticks()
         for stat, bonuses in self.temp_stat_bonuses.items():
             for amount, expiry in bonuses:
                 if expiry > now:
-                    entry = StatSourceEntry("temp", "Temporary Bonus", amount)
-                    self.stat_sources[stat].append(entry)
+                    build.add_source(stat, "temp", "Temporary Bonus", amount)
 
-    def _add_level_up_bonuses(self):
+    def _add_level_up_bonuses(self, build):
         for skill, bonus in self.level_up_bonuses.items():
             level = self.player.skills.get_skill_level(skill)
             stat = bonus["stat"]
             per_level = bonus["per_level"]
             amount = level * per_level
 
-            entry = StatSourceEntry("character", f"{skill.capitalize()} Level", amount)
-            self.stat_sources[stat].append(entry)
+            build.add_source(stat, "character", f"{skill.capitalize()} Level", amount)
 
-    def _add_active_item_bonuses(self):
+    def _add_active_item_bonuses(self, build):
         if not self.player.active_item_id:
             return
 
@@ -154,20 +204,18 @@ class PlayerStats:
 
         for stat, bonus in base_data.get("stat_bonuses", {}).items():
             name = base_data.get("name", "Unnamed Active")
-            entry = StatSourceEntry("active", name, bonus)
-            self.stat_sources[stat].append(entry)
+            build.add_source(stat, "active", name, bonus)
 
         enchant_bonuses = self.player.inventory.get_enchantment_stat_bonuses_for_item(self.player.active_item_id)
         for stat, bonus in enchant_bonuses.items():
-            entry = StatSourceEntry("active-enchant", "Active Enchantments", bonus)
-            self.stat_sources[stat].append(entry)
+            build.add_source(stat, "active-enchant", "Active Enchantments", bonus)
 
         enchantments = self.player.inventory.get_enchantments_for_item(self.player.active_item_id)
         for enchant in enchantments:
             enchant_id = enchant["id"]
             enchant_level = enchant["level"]
 
-            self.active_effects.append({
+            build.effects.append({
                 "id": enchant_id,
                 "tier": enchant_level,
                 "set_name": base_data.get("name", "Unnamed Active"),
@@ -193,11 +241,10 @@ class PlayerStats:
                 base_name = counter_data.get("name", "Counter")
                 name_with_tier = f"{base_name} (Tier {current_tier + 1})"
                 for stat, value in tier_bonus.items():
-                    entry = StatSourceEntry("counter", name_with_tier, value)
-                    self.stat_sources[stat].append(entry)
+                    build.add_source(stat, "counter", name_with_tier, value)
 
 
-    def _add_equipment_bonuses(self):
+    def _add_equipment_bonuses(self, build):
         for slot, slot_entry in self.player.equipment.slots.items():
             if not slot_entry:
                 continue
@@ -213,8 +260,7 @@ class PlayerStats:
             
             for stat, bonus in base_data.get("stat_bonuses", {}).items():
                 name = base_data.get("name", "Unnamed Gear")
-                entry = StatSourceEntry("gear", name, bonus)
-                self.stat_sources[stat].append(entry)
+                build.add_source(stat, "gear", name, bonus)
 
             enchantments = self.player.inventory.get_enchantments_for_item(item_id, metadata_override=metadata)
             for enchant in enchantments:
@@ -228,11 +274,10 @@ class PlayerStats:
                 for stat, per_level_bonus in stat_bonuses.items():
                     amount = per_level_bonus * enchant_level
                     gear_name = base_data.get("name", "Unnamed Gear")
-                    entry = StatSourceEntry("gear-enchant", f"{gear_name} Enchantments", amount)
-                    self.stat_sources[stat].append(entry)
+                    build.add_source(stat, "gear-enchant", f"{gear_name} Enchantments", amount)
 
                 # Add to active_effects
-                self.active_effects.append({
+                build.effects.append({
                     "id": enchant_id,
                     "tier": enchant_level,
                     "set_name": base_data.get("name", "Unnamed Gear"),
@@ -247,13 +292,12 @@ class PlayerStats:
 
         return total_stats
 
-    def _add_beastiary_bonuses(self):
+    def _add_beastiary_bonuses(self, build):
         beast_level = self.player.beastiary.get_total_beastiary_level()
         if beast_level <= 0:
             return
 
-        entry = StatSourceEntry("character", "Beastiary Levels", beast_level)
-        self.stat_sources["max_hp"].append(entry)
+        build.add_source("max_hp", "character", "Beastiary Levels", beast_level)
 
     def calculate_damage_reduction(self):
         defense = self.total_stats.get("defense", 0)
@@ -263,7 +307,7 @@ class PlayerStats:
         return min(reduction, 0.99)
 
     def add_temp_stat_bonus(self, stat, amount, duration):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
         expiry_time = now + int(duration * 1000)
 
         if stat not in self.temp_stat_bonuses:
@@ -271,18 +315,28 @@ class PlayerStats:
 
         self.temp_stat_bonuses[stat].append((amount, expiry_time))
 
+        if self._next_temp_expiry is None or expiry_time < self._next_temp_expiry:
+            self._next_temp_expiry = expiry_time
+        self.invalidate()
+
     def _prune_temp_stat_bonuses(self):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
+        self._next_temp_expiry = None
         for stat in self.temp_stat_bonuses:
             self.temp_stat_bonuses[stat] = [
                 (amount, expiry) for (amount, expiry) in self.temp_stat_bonuses[stat]
                 if expiry > now
             ]
+            for _, expiry in self.temp_stat_bonuses[stat]:
+                if self._next_temp_expiry is None or expiry < self._next_temp_expiry:
+                    self._next_temp_expiry = expiry
 
     def get_healing_sources(self):
         #TODO Get these dynamically from the data.
         HEALING_EFFECT_IDS = {"slime_regen"}
 
+        self.refresh()
+
         sources = []
         for effect in self.active_effects:
             if effect["id"] in HEALING_EFFECT_IDS:
@@ -297,11 +351,6 @@ class PlayerStats:
 
     @property
     def total_stats(self):
-        self._prune_temp_stat_bonuses()
-        self._rebuild_stat_sources()
-        return {
-            k: self.base_stats[k]
-            + sum(entry.amount for entry in self.stat_sources.get(k, []))
-            + sum(amount for amount, expiry in self.temp_stat_bonuses.get(k, []) if expiry > pygame.time.get_ticks())
-            for k in self.base_stats
-        }
+        """Read-only view of the current totals; copy it (dict(...)) to modify."""
+        self.refresh()
+        return self._snapshot
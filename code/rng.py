@@ -0,0 +1,22 @@
+import random
+
+# One independent stream per subsystem so that, for example, extra particles
+# drawn on screen never shift the sequence used for drops or AI decisions.
+_streams = {}
+_seed = None
+
+def get_rng(name):
+    stream = _streams.get(name)
+    if stream is None:
+        stream = random.Random()
+        if _seed is not None:
+            stream.seed(f"{_seed}:{name}")
+        _streams[name] = stream
+    return stream
+
+def seed_rngs(seed):
+    global _seed
+    _seed = seed
+
+    for name, stream in _streams.items():
+        stream.seed(f"{seed}:{name}" if seed is not None else None)
@@ -0,0 +1,107 @@
+import argparse
+
+import pygame
+
+from game import Game
+from game_clock import SimulatedClock, set_clock
+from input_source import ScriptedInput, set_input_source, mouse_down
+from rng import seed_rngs
+from tracer import get_tracer
+from combat_events import get_combat_events, CombatEventFileWriter, CombatEventTotals
+
+SIMULATION_FRAMERATE = 144
+
+def create_simulation(seed=0, events=None, framerate=SIMULATION_FRAMERATE):
+    pygame.font.init()
+
+    seed_rngs(seed)
+
+    clock = SimulatedClock(framerate)
+    set_clock(clock)
+
+    input_source = ScriptedInput(events)
+    set_input_source(input_source)
+
+    game = Game(headless=True)
+    return game, clock, input_source
+
+def run_simulation(game, clock, input_source, seconds, on_step=None):
+    end_ms = clock.get_ticks() + seconds * 1000
+
+    while clock.get_ticks() < end_ms:
+        dt = clock.tick() / 1000
+        game.profiler.begin_frame()
+
+        if on_step:
+            on_step(game, input_source)
+
+        game.handle_events(input_source.poll_events())
+        game.update(dt, clock)
+
+        game.profiler.end_frame()
+
+    return game
+
+def chase_nearest_enemy(game, input_source):
+    # Simple grinding policy: walk towards the nearest enemy and aim at it.
+    input_source.held_keys.clear()
+
+    px, py = game.player.rect.center
+    nearest = game.current_zone.enemy_grid.nearest(px, py)
+    if not nearest:
+        return
+
+    ex, ey = nearest[0].rect.center
+    input_source.mouse_pos = (ex + game.camera.offset.x, ey + game.camera.offset.y)
+
+    reach = game.player.active_item.radius
+    if abs(ex - px) > reach:
+        input_source.held_keys.add(pygame.K_d if ex > px else pygame.K_a)
+    if abs(ey - py) > reach:
+        input_source.held_keys.add(pygame.K_s if ey > py else pygame.K_w)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game headless on a simulated clock.")
+    parser.add_argument("--seconds", type=float, default=0)
+    parser.add_argument("--hours", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fps", type=int, default=SIMULATION_FRAMERATE)
+    parser.add_argument("--trace", default=None, help="write a Chrome trace-event JSON of the run to this path")
+    parser.add_argument("--combat-log", nargs="?", const="", default=None, metavar="PATH",
+                        help="write every combat event to a text file (default: a timestamped file in logs/)")
+    parser.add_argument("--combat-totals", action="store_true", help="print event counts and amounts per kind and source at the end")
+    args = parser.parse_args()
+
+    seconds = args.seconds + args.hours * 3600 or 60
+
+    game, clock, input_source = create_simulation(args.seed, [mouse_down(0, (0, 0))], args.fps)
+
+    tracer = get_tracer()
+    if args.trace:
+        tracer.start()
+
+    events = get_combat_events()
+    combat_log = events.subscribe(CombatEventFileWriter(args.combat_log or None)) if args.combat_log is not None else None
+    combat_totals = events.subscribe(CombatEventTotals()) if args.combat_totals else None
+
+    run_simulation(game, clock, input_source, seconds, on_step=chase_nearest_enemy)
+
+    if args.trace:
+        print(f"Trace saved to {tracer.stop(args.trace)}")
+        tracer.wait()
+
+    if combat_log:
+        events.unsubscribe(combat_log)
+        combat_log.close()
+        print(f"Combat log saved to {combat_log.path}")
+
+    if combat_totals:
+        for (kind, detail), (count, amount) in sorted(combat_totals.totals.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            print(f"{kind} {detail or '-'}: {count} events, {amount:.1f} total")
+
+    for skill, level, xp_in, xp_needed in game.player.skills.get_skill_progress():
+        print(f"{skill}: Lv {level} ({xp_in}/{xp_needed})")
+    print(f"Kills: {game.player.beastiary.enemy_kill_counts}")
+
+if __name__ == "__main__":
+    main()
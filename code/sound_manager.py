@@ -1,11 +1,14 @@
 import pygame
-import random
 import math
+from rng import get_rng
+
+_rng = get_rng("sound")
 
 class SoundManager:
-    def __init__(self):
-        def sfx(path): return pygame.mixer.Sound(f"../assets/sounds/{path}")
+    def __init__(self, muted=False):
+        def sfx(path): return None if muted else pygame.mixer.Sound(f"../assets/sounds/{path}")
 
+        self.muted = muted
         self._sound_queue = []
 
         self.sounds = {
@@ -135,6 +138,10 @@ class SoundManager:
         self._sound_queue.append((sound_id, volume_scale))
 
     def flush(self):
+        if self.muted:
+            self._sound_queue.clear()
+            return
+
         seen = set()
         for item in self._sound_queue:
             if isinstance(item, tuple):
@@ -153,7 +160,7 @@ class SoundManager:
             if not variants:
                 continue
 
-            sound = random.choice(variants)
+            sound = _rng.choice(variants)
             volume = volume_override if volume_override is not None else entry.get("volume", 1.0)
             sound.set_volume(volume)
 
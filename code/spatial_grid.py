@@ -0,0 +1,161 @@
+import math
+
+SPATIAL_GRID_CELL_SIZE = 64
+
+class SpatialGrid:
+    def __init__(self, world_size, cell_size=SPATIAL_GRID_CELL_SIZE):
+        self.world_size = world_size
+        self.cell_size = cell_size
+        self.max_ring = int(math.ceil(world_size / cell_size)) + 1
+
+        # cell -> {entity: None}; dicts keep insertion order so queries are deterministic
+        self.cells = {}
+        self.entity_cells = {}
+
+        # largest half-extent of any inserted entity, used to widen rect/point queries
+        self.max_half_extent = 0
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def __contains__(self, entity):
+        return entity in self.entity_cells
+
+    def _cell_of(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def clear(self):
+        self.cells.clear()
+        self.entity_cells.clear()
+        self.max_half_extent = 0
+
+    def insert(self, entity):
+        if entity in self.entity_cells:
+            self.move(entity)
+            return
+
+        cell = self._cell_of(*entity.rect.center)
+        self.cells.setdefault(cell, {})[entity] = None
+        self.entity_cells[entity] = cell
+
+        half_extent = max(entity.rect.width, entity.rect.height) / 2
+        if half_extent > self.max_half_extent:
+            self.max_half_extent = half_extent
+
+    def remove(self, entity):
+        cell = self.entity_cells.pop(entity, None)
+        if cell is None:
+            return
+
+        bucket = self.cells[cell]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, entity):
+        old_cell = self.entity_cells.get(entity)
+        if old_cell is None:
+            self.insert(entity)
+            return
+
+        new_cell = self._cell_of(*entity.rect.center)
+        if new_cell == old_cell:
+            return
+
+        bucket = self.cells[old_cell]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[old_cell]
+
+        self.cells.setdefault(new_cell, {})[entity] = None
+        self.entity_cells[entity] = new_cell
+
+    def _iter_cells(self, min_x, min_y, max_x, max_y):
+        cx0, cy0 = self._cell_of(min_x, min_y)
+        cx1, cy1 = self._cell_of(max_x, max_y)
+
+        cells = self.cells
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield bucket
+
+    def query_radius(self, x, y, radius, predicate=None):
+        """Entities whose rect centre lies within radius of (x, y)."""
+        radius_sq = radius * radius
+        result = []
+
+        for bucket in self._iter_cells(x - radius, y - radius, x + radius, y + radius):
+            for entity in bucket:
+                ex, ey = entity.rect.center
+                dx = ex - x
+                dy = ey - y
+                if dx * dx + dy * dy <= radius_sq and (predicate is None or predicate(entity)):
+                    result.append(entity)
+
+        return result
+
+    def query_rect(self, rect, predicate=None):
+        """Entities whose rect overlaps rect."""
+        pad = self.max_half_extent
+        result = []
+
+        for bucket in self._iter_cells(rect.left - pad, rect.top - pad, rect.right + pad, rect.bottom + pad):
+            for entity in bucket:
+                if entity.rect.colliderect(rect) and (predicate is None or predicate(entity)):
+                    result.append(entity)
+
+        return result
+
+    def query_point(self, x, y, predicate=None):
+        """Entities whose rect contains the point (x, y)."""
+        pad = self.max_half_extent
+        result = []
+
+        for bucket in self._iter_cells(x - pad, y - pad, x + pad, y + pad):
+            for entity in bucket:
+                if entity.rect.collidepoint(x, y) and (predicate is None or predicate(entity)):
+                    result.append(entity)
+
+        return result
+
+    def nearest(self, x, y, k=1, max_distance=None, predicate=None):
+        """Up to k entities closest to (x, y) by rect centre, nearest first."""
+        cx, cy = self._cell_of(x, y)
+        max_distance_sq = max_distance * max_distance if max_distance is not None else None
+        found = []  # (distance_sq, order, entity)
+        order = 0
+
+        for ring in range(self.max_ring + 1):
+            # Anything in this ring or beyond is at least (ring - 1) cells away
+            ring_min_dist = max(0, ring - 1) * self.cell_size
+            if max_distance is not None and ring_min_dist > max_distance:
+                break
+            if len(found) >= k and found[k - 1][0] <= ring_min_dist * ring_min_dist:
+                break
+
+            for gx in range(cx - ring, cx + ring + 1):
+                for gy in range(cy - ring, cy + ring + 1):
+                    if ring and abs(gx - cx) != ring and abs(gy - cy) != ring:
+                        continue
+
+                    bucket = self.cells.get((gx, gy))
+                    if not bucket:
+                        continue
+
+                    for entity in bucket:
+                        ex, ey = entity.rect.center
+                        dx = ex - x
+                        dy = ey - y
+                        dist_sq = dx * dx + dy * dy
+                        if max_distance_sq is not None and dist_sq > max_distance_sq:
+                            continue
+                        if predicate is not None and not predicate(entity):
+                            continue
+                        found.append((dist_sq, order, entity))
+                        order += 1
+
+            found.sort(key=lambda entry: (entry[0], entry[1]))
+
+        return [entity for _, _, entity in found[:k]]
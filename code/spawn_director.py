@@ -0,0 +1,232 @@
+import heapq
+
+import numpy as np
+
+from data.enemy_data import ENEMY_DATA
+from game_clock import get_ticks
+from rng import get_rng
+
+SPAWN_CELL_SIZE = 128  # density grid resolution
+SPAWN_MIN_PLAYER_DISTANCE = 300  # cells whose centre is closer to the player are skipped
+SPAWN_PORTAL_MARGIN = 64  # cells within this distance of a portal are skipped
+SPAWN_CANDIDATES = 4  # random cells sampled per spawn; the sparsest one wins
+SPAWN_POSITION_ATTEMPTS = 8  # tries to find a spot in the chosen cell clear of obstacles
+SPAWN_RESPAWN_DELAY = 500  # ms between a kill and its replacement spawning
+SPAWN_RATE = 2  # max spawns per frame; the rest stays queued for later frames
+SPAWN_MAX_ENEMIES_FACTOR = 2  # default hard cap (incl. waves) as a multiple of num_enemies
+SPAWN_WAVE_RETRY_DELAY = 1000  # ms before a wave enemy held back by max_enemies tries again
+
+_spawn_rng = get_rng("spawn")
+
+class AliasTable:
+    """Walker/Vose alias table: O(1) weighted picks from a fixed [(item, weight)] list."""
+
+    def __init__(self, weighted_items):
+        self.items = [item for item, _ in weighted_items]
+        n = len(self.items)
+        total = sum(weight for _, weight in weighted_items)
+
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        scaled = [weight * n / total for _, weight in weighted_items]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def __len__(self):
+        return len(self.items)
+
+    def pick(self, rng):
+        r = rng.random() * len(self.items)
+        i = int(r)
+        if r - i < self.prob[i]:
+            return self.items[i]
+        return self.items[self.alias[i]]
+
+class SpawnDirector:
+    """Decides what spawns in a zone, where and when.
+
+    Enemy types come from an alias table over the zone's spawn table. Positions are
+    the sparsest of a few random cells of a coarse density grid, skipping cells near
+    the player or a portal. Kills queue a respawn after respawn_delay; scripted waves
+    from ZONE_DATA["waves"] queue their enemies when due:
+
+        {"at": 30000, "enemies": [("zombie", 10)], "repeat": 60000}
+
+    `at` is ms after the zone is first entered and `repeat` is optional. Respawns keep
+    the zone at zone.num_enemies; wave enemies may go over it, up to max_enemies. At most
+    spawn_rate enemies spawn per frame.
+    """
+
+    def __init__(self, zone, spawn_table, respawn_delay=SPAWN_RESPAWN_DELAY,
+                 spawn_rate=SPAWN_RATE, max_enemies=None, waves=None, cell_size=SPAWN_CELL_SIZE,
+                 min_player_distance=SPAWN_MIN_PLAYER_DISTANCE):
+        self.zone = zone
+        self.table = AliasTable(spawn_table) if spawn_table else None
+        self.respawn_delay = respawn_delay
+        self.spawn_rate = spawn_rate
+        self._max_enemies = max_enemies
+        self.min_player_distance = min_player_distance
+
+        self.cell_size = cell_size
+        self.cols = max(1, -(-zone.size // cell_size))
+        centres = (np.arange(self.cols) + 0.5) * cell_size
+        self.cell_x = np.tile(centres, self.cols)
+        self.cell_y = np.repeat(centres, self.cols)
+        self.blocked = np.zeros(self.cols * self.cols, dtype=bool)
+
+        self.waves = [dict(wave) for wave in waves or ()]
+        self.started = None
+
+        self.queue = []  # heap of (due ms, sequence, enemy id or None for a weighted pick)
+        self._sequence = 0
+        self._pending_wave_enemies = 0  # wave entries in the queue; held back ones are capped by this
+        self._density = None
+
+    def __len__(self):
+        return len(self.queue)
+
+    # The population target stays on the zone (benchmarks and simulations tweak it).
+    @property
+    def num_enemies(self):
+        return self.zone.num_enemies
+
+    @property
+    def max_enemies(self):
+        if self._max_enemies is not None:
+            return self._max_enemies
+        return self.num_enemies * SPAWN_MAX_ENEMIES_FACTOR
+
+    def prepare(self):
+        # Portals exist once the zone is prepared; they never move afterwards.
+        margin = SPAWN_PORTAL_MARGIN + self.cell_size / 2
+        for rect in getattr(self.zone, "portals", {}).values():
+            near_x = (self.cell_x >= rect.left - margin) & (self.cell_x <= rect.right + margin)
+            near_y = (self.cell_y >= rect.top - margin) & (self.cell_y <= rect.bottom + margin)
+            self.blocked |= near_x & near_y
+
+        if self.started is None:
+            self.started = get_ticks()
+            for wave in self.waves:
+                wave["due"] = self.started + wave.get("at", 0)
+
+    def choose_enemy_type(self):
+        if self.table is None:
+            return None
+        return self.table.pick(_spawn_rng)
+
+    def _cell_counts(self):
+        pool = self.zone.enemy_pool
+        n = pool.count
+        counts = np.zeros(self.cols * self.cols, dtype=np.intp)
+        if not n:
+            return counts
+
+        centre = pool.pos[:n] + pool.size[:n] / 2
+        cells = np.clip((centre // self.cell_size).astype(np.intp), 0, self.cols - 1)
+        np.add.at(counts, cells[:, 1] * self.cols + cells[:, 0], 1)
+        return counts
+
+    def choose_position(self, enemy_id, player):
+        if self._density is None:
+            self._density = self._cell_counts()
+        counts = self._density
+
+        allowed = ~self.blocked
+        if player is not None:
+            px, py = player.rect.center
+            far = (self.cell_x - px) ** 2 + (self.cell_y - py) ** 2 >= self.min_player_distance ** 2
+            if (allowed & far).any():
+                allowed &= far
+        candidates = np.flatnonzero(allowed)
+        if not len(candidates):
+            candidates = np.arange(len(counts))
+
+        best = None
+        for _ in range(SPAWN_CANDIDATES):
+            cell = int(candidates[_spawn_rng.randrange(len(candidates))])
+            if best is None or counts[cell] < counts[best]:
+                best = cell
+        counts[best] += 1
+
+        size = ENEMY_DATA[enemy_id]["size"]
+        max_pos = self.zone.size - size
+        left = (best % self.cols) * self.cell_size
+        top = (best // self.cols) * self.cell_size
+        tiles = self.zone.tiles
+        for _ in range(SPAWN_POSITION_ATTEMPTS):
+            x = _spawn_rng.randint(min(left, max_pos), min(left + self.cell_size, max_pos))
+            y = _spawn_rng.randint(min(top, max_pos), min(top + self.cell_size, max_pos))
+            if not tiles.solid_tiles or not tiles.rect_blocked(x, y, size, size):
+                break
+        return x, y
+
+    def spawn(self, player, enemy_id=None):
+        enemy_id = enemy_id or self.choose_enemy_type()
+        x, y = self.choose_position(enemy_id, player)
+        return self.zone.spawn_enemy(player, enemy_id, x, y)
+
+    def spawn_initial(self, player):
+        self._density = None
+        for _ in range(self.num_enemies):
+            self.spawn(player)
+        self._density = None
+
+    def _push(self, due, enemy_id=None):
+        heapq.heappush(self.queue, (due, self._sequence, enemy_id))
+        self._sequence += 1
+        if enemy_id:
+            self._pending_wave_enemies += 1
+
+    def on_kill(self, enemy, now=None):
+        now = get_ticks() if now is None else now
+        self._push(now + self.respawn_delay)
+
+    def _queue_waves(self, now):
+        for wave in self.waves:
+            if wave["due"] is None or wave["due"] > now:
+                continue
+
+            for enemy_id, count in wave["enemies"]:
+                for _ in range(count):
+                    self._push(wave["due"], enemy_id)
+
+            repeat = wave.get("repeat")
+            wave["due"] = wave["due"] + repeat if repeat else None
+
+    def update(self, player, now=None):
+        now = get_ticks() if now is None else now
+        if self.waves and self.started is not None:
+            self._queue_waves(now)
+
+        queue = self.queue
+        spawned = 0
+        self._density = None
+
+        while queue and queue[0][0] <= now and spawned < self.spawn_rate:
+            _, _, enemy_id = heapq.heappop(queue)
+            alive = len(self.zone.enemies)
+            if enemy_id:
+                self._pending_wave_enemies -= 1
+                if alive >= self.max_enemies:
+                    # Hold the wave enemy back until there is room, but never keep more
+                    # waiting than the cap could ever let in (repeating waves would pile up).
+                    if self._pending_wave_enemies < self.max_enemies:
+                        self._push(now + SPAWN_WAVE_RETRY_DELAY, enemy_id)
+                    continue
+            elif alive >= self.num_enemies:
+                continue  # the zone is already back at its population; this kill needs no replacement
+
+            self.spawn(player, enemy_id)
+            spawned += 1
+
+        self._density = None
+        return spawned
@@ -1,187 +1,194 @@
-import random
 import math
-import pygame
+from dataclasses import dataclass
 
+from rng import get_rng
+
+_rng = get_rng("ai")
+
+# States are frozen and shared by every enemy using the same behaviour, so anything
+# that changes per enemy lives on the Blackboard (`bb`) passed into each call.
+
+def _sees_player(enemy, bb):
+    ex, ey = enemy.rect.center
+    px, py = bb.player.rect.center
+    return enemy.zone.los.visible(ex, ey, px, py)
+
+@dataclass(frozen=True, slots=True)
 class State:
-    def __init__(self, name):
-        self.name = name
+    name: str
 
-    def enter(self, enemy, ctx):
+    def enter(self, enemy, bb):
         pass
 
-    def update(self, enemy, dt, ctx):
+    def update(self, enemy, dt, bb):
         pass
 
-    def exit(self, enemy, ctx):
+    def exit(self, enemy, bb):
         pass
 
+@dataclass(frozen=True, slots=True)
 class IdleState(State):
-    def __init__(self, name="idle", duration_range=(0.5, 1.0), next_state="squash"):
-        super().__init__(name)
-        self.duration_range = duration_range
-        self.next_state = next_state
+    duration_range: tuple = (0.5, 1.0)
+    next_state: str = "squash"
 
-    def enter(self, enemy, ctx):
-        ctx.fsm.timer = random.uniform(*self.duration_range)
+    def enter(self, enemy, bb):
+        bb.timer = _rng.uniform(*self.duration_range)
         enemy.dx = 0
         enemy.dy = 0
 
-    def update(self, enemy, dt, ctx):
-        if ctx.fsm.timer <= 0:
-            ctx.fsm.change_state(self.next_state, enemy, ctx)
+    def update(self, enemy, dt, bb):
+        if bb.timer <= 0:
+            bb.fsm.change_state(self.next_state, enemy, bb)
 
+@dataclass(frozen=True, slots=True)
 class WanderState(State):
-    def __init__(self, name="wander", speed_multiplier=1.0, duration_range=(1.0, 2.0), next_state="idle"):
-        super().__init__(name)
-        self.speed_multiplier = speed_multiplier
-        self.duration_range = duration_range
-        self.next_state = next_state
-
-    def enter(self, enemy, ctx):
-        ctx.fsm.timer = random.uniform(*self.duration_range)
-        angle = random.uniform(0, 2 * math.pi)
+    speed_multiplier: float = 1.0
+    duration_range: tuple = (1.0, 2.0)
+    next_state: str = "idle"
+
+    def enter(self, enemy, bb):
+        bb.timer = _rng.uniform(*self.duration_range)
+        angle = _rng.uniform(0, 2 * math.pi)
         enemy.dx = enemy.speed * self.speed_multiplier * math.cos(angle)
         enemy.dy = enemy.speed * self.speed_multiplier * math.sin(angle)
 
-    def update(self, enemy, dt, ctx):
-        if ctx.fsm.timer <= 0:
-            ctx.fsm.change_state(self.next_state, enemy, ctx)
+    def update(self, enemy, dt, bb):
+        if bb.timer <= 0:
+            bb.fsm.change_state(self.next_state, enemy, bb)
 
+@dataclass(frozen=True, slots=True)
 class SquashState(State):
-    def __init__(self, name="squash", duration=0.4, next_state="leap"):
-        super().__init__(name)
-        self.duration = duration
-        self.next_state = next_state
+    duration: float = 0.4
+    next_state: str = "leap"
 
-    def enter(self, enemy, ctx):
-        ctx.fsm.timer = self.duration
+    def enter(self, enemy, bb):
+        bb.timer = self.duration
         enemy.dx = 0
         enemy.dy = 0
-        ctx.squash_t = 0.0
+        bb.squash_t = 0.0
 
-    def update(self, enemy, dt, ctx):
-        total = self.duration
-        ctx.squash_t = 1.0 - max(0, ctx.fsm.timer / total)
-        if ctx.fsm.timer <= 0:
-            ctx.fsm.change_state(self.next_state, enemy, ctx)
+    def update(self, enemy, dt, bb):
+        bb.squash_t = 1.0 - max(0, bb.timer / self.duration)
+        if bb.timer <= 0:
+            bb.fsm.change_state(self.next_state, enemy, bb)
 
+@dataclass(frozen=True, slots=True)
 class LeapState(State):
-    def __init__(self, name="leap", duration=0.3, leap_strength=5.0, decel_factor=0.02, next_state="wander", sound_id="slime_jump", target_func=None, target_radius=50):
-        super().__init__(name)
-        self.duration = duration
-        self.leap_strength = leap_strength
-        self.decel_factor = decel_factor
-        self.next_state = next_state
-        self.sound_id = sound_id
-        self.target_func = target_func  # returns target position or None
-        self.target_radius = target_radius
-
-    def enter(self, enemy, ctx):
-        ctx.fsm.timer = self.duration
+    duration: float = 0.3
+    leap_strength: float = 5.0
+    decel_factor: float = 0.02
+    next_state: str = "wander"
+    sound_id: str = "slime_jump"
+    target: str = None  # "player" leaps at the player when within target_radius
+    target_radius: float = 50
+    requires_los: bool = False  # ... and, if set, only when the player is in sight
+
+    def enter(self, enemy, bb):
+        bb.timer = self.duration
+        speed = enemy.speed * self.leap_strength
 
         target_pos = None
-        if self.target_func:
-            candidate = self.target_func(enemy, ctx)
-            if candidate:
-                if self.target_radius is None or enemy.pos.distance_to(candidate) <= self.target_radius:
+        if self.target == "player":
+            candidate = bb.player.pos
+            if self.target_radius is None or enemy.pos.distance_to(candidate) <= self.target_radius:
+                if not self.requires_los or _sees_player(enemy, bb):
                     target_pos = candidate
 
         if target_pos:
-            direction = (target_pos - enemy.pos)
+            direction = target_pos - enemy.pos
             if direction.length_squared() > 0:
-                direction = direction.normalize()
-                ctx.vector = direction * (enemy.speed * self.leap_strength)
+                direction = direction.normalize() * speed
+                bb.vx, bb.vy = direction.x, direction.y
             else:
-                ctx.vector = pygame.Vector2()
+                bb.vx, bb.vy = 0.0, 0.0
         else:
-            ctx.vector = self._random_vector(enemy)
+            angle = _rng.uniform(0, 2 * math.pi)
+            bb.vx, bb.vy = math.cos(angle) * speed, math.sin(angle) * speed
 
-    def _random_vector(self, enemy):
-        angle = random.uniform(0, 2 * math.pi)
-        speed = enemy.speed * self.leap_strength
-        return pygame.Vector2(math.cos(angle) * speed, math.sin(angle) * speed)
-
-    def update(self, enemy, dt, ctx):
-        enemy.dx = ctx.vector.x
-        enemy.dy = ctx.vector.y
-        ctx.vector *= math.pow(self.decel_factor, dt)
+    def update(self, enemy, dt, bb):
+        enemy.dx = bb.vx
+        enemy.dy = bb.vy
+        decel = math.pow(self.decel_factor, dt)
+        bb.vx *= decel
+        bb.vy *= decel
 
-        if ctx.fsm.timer <= 0:
+        if bb.timer <= 0:
             enemy.dx = 0
             enemy.dy = 0
-            ctx.queue_effect("particles", pos=enemy.rect.center, colour=enemy.current_colour)
-            ctx.queue_effect("sound", id=self.sound_id, pos=enemy.rect.center)
-            ctx.fsm.change_state(self.next_state, enemy, ctx)
+            bb.queue_effect("particles", pos=enemy.rect.center, colour=enemy.current_colour)
+            bb.queue_effect("sound", id=self.sound_id, pos=enemy.rect.center)
+            bb.fsm.change_state(self.next_state, enemy, bb)
 
+@dataclass(frozen=True, slots=True)
 class ZigzagState(State):
-    def __init__(self, name, speed_multiplier=1.0, segment_duration_range=(0.2, 0.5), total_duration_range=(1.0, 2.0), next_state=None):
-        super().__init__(name)
-        self.speed_multiplier = speed_multiplier
-        self.segment_duration_range = segment_duration_range
-        self.total_duration_range = total_duration_range
-        self.next_state = next_state
+    speed_multiplier: float = 1.0
+    segment_duration_range: tuple = (0.2, 0.5)
+    total_duration_range: tuple = (1.0, 2.0)
+    next_state: str = None
 
-        self.remaining_total_time = 0
-        self.segment_timer = 0
-        self.current_angle = 0
+    def enter(self, enemy, bb):
+        bb.timer = _rng.uniform(*self.total_duration_range)
+        self._choose_new_direction(bb)
 
-    def enter(self, entity, ctx):
-        self.remaining_total_time = random.uniform(*self.total_duration_range)
-        self._choose_new_direction()
+    def _choose_new_direction(self, bb):
+        bb.angle = _rng.uniform(0, 2 * math.pi)
+        bb.segment_timer = _rng.uniform(*self.segment_duration_range)
 
-    def _choose_new_direction(self):
-        self.current_angle = random.uniform(0, 2 * math.pi)
-        self.segment_timer = random.uniform(*self.segment_duration_range)
+    def update(self, enemy, dt, bb):
+        bb.segment_timer -= dt
+        if bb.segment_timer <= 0:
+            self._choose_new_direction(bb)
 
-    def update(self, entity, dt, ctx):
-        self.remaining_total_time -= dt
-        self.segment_timer -= dt
+        speed = enemy.speed * self.speed_multiplier
+        enemy.dx = math.cos(bb.angle) * speed
+        enemy.dy = math.sin(bb.angle) * speed
 
-        if self.segment_timer <= 0:
-            self._choose_new_direction()
+        if bb.timer <= 0 and self.next_state:
+            bb.fsm.change_state(self.next_state, enemy, bb)
 
-        speed = getattr(entity, "speed", 1.0) * self.speed_multiplier
-        entity.dx = math.cos(self.current_angle) * speed
-        entity.dy = math.sin(self.current_angle) * speed
+@dataclass(frozen=True, slots=True)
+class ChaseState(State):
+    radius: float = 200
+    speed_multiplier: float = 1.2
+    fallback: str = "idle"
+    requires_los: bool = False  # if set, aggro needs sight of the player; the flow field pursues after
 
-        if self.remaining_total_time <= 0:
-            if self.next_state:
-                ctx.fsm.change_state(self.next_state, entity, ctx)
+    def enter(self, enemy, bb):
+        bb.aggro = not self.requires_los
 
-class ChaseState(State):
-    def __init__(self, name="chase", radius=200, speed_multiplier=1.2, fallback="idle"):
-        super().__init__(name)
-        self.radius = radius
-        self.speed_multiplier = speed_multiplier
-        self.fallback = fallback
-
-    def update(self, enemy, dt, ctx):
-        player = ctx.player
-        dist = enemy.pos.distance_to(player.pos)
+    def update(self, enemy, dt, bb):
+        ex, ey = enemy.rect.center
+        px, py = bb.player.rect.center
+        dx, dy = px - ex, py - ey
 
-        if dist > self.radius:
+        if dx * dx + dy * dy > self.radius * self.radius or not (bb.aggro or _sees_player(enemy, bb)):
             if self.fallback:
-                ctx.fsm.change_state(self.fallback, enemy, ctx)
+                bb.fsm.change_state(self.fallback, enemy, bb)
             return
+        bb.aggro = True
 
-        dx, dy = player.pos.x - enemy.pos.x, player.pos.y - enemy.pos.y
-        angle = math.atan2(dy, dx)
-        enemy.dx = math.cos(angle) * enemy.speed * self.speed_multiplier
-        enemy.dy = math.sin(angle) * enemy.speed * self.speed_multiplier
+        # Follow the zone's shared flow field; straight at the player once in its cell.
+        direction = enemy.zone.flow_field.direction_at(ex, ey)
+        if direction is None:
+            dist = math.hypot(dx, dy)
+            direction = (dx / dist, dy / dist) if dist else (0.0, 0.0)
+
+        speed = enemy.speed * self.speed_multiplier
+        enemy.dx = direction[0] * speed
+        enemy.dy = direction[1] * speed
 
+@dataclass(frozen=True, slots=True)
 class FleeState(State):
-    def __init__(self, name="flee", radius=150, speed_multiplier=1.5, next_state="idle"):
-        super().__init__(name)
-        self.radius = radius
-        self.speed_multiplier = speed_multiplier
-        self.next_state = next_state
-
-    def update(self, enemy, dt, ctx):
-        player = ctx.player
+    radius: float = 150
+    speed_multiplier: float = 1.5
+    next_state: str = "idle"
+
+    def update(self, enemy, dt, bb):
+        player = bb.player
         dist = enemy.pos.distance_to(player.pos)
 
         if dist > self.radius:
-            ctx.fsm.change_state(self.next_state, enemy, ctx)
+            bb.fsm.change_state(self.next_state, enemy, bb)
             return
 
         dx, dy = enemy.pos.x - player.pos.x, enemy.pos.y - player.pos.y
@@ -189,23 +196,26 @@ class FleeState(State):
         enemy.dx = math.cos(angle) * enemy.speed * self.speed_multiplier
         enemy.dy = math.sin(angle) * enemy.speed * self.speed_multiplier
 
+@dataclass(frozen=True, slots=True)
 class StrafeState(State):
-    def __init__(self, name="strafe", radius=180, fallback="idle", duration=2.0):
-        super().__init__(name)
-        self.radius = radius
-        self.fallback = fallback
-        self.duration = duration
-
-    def enter(self, enemy, ctx):
-        ctx.fsm.timer = self.duration
-
-        # Lock the perpendicular direction at entry
-        player = ctx.player
-        dx = player.pos.x - enemy.pos.x
-        dy = player.pos.y - enemy.pos.y
+    radius: float = 180
+    fallback: str = "idle"
+    duration: float = 2.0
+    requires_los: bool = False  # if set, breaks off once the player is out of sight
+
+    def enter(self, enemy, bb):
+        bb.timer = self.duration
+
+        # Lock the perpendicular direction at entry, relative to the path to the player
+        ex, ey = enemy.rect.center
+        direction = enemy.zone.flow_field.direction_at(ex, ey)
+        if direction is None:
+            px, py = bb.player.rect.center
+            direction = (px - ex, py - ey)
+        dx, dy = direction
 
         # Get fixed perpendicular vector (random left/right)
-        if random.random() < 0.5:
+        if _rng.random() < 0.5:
             perp_x = dy
             perp_y = -dx
         else:
@@ -219,21 +229,34 @@ class StrafeState(State):
             perp_x /= length
             perp_y /= length
 
-        # Store in context for use during update
-        ctx._strafe_vector = pygame.Vector2(perp_x, perp_y)
+        bb.vx, bb.vy = perp_x, perp_y
 
-    def update(self, enemy, dt, ctx):
-        player = ctx.player
-        dist = enemy.pos.distance_to(player.pos)
+    def update(self, enemy, dt, bb):
+        ex, ey = enemy.rect.center
+        px, py = bb.player.rect.center
+        leash = self.radius * 1.5
 
-        if dist > self.radius * 1.5:
-            ctx.fsm.change_state(self.fallback, enemy, ctx)
+        if (px - ex) ** 2 + (py - ey) ** 2 > leash * leash or (self.requires_los and not _sees_player(enemy, bb)):
+            bb.fsm.change_state(self.fallback, enemy, bb)
             return
 
         # Apply locked direction
-        v = ctx._strafe_vector
-        enemy.dx = v.x * enemy.speed
-        enemy.dy = v.y * enemy.speed
-
-        if ctx.fsm.timer <= 0:
-            ctx.fsm.change_state(self.fallback, enemy, ctx)
\ No newline at end of file
+        enemy.dx = bb.vx * enemy.speed
+        enemy.dy = bb.vy * enemy.speed
+
+        if bb.timer <= 0:
+            bb.fsm.change_state(self.fallback, enemy, bb)
+
+STATE_TYPES = {
+    "idle": IdleState,
+    "wander": WanderState,
+    "squash": SquashState,
+    "leap": LeapState,
+    "zigzag": ZigzagState,
+    "chase": ChaseState,
+    "flee": FleeState,
+    "strafe": StrafeState,
+}
+
+# Fields that name another state; compile_behaviour checks they exist.
+STATE_TRANSITION_FIELDS = ("next_state", "fallback")
@@ -1,22 +1,92 @@
-from state import State
+from types import MappingProxyType
+
+from data.enemy_behaviour_data import ENEMY_BEHAVIOUR_DATA
+from state import STATE_TYPES, STATE_TRANSITION_FIELDS
 
 class StateMachine:
-    def __init__(self):
-        self.states = {}
-        self.current_state = None
-        self.timer = 0
-
-    def add_state(self, state: State):
-        self.states[state.name] = state
-
-    def change_state(self, name, entity, ctx):
-        if self.current_state:
-            self.current_state.exit(entity, ctx)
-        self.current_state = self.states.get(name)
-        if self.current_state:
-            self.current_state.enter(entity, ctx)
-
-    def update(self, entity, dt, ctx):
-        self.timer -= dt
-        if self.current_state:
-            self.current_state.update(entity, dt, ctx)
\ No newline at end of file
+    """Immutable state graph shared by every enemy with the same behaviour.
+
+    Which state an enemy is in, its timers and any other per-enemy values live on
+    its Blackboard; the machine only holds the compiled states.
+    """
+
+    __slots__ = ("states", "initial")
+
+    def __init__(self, states, initial):
+        object.__setattr__(self, "states", MappingProxyType(dict(states)))
+        object.__setattr__(self, "initial", initial)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("StateMachine is shared between enemies; per-enemy data goes on the Blackboard")
+
+    def change_state(self, name, entity, bb):
+        if bb.state:
+            bb.state.exit(entity, bb)
+        bb.state = self.states.get(name)
+        if bb.state:
+            bb.state.enter(entity, bb)
+
+    def update(self, entity, dt, bb):
+        if bb.state is None:
+            self.change_state(self.initial, entity, bb)
+
+        bb.timer -= dt
+        if bb.state:
+            bb.state.update(entity, dt, bb)
+
+class Blackboard:
+    """Per-enemy FSM data. vx/vy hold the leap velocity or the locked strafe direction."""
+
+    __slots__ = ("fsm", "player", "state", "timer", "segment_timer", "angle", "vx", "vy", "squash_t", "aggro", "pending_effects")
+
+    def __init__(self, fsm, player):
+        self.fsm = fsm
+        self.reset(player)
+
+    def reset(self, player):
+        self.player = player
+        self.state = None
+        self.timer = 0.0
+        self.segment_timer = 0.0
+        self.angle = 0.0
+        self.vx = 0.0
+        self.vy = 0.0
+        self.squash_t = 0.0
+        self.aggro = False  # ChaseState: player seen since entering the state
+        self.pending_effects = None  # created on first queue_effect
+
+    def queue_effect(self, effect_type, **kwargs):
+        if self.pending_effects is None:
+            self.pending_effects = []
+        self.pending_effects.append({"type": effect_type, **kwargs})
+
+    def consume_effects(self):
+        effects = self.pending_effects
+        self.pending_effects = None
+        return effects or ()
+
+def compile_behaviour(spec):
+    states = {}
+    for name, state_spec in spec["states"].items():
+        fields = dict(state_spec)
+        state_type = fields.pop("type")
+        states[name] = STATE_TYPES[state_type](name=name, **fields)
+
+    if spec["initial"] not in states:
+        raise ValueError(f"Initial state '{spec['initial']}' is not defined")
+    for state in states.values():
+        for field in STATE_TRANSITION_FIELDS:
+            target = getattr(state, field, None)
+            if target and target not in states:
+                raise ValueError(f"State '{state.name}' transitions to undefined state '{target}'")
+
+    return StateMachine(states, spec["initial"])
+
+_behaviours = {}
+
+def get_behaviour(behaviour_id):
+    fsm = _behaviours.get(behaviour_id)
+    if fsm is None:
+        fsm = compile_behaviour(ENEMY_BEHAVIOUR_DATA[behaviour_id])
+        _behaviours[behaviour_id] = fsm
+    return fsm
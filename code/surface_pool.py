@@ -0,0 +1,48 @@
+import pygame
+
+class SurfacePool:
+    """Reusable surfaces for per-frame overlays and effect sprites.
+
+    get() hands out one scratch surface per (size, flags); its contents are whatever
+    the last user left, so callers fill it before drawing and blit it straight away
+    rather than keeping it. ring() returns pre-rendered, opaque ring sprites keyed by
+    (colour, radius, width); callers fade them at blit time (text_cache.blit_alpha),
+    so a single sprite per radius covers every alpha step. Once every size in use has
+    been seen, drawing allocates no surfaces.
+    """
+
+    def __init__(self):
+        self._scratch = {}
+        self._rings = {}
+        self.allocations = 0
+
+    def get(self, size, flags=0):
+        key = (int(size[0]), int(size[1]), flags)
+        surface = self._scratch.get(key)
+        if surface is None:
+            surface = self._scratch[key] = pygame.Surface(key[:2], flags)
+            self.allocations += 1
+        return surface
+
+    def ring(self, colour, radius, width):
+        key = (colour, radius, width)
+        surface = self._rings.get(key)
+        if surface is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, colour, (radius, radius), radius, width=width)
+            self._rings[key] = surface
+            self.allocations += 1
+        return surface
+
+    def prerender_rings(self, colour, radii, width):
+        for radius in radii:
+            self.ring(colour, radius, width)
+
+    def clear(self):
+        self._scratch.clear()
+        self._rings.clear()
+
+_surface_pool = SurfacePool()
+
+def get_surface_pool():
+    return _surface_pool
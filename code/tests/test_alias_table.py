@@ -0,0 +1,24 @@
+import random
+from collections import Counter
+
+import pytest
+
+from spawn_director import AliasTable
+
+def test_pick_frequencies_follow_weights():
+    weights = [("slime", 60), ("zombie", 25), ("spider", 10), ("skeleton", 5)]
+    table = AliasTable(weights)
+    rng = random.Random(7)
+
+    draws = 200_000
+    counts = Counter(table.pick(rng) for _ in range(draws))
+    total = sum(weight for _, weight in weights)
+    for item, weight in weights:
+        assert counts[item] / draws == pytest.approx(weight / total, abs=0.01)
+
+def test_single_item_and_zero_weight():
+    rng = random.Random(0)
+    assert {AliasTable([("only", 3)]).pick(rng) for _ in range(100)} == {"only"}
+
+    table = AliasTable([("never", 0), ("always", 1)])
+    assert {table.pick(rng) for _ in range(1000)} == {"always"}
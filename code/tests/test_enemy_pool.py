@@ -0,0 +1,69 @@
+import numpy as np
+
+from enemy_pool import EnemyPool
+
+class Stub:
+    """Just the attributes EnemyPool reads and writes on an enemy."""
+
+    def __init__(self, name):
+        self.name = name
+        self._detached_pool = None
+
+def _pool_with(count):
+    pool = EnemyPool(1000, capacity=2)  # small, so allocate() has to grow it
+    enemies = [Stub(i) for i in range(count)]
+    for i, enemy in enumerate(enemies):
+        pool.allocate(enemy)
+        pool.pos[enemy._slot] = (i * 10, i * 20)
+        pool.attack_radius[enemy._slot] = i
+    return pool, enemies
+
+def test_allocate_grows_and_assigns_dense_slots():
+    pool, enemies = _pool_with(5)
+    assert len(pool) == 5
+    assert [e._slot for e in enemies] == list(range(5))
+    assert all(e._pool is pool for e in enemies)
+
+def test_remove_swaps_last_into_freed_slot():
+    pool, enemies = _pool_with(5)
+    removed, last = enemies[1], enemies[4]
+
+    pool.remove(removed)
+
+    assert len(pool) == 4
+    assert last._slot == 1
+    assert pool.entities[1] is last
+    assert tuple(pool.pos[1]) == (40, 80)
+    assert pool.attack_radius[1] == 4
+    for enemy in pool.entities:
+        assert pool.entities[enemy._slot] is enemy
+
+def test_removed_enemy_keeps_its_last_state():
+    pool, enemies = _pool_with(3)
+    dead = enemies[0]
+
+    pool.remove(dead)
+
+    assert dead._pool is not pool
+    assert tuple(dead._pool.pos[dead._slot]) == (0, 0)
+    assert dead not in pool.entities
+
+def test_detached_pool_is_reused_across_deaths():
+    pool, enemies = _pool_with(3)
+    enemy = enemies[2]
+
+    pool.remove(enemy)
+    detached = enemy._detached_pool
+    pool.allocate(enemy)
+    pool.pos[enemy._slot] = (5, 6)
+    pool.remove(enemy)
+
+    assert enemy._detached_pool is detached
+    assert len(detached) == 1
+    assert np.array_equal(detached.pos[0], (5, 6))
+
+def test_remove_last_slot():
+    pool, enemies = _pool_with(3)
+    pool.remove(enemies[2])
+    assert len(pool) == 2
+    assert [e._slot for e in enemies[:2]] == [0, 1]
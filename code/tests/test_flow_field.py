@@ -0,0 +1,69 @@
+import numpy as np
+
+from flow_field import FlowField
+
+CELL = 32
+
+def _walk(field, x, y, max_steps=200):
+    """Follow the field from (x, y) one cell at a time; returns the cells visited."""
+    visited = [field.cell_of(x, y)]
+    for _ in range(max_steps):
+        direction = field.direction_at(x, y)
+        if direction is None:
+            break
+        dx, dy = direction
+        x += round(dx) * CELL if abs(dx) > 0.38 else 0
+        y += round(dy) * CELL if abs(dy) > 0.38 else 0
+        visited.append(field.cell_of(x, y))
+    return visited
+
+def _wall_with_gap():
+    # 20 x 20 cells; a vertical wall at column 10 with a gap at row 17.
+    field = FlowField(20 * CELL, cell_size=CELL, radius=20 * CELL)
+    blocked = np.zeros((20, 20), dtype=bool)
+    blocked[:, 10] = True
+    blocked[17, 10] = False
+    field.set_blocked(blocked)
+    return field, blocked
+
+def test_routes_around_wall_through_the_gap():
+    field, blocked = _wall_with_gap()
+    target = (15 * CELL + 16, 5 * CELL + 16)
+    field.update(*target)
+
+    path = _walk(field, 5 * CELL + 16, 5 * CELL + 16)
+
+    assert path[-1] == field.cell_of(*target)
+    assert (17, 10) in path
+    assert not any(blocked[row, col] for row, col in path)
+
+def test_distances_are_shortest_paths():
+    field, _ = _wall_with_gap()
+    field.update(15 * CELL + 16, 5 * CELL + 16)
+
+    # Open field: the target's neighbours are one step away, diagonals sqrt(2).
+    assert field.distance[5, 15] == 0
+    assert field.distance[5, 16] == 1
+    assert np.isclose(field.distance[6, 16], np.sqrt(2))
+    # Behind the wall the route must detour through the gap, so it is far longer
+    # than the 10 cells straight across.
+    assert field.distance[5, 5] > 20
+
+def test_unreachable_cells_have_no_direction():
+    field = FlowField(20 * CELL, cell_size=CELL, radius=20 * CELL)
+    blocked = np.zeros((20, 20), dtype=bool)
+    blocked[:, 10] = True  # no gap
+    field.set_blocked(blocked)
+    field.update(15 * CELL, 5 * CELL)
+
+    assert field.direction_at(5 * CELL, 5 * CELL) is None
+    assert np.isinf(field.distance[5, 5])
+    assert field.direction_at(12 * CELL, 5 * CELL) is not None
+
+def test_rebuilds_only_when_target_changes_cell():
+    field = FlowField(20 * CELL, cell_size=CELL)
+    field.update(100, 100)
+    field.update(101, 110)
+    assert field.rebuilds == 1
+    field.update(100 + CELL, 100)
+    assert field.rebuilds == 2
@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+import pygame
+
+from line_of_sight import LineOfSight
+from tile_grid import TileGrid
+
+TILE = 16
+
+def _los(rects, world=640):
+    return LineOfSight(TileGrid.bake(world, [pygame.Rect(r) for r in rects], TILE))
+
+def test_wall_blocks_and_open_ground_does_not():
+    los = _los([(320, 0, 16, 400)])  # vertical wall at x 320..336, y 0..400
+    assert not los.visible(100, 100, 500, 100)
+    assert los.visible(100, 500, 500, 500)  # below the wall
+    assert los.visible(100, 100, 100, 600)  # same side
+
+def test_zone_without_solid_tiles_is_always_visible():
+    los = _los([])
+    assert los.visible(0, 0, 639, 639)
+    assert los.batch(np.array([0, 100]), np.array([0, 200]), 600, 600).all()
+    assert los.casts == 0
+
+def test_batch_matches_scalar_cast():
+    rng = random.Random(3)
+    rects = [(rng.randrange(0, 600), rng.randrange(0, 600), rng.randrange(16, 80), rng.randrange(16, 80)) for _ in range(25)]
+    los = _los(rects)
+
+    xs = np.array([rng.randrange(640) for _ in range(500)])
+    ys = np.array([rng.randrange(640) for _ in range(500)])
+    for tx, ty in ((320, 320), (5, 630), (600, 17)):
+        batched = los.batch(xs, ys, tx, ty)
+        end = los._tile(tx, ty)
+        scalar = [los._cast(*los._tile(x, y), *end) for x, y in zip(xs.tolist(), ys.tolist())]
+        assert batched.tolist() == scalar
+
+def test_visible_caches_per_tile_pair_until_new_frame():
+    los = _los([(320, 0, 16, 400)])
+    los.visible(100, 100, 500, 100)
+    los.visible(101, 102, 503, 99)  # same tiles
+    assert los.casts == 1
+
+    los.new_frame()
+    los.visible(100, 100, 500, 100)
+    assert los.casts == 2
@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pygame
+import pytest
+
+from data.projectile_data import PROJECTILE_DATA
+from projectile import ProjectilePool
+from tile_grid import TileGrid
+
+KIND = next(iter(PROJECTILE_DATA))
+
+class Combat:
+    def __init__(self):
+        self.hits = []
+
+    def take_damage(self, amount, direction, attacker_entity=None, reason=None):
+        self.hits.append((amount, attacker_entity, reason))
+
+class Target:
+    def __init__(self, x, y, size=30):
+        self.rect = pygame.Rect(x, y, size, size)
+        self.combat = Combat()
+
+def test_projectile_hits_target_once_and_is_removed():
+    pool = ProjectilePool(2000)
+    target = Target(300, 185)
+    pool.fire("archer", KIND, 100, 200, 0.0, damage=7)  # flying +x into the target
+
+    for _ in range(200):
+        pool.update(1 / 60, target)
+        if not len(pool):
+            break
+
+    assert target.combat.hits == [(7.0, "archer", "projectile")]
+    assert len(pool) == 0
+    assert pool.owner[0] is None
+
+def test_missing_projectiles_are_not_hits():
+    pool = ProjectilePool(2000)
+    target = Target(300, 600)
+    pool.fire(None, KIND, 100, 200, 0.0, damage=5)
+    pool.update(0.5, target)
+    assert target.combat.hits == []
+
+def test_compaction_keeps_survivors_in_order():
+    pool = ProjectilePool(2000)
+    angles = [0.0, math.pi, 0.0, math.pi]  # left-movers leave the zone on the first update
+    pool.fire("a", KIND, 5, 500, angles[:2], damage=1)
+    pool.fire("b", KIND, 5, 800, angles[2:], damage=2)
+
+    pool.update(0.1)
+
+    assert len(pool) == 2
+    assert pool.owner[:2].tolist() == ["a", "b"]
+    assert pool.damage[:2].tolist() == [1, 2]
+    assert np.all(pool.vx[:2] > 0)
+    assert pool.owner[2:4].tolist() == [None, None]
+
+def test_expiry_and_solid_tiles():
+    data = PROJECTILE_DATA[KIND]
+    pool = ProjectilePool(2000)
+    pool.fire(None, KIND, 1000, 1000, 0.0, damage=1)
+    pool.update(data["life"] + 0.01)
+    assert len(pool) == 0
+
+    pool.tiles = TileGrid.bake(2000, [pygame.Rect(1010, 900, 32, 200)])
+    pool.fire(None, KIND, 1000, 1000, 0.0, damage=1)
+    pool.update(20 / data["speed"])  # 20 px on: inside the wall
+    assert len(pool) == 0
+
+def test_fire_drops_shots_past_capacity():
+    pool = ProjectilePool(2000, capacity=3)
+    assert pool.fire(None, KIND, 0, 0, [0.0, 0.1, 0.2, 0.3], damage=1) == 3
+    assert pool.fire(None, KIND, 0, 0, 0.0, damage=1) == 0
+    assert len(pool) == 3
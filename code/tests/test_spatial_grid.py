@@ -0,0 +1,57 @@
+import random
+
+import pygame
+
+from spatial_grid import SpatialGrid
+
+class Box:
+    def __init__(self, x, y, size=10):
+        self.rect = pygame.Rect(x, y, size, size)
+
+def _scatter(count=300, world=1000, seed=1):
+    rng = random.Random(seed)
+    grid = SpatialGrid(world, cell_size=64)
+    boxes = [Box(rng.randrange(world - 20), rng.randrange(world - 20), rng.randrange(4, 20)) for _ in range(count)]
+    for box in boxes:
+        grid.insert(box)
+    return grid, boxes
+
+def test_query_radius_matches_brute_force():
+    grid, boxes = _scatter()
+    for x, y, radius in ((500, 500, 120), (0, 0, 64), (990, 10, 300)):
+        expected = {b for b in boxes if (b.rect.centerx - x) ** 2 + (b.rect.centery - y) ** 2 <= radius * radius}
+        assert set(grid.query_radius(x, y, radius)) == expected
+
+def test_query_rect_and_point_match_brute_force():
+    grid, boxes = _scatter()
+    area = pygame.Rect(200, 300, 250, 150)
+    assert set(grid.query_rect(area)) == {b for b in boxes if b.rect.colliderect(area)}
+
+    box = boxes[0]
+    x, y = box.rect.center
+    found = grid.query_point(x, y)
+    assert box in found
+    assert set(found) == {b for b in boxes if b.rect.collidepoint(x, y)}
+
+def test_nearest_orders_by_distance():
+    grid, boxes = _scatter()
+    x, y = 420, 610
+    by_distance = sorted(boxes, key=lambda b: (b.rect.centerx - x) ** 2 + (b.rect.centery - y) ** 2)
+    nearest = grid.nearest(x, y, k=5)
+    distances = [(b.rect.centerx - x) ** 2 + (b.rect.centery - y) ** 2 for b in nearest]
+    assert distances == sorted(distances)
+    assert distances == [(b.rect.centerx - x) ** 2 + (b.rect.centery - y) ** 2 for b in by_distance[:5]]
+
+def test_move_and_remove_keep_buckets_consistent():
+    grid = SpatialGrid(1000, cell_size=64)
+    box = Box(10, 10)
+    grid.insert(box)
+
+    box.rect.topleft = (700, 700)
+    grid.move(box)
+    assert grid.query_radius(15, 15, 50) == []
+    assert grid.query_radius(705, 705, 50) == [box]
+
+    grid.remove(box)
+    assert len(grid) == 0
+    assert grid.cells == {}
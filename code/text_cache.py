@@ -0,0 +1,81 @@
+from collections import OrderedDict
+
+import pygame
+
+TEXT_CACHE_SIZE = 2048
+
+class TextCache:
+    """LRU of rendered text surfaces keyed by (font, text, colour).
+
+    Returned surfaces are shared: blit them, don't draw on them or change their alpha
+    (use blit_alpha or blit_text for faded text).
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def render(self, font, text, colour):
+        if not isinstance(colour, (tuple, str)):
+            colour = tuple(colour)  # lists and pygame.Color aren't usable as keys
+
+        key = (font, text, colour)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, True, colour)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+_text_cache = TextCache()
+_fonts = {}
+
+def get_text_cache():
+    return _text_cache
+
+def render_text(font, text, colour):
+    return _text_cache.render(font, text, colour)
+
+def blit_alpha(surface, surf, pos, alpha=255):
+    if alpha >= 255:
+        return surface.blit(surf, pos)
+
+    # Surface alpha is applied at blit time, so fading never re-rasterises the glyphs.
+    # It is reset afterwards because cached surfaces are shared.
+    surf.set_alpha(alpha)
+    rect = surface.blit(surf, pos)
+    surf.set_alpha(255)
+    return rect
+
+def blit_text(surface, font, text, colour, pos, alpha=255):
+    return blit_alpha(surface, _text_cache.render(font, text, colour), pos, alpha)
+
+def get_sys_font(name, size):
+    font = _fonts.get((name, size))
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[(name, size)] = font
+    return font
@@ -0,0 +1,103 @@
+import numpy as np
+
+TILE_SIZE = 16
+
+class TileGrid:
+    """Solid/free tiles for a zone's static obstacles, packed one bit per tile.
+
+    Obstacle rects are rasterised once by bake(); every collision query afterwards is
+    a handful of O(1) bit lookups, independent of how many obstacles the zone has.
+    """
+
+    def __init__(self, world_size, tile_size=TILE_SIZE):
+        self.world_size = world_size
+        self.tile_size = tile_size
+        self.cols = max(1, -(-world_size // tile_size))
+        self.bits = np.zeros((self.cols, (self.cols + 7) // 8), dtype=np.uint8)  # [row, col // 8]
+        self.solid_tiles = 0
+
+    @classmethod
+    def bake(cls, world_size, rects, tile_size=TILE_SIZE):
+        grid = cls(world_size, tile_size)
+        solid = np.zeros((grid.cols, grid.cols), dtype=bool)
+        for rect in rects:
+            left, top = max(rect.left, 0) // tile_size, max(rect.top, 0) // tile_size
+            right, bottom = -(-rect.right // tile_size), -(-rect.bottom // tile_size)
+            solid[top:bottom, left:right] = True
+
+        grid.bits = np.packbits(solid, axis=1)
+        grid.solid_tiles = int(solid.sum())
+        return grid
+
+    def unpack(self):
+        return np.unpackbits(self.bits, axis=1, count=self.cols).astype(bool)
+
+    def downsample(self, cell_size):
+        """Bool [row, col] grid at a coarser cell size; a cell is solid if any tile in it is."""
+        solid = self.unpack()
+        factor = max(1, cell_size // self.tile_size)
+        cells = -(-self.cols // factor)
+        padded = np.zeros((cells * factor, cells * factor), dtype=bool)
+        padded[:self.cols, :self.cols] = solid
+        return padded.reshape(cells, factor, cells, factor).any(axis=(1, 3))
+
+    def is_solid(self, x, y):
+        col = int(x) // self.tile_size
+        row = int(y) // self.tile_size
+        if not (0 <= col < self.cols and 0 <= row < self.cols):
+            return False
+        return bool(self.bits[row, col >> 3] >> (7 - (col & 7)) & 1)
+
+    def rect_blocked(self, x, y, w, h):
+        ts = self.tile_size
+        left, top = int(x), int(y)
+        for row in range(top // ts, (top + h - 1) // ts + 1):
+            for col in range(left // ts, (left + w - 1) // ts + 1):
+                if self.is_solid(col * ts, row * ts):
+                    return True
+        return False
+
+    def resolve_move(self, x0, y0, x1, y1, w, h):
+        """Move a w x h box from (x0, y0) towards (x1, y1) one axis at a time, stopping
+        flush against solid tiles. Returns the resolved (x, y)."""
+        ts = self.tile_size
+
+        x = x1
+        if x1 != x0 and self.rect_blocked(x1, y0, w, h):
+            if x1 > x0:
+                x = max(x0, ((int(x1) + w - 1) // ts) * ts - w)
+            else:
+                x = min(x0, (int(x1) // ts + 1) * ts)
+
+        y = y1
+        if y1 != y0 and self.rect_blocked(x, y1, w, h):
+            if y1 > y0:
+                y = max(y0, ((int(y1) + h - 1) // ts) * ts - h)
+            else:
+                y = min(y0, (int(y1) // ts + 1) * ts)
+
+        return x, y
+
+    def points_solid(self, xs, ys):
+        """Vectorised is_solid for arrays of world coordinates."""
+        cols = xs.astype(np.intp) // self.tile_size
+        rows = ys.astype(np.intp) // self.tile_size
+        inside = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.cols)
+        cols = np.where(inside, cols, 0)
+        rows = np.where(inside, rows, 0)
+        bit = (self.bits[rows, cols >> 3] >> (7 - (cols & 7))) & 1
+        return inside & (bit == 1)
+
+    def edges_blocked(self, edge, start, length, axis_is_x):
+        """Vectorised check of one edge per box: the column x = edge spanning
+        [start, start + length) in y (axis_is_x), or the row y = edge spanning x."""
+        ts = self.tile_size
+        steps = int(length.max() - 1) // ts + 2 if len(length) else 0
+        blocked = np.zeros(len(edge), dtype=bool)
+        for k in range(steps):
+            along = start + np.minimum(k * ts, length - 1)
+            if axis_is_x:
+                blocked |= self.points_solid(edge, along)
+            else:
+                blocked |= self.points_solid(along, edge)
+        return blocked
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+TRACE_BUFFER_EVENTS = 200000  # oldest events are dropped once the buffer is full
+TRACE_EXPORT_DIR = "traces"
+TRACE_PID = 1
+TRACE_TID = 1
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.complete(self.name, self.cat, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    def __init__(self, max_events=TRACE_BUFFER_EVENTS):
+        self.max_events = max_events
+        self.recording = False
+        self.events = deque(maxlen=max_events)  # (name, cat, start_ns, dur_ns or None, args)
+        self.recorded = 0
+
+        self._origin_ns = time.perf_counter_ns()
+        self._writer = None
+
+    def start(self):
+        self.events = deque(maxlen=self.max_events)
+        self.recorded = 0
+        self.recording = True
+
+    def stop(self, path=None):
+        """Stop recording and write the buffer on a background thread. Returns the output path."""
+        self.recording = False
+
+        if path is None:
+            os.makedirs(TRACE_EXPORT_DIR, exist_ok=True)
+            path = os.path.join(TRACE_EXPORT_DIR, f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+        events = self.events
+        dropped = self.recorded - len(events)
+        self.events = deque(maxlen=self.max_events)
+
+        self.wait()
+        self._writer = threading.Thread(target=self._write, args=(path, events, dropped), daemon=True)
+        self._writer.start()
+        return path
+
+    def wait(self):
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+
+    def span(self, name, cat="game", args=None):
+        if not self.recording:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def complete(self, name, cat, start_ns, dur_ns, args=None):
+        if self.recording:
+            self.events.append((name, cat, start_ns, dur_ns, args))
+            self.recorded += 1
+
+    def instant(self, name, cat="game", args=None):
+        if self.recording:
+            self.events.append((name, cat, time.perf_counter_ns(), None, args))
+            self.recorded += 1
+
+    def _write(self, path, events, dropped):
+        origin = self._origin_ns
+        trace_events = [
+            {"name": "process_name", "ph": "M", "pid": TRACE_PID, "args": {"name": "Grindy Game"}},
+            {"name": "thread_name", "ph": "M", "pid": TRACE_PID, "tid": TRACE_TID, "args": {"name": "main"}},
+        ]
+
+        for name, cat, start_ns, dur_ns, args in events:
+            event = {"name": name, "cat": cat, "pid": TRACE_PID, "tid": TRACE_TID, "ts": (start_ns - origin) / 1000}
+            if dur_ns is None:
+                event["ph"] = "i"
+                event["s"] = "t"
+            else:
+                event["ph"] = "X"
+                event["dur"] = dur_ns / 1000
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": {"dropped_events": dropped}}, f)
+
+_tracer = Tracer()
+
+def get_tracer():
+    return _tracer
+
+def set_tracer(tracer):
+    global _tracer
+    _tracer = tracer
+
+def trace_span(name, cat="game", args=None):
+    return _tracer.span(name, cat, args)
@@ -1,5 +1,7 @@
 import pygame
 from ui.scrollable_panel import ScrollablePanel
+from input_source import get_mouse_pos
+from text_cache import render_text
 
 class BaseUIPanel:
     def __init__(self, title, font, x, y, width, height):
@@ -49,15 +51,15 @@ class BaseUIPanel:
         pygame.draw.rect(screen, (30, 30, 30), (self.panel_x, self.panel_y, self.panel_width, self.panel_height))
         pygame.draw.rect(screen, (200, 200, 200), (self.panel_x, self.panel_y, self.panel_width, self.panel_height), 2)
 
-        title_surf = self.font.render(self.title, True, (255, 255, 255))
+        title_surf = render_text(self.font, self.title, (255, 255, 255))
         screen.blit(title_surf, (self.panel_x + 16, self.panel_y + 12))
 
         self.close_rect = pygame.Rect(self.panel_x + self.panel_width - 32, self.panel_y + 12, 20, 20)
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
         hover = self.close_rect.collidepoint(mouse_pos)
 
         pygame.draw.rect(screen, (150, 50, 50) if hover else (100, 30, 30), self.close_rect)
-        x_surf = self.font.render("X", True, (255, 255, 255))
+        x_surf = render_text(self.font, "X", (255, 255, 255))
         screen.blit(x_surf, (
             self.close_rect.centerx - x_surf.get_width() // 2,
             self.close_rect.centery - x_surf.get_height() // 2
@@ -7,6 +7,8 @@ from format import format_drop_table_lines
 from gamestate import GameState
 from draw_helpers import *
 from ui.base_ui_panel import BaseUIPanel
+from input_source import get_mouse_pos
+from text_cache import render_text
 
 class BeastiaryUI(BaseUIPanel):
     def __init__(self, player, font):
@@ -28,7 +30,7 @@ class BeastiaryUI(BaseUIPanel):
         enemy_ids = list(ENEMY_DATA.keys())
         enemy_ids.sort(key=lambda eid: (eid not in self.player.discovered_enemies, eid))
 
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
 
         content_area, content_surface, scroll_y = self.get_panel_scroll_context(screen)
         y = scroll_y
@@ -42,14 +44,14 @@ class BeastiaryUI(BaseUIPanel):
             name = data.get("name", enemy_id).title() if discovered else "??????"
 
             header_text = f"{name}"
-            header = self.font.render(header_text, True, (255, 255, 255))
+            header = render_text(self.font, header_text, (255, 255, 255))
             content_surface.blit(header, (padding, y))
             y += header.get_height() + 4
 
             if discovered:
                 drop_lines = format_drop_table_lines(data.get("drop_table", []))
                 for line, colour in drop_lines:
-                    surf = self.font.render(line, True, colour)
+                    surf = render_text(self.font, line, colour)
                     content_surface.blit(surf, (padding, y))
                     y += surf.get_height() + 2
 
@@ -84,7 +86,7 @@ class BeastiaryUI(BaseUIPanel):
                         "required_states": {GameState.BEASTIARY}
                     })
             else:
-                hint = self.font.render("Find and defeat this enemy to log it.", True, (160, 160, 160))
+                hint = render_text(self.font, "Find and defeat this enemy to log it.", (160, 160, 160))
                 content_surface.blit(hint, (padding * 2, y))
                 y += hint.get_height() + 2
 
@@ -106,13 +108,13 @@ class BeastiaryUI(BaseUIPanel):
 
         draw_progress_bar(screen, bar_rect, progress, colour=(200, 160, 255), text=label, font=self.font)
 
-        if bar_rect.collidepoint(pygame.mouse.get_pos()):
+        if bar_rect.collidepoint(get_mouse_pos()):
             queue_tooltip({
                 "type": "total_beastiary",
                 "data": {
                     "label": "Beastiary Progress",
                     "level": total_level
                 },
-                "position": pygame.mouse.get_pos(),
+                "position": get_mouse_pos(),
                 "required_states": {GameState.BEASTIARY}
             })
\ No newline at end of file
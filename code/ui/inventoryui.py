@@ -8,6 +8,9 @@ from data.item_data import *
 from ui.tooltip_builder import *
 from ui.base_ui_panel import BaseUIPanel
 from data.enchantment_data import ENCHANTMENT_DATA
+from input_source import get_mouse_pos
+from text_cache import render_text
+from surface_pool import get_surface_pool
 
 INVENTORY_SORT_QTY_BTN_X = 340
 INVENTORY_SORT_QTY_BTN_Y = 90
@@ -102,7 +105,7 @@ class InventoryUI(BaseUIPanel):
 
     def draw(self, screen):
         self.hovered_item_id = None
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
 
         self.equip_rects.clear()
 
@@ -147,7 +150,7 @@ class InventoryUI(BaseUIPanel):
 
         self.item_rects = []
 
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
         local_mouse = to_panel_space(mouse_pos, self.panel.rect)
 
         content_area, content_surface, scroll_y = self.get_panel_scroll_context(screen)
@@ -204,7 +207,7 @@ class InventoryUI(BaseUIPanel):
                 item_colour = get_rarity_colour(item_rarity)
 
                 item_rect, delta_y = self.get_item_rect(y)
-                text = self.font.render(f"{item_name} x{count}", True, item_colour)
+                text = render_text(self.font, f"{item_name} x{count}", item_colour)
                 text_rect = self._get_centered_rect_around_text(text, (item_rect.x, item_rect.y))
 
                 if item_rect.collidepoint(local_mouse):
@@ -216,15 +219,16 @@ class InventoryUI(BaseUIPanel):
                 selected_item_id = self.player.inventory.hotbar[selected_index] if 0 <= selected_index < len(self.player.inventory.hotbar) else None
 
                 if item_id == selected_item_id:
-                    highlight = pygame.Surface((text_rect.width, text_rect.height), pygame.SRCALPHA)
+                    # One row-wide surface for every item; area crops it to the text.
+                    highlight = get_surface_pool().get((content_surface.get_width(), text_rect.height), pygame.SRCALPHA)
                     highlight.fill(INVENTORY_HOTBAR_SELECTED_HIGHLIGHT)
-                    content_surface.blit(highlight, (text_rect.x, text_rect.y))
+                    content_surface.blit(highlight, (text_rect.x, text_rect.y), pygame.Rect(0, 0, text_rect.width, text_rect.height))
 
                 self.item_rects.append((text_rect, item_id, category)) # pass the text rect rather than full width
 
                 for i, hotbar_item in enumerate(self.player.inventory.hotbar):
                     if hotbar_item == item_id:
-                        number_surf = self.font.render(str(i + 1), True, (255, 255, 255))
+                        number_surf = render_text(self.font, str(i + 1), (255, 255, 255))
                         content_surface.blit(number_surf, (item_rect.right - number_surf.get_width() - 4, item_rect.y + 2))
                         break
 
@@ -256,7 +260,7 @@ class InventoryUI(BaseUIPanel):
         pygame.draw.rect(surface, (20, 20, 20), (x, y, width, height))
         pygame.draw.rect(surface, (100, 100, 100), (x, y, width, height), 2)
 
-        label_surf = font.render("Equipped Items", True, (255, 255, 255))
+        label_surf = render_text(font, "Equipped Items", (255, 255, 255))
         surface.blit(label_surf, (x + 10, y + 10))
 
         rects = []
@@ -264,7 +268,7 @@ class InventoryUI(BaseUIPanel):
         slot_height = 36
         slot_y = y + 40
 
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
 
         for slot in player.equipment.SLOTS:
             label = f"{slot.title()}:"
@@ -303,7 +307,7 @@ class InventoryUI(BaseUIPanel):
                         "required_states": {GameState.INVENTORY}
                     })
 
-            text_surf = font.render(label, True, item_colour)
+            text_surf = render_text(font, label, item_colour)
 
             is_hovered = slot_rect.collidepoint(mouse_pos)
             if is_hovered:
@@ -319,12 +323,12 @@ class InventoryUI(BaseUIPanel):
         # Draw Active Effects below player stats
         y += 20  # spacing
         active_effects_label = f"Active Effects ({len(player.stats.active_effects)})"
-        active_effects_surf = font.render(active_effects_label, True, (255, 255, 255))
+        active_effects_surf = render_text(font, active_effects_label, (255, 255, 255))
         surface.blit(active_effects_surf, (x + 10, y))
 
         # Add hover detection
         active_effects_rect = pygame.Rect(x + 10, y, active_effects_surf.get_width(), active_effects_surf.get_height())
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
         if active_effects_rect.collidepoint(mouse_pos):
             # Build alphabetically sorted list of effect names
             effect_names = []
@@ -353,7 +357,7 @@ class InventoryUI(BaseUIPanel):
         return rects  # For hover detection
 
     def _draw_player_stats(self, surface, font, player, x, y, padding=10):
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
         
         stat_margin = 8
 
@@ -364,7 +368,7 @@ class InventoryUI(BaseUIPanel):
             colour = get_stat_colour(stat)
 
             text = f"{label}: {value_str}"
-            surf = font.render(text, True, colour)
+            surf = render_text(font, text, colour)
 
             # draw
             surface.blit(surf, (x + padding, y))
@@ -377,7 +381,7 @@ class InventoryUI(BaseUIPanel):
                     "data": {
                         "label": label,
                         "base": player.stats.base_stats[stat],
-                        "sources": player.stats.stat_sources.get(stat, []),
+                        "sources": player.stats.get_stat_sources(stat),
                     },
                     "position": (mouse_pos[0], mouse_pos[1]),
                     "required_states": {GameState.PLAYING, GameState.INVENTORY},
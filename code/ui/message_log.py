@@ -1,10 +1,12 @@
-import time
 import pygame
 
 from format import get_colour_for_type
 from ui.scrollable_panel import ScrollablePanel
 from constants import SCREEN_HEIGHT
 from draw_helpers import draw_typed_text
+from input_source import get_mouse_pos
+from game_clock import get_ticks
+from surface_pool import get_surface_pool
 
 class MessageLog:
     def __init__(self, font, max_history=100, fade_delay=5):
@@ -19,7 +21,7 @@ class MessageLog:
         self.fade_delay = fade_delay
 
         self.messages = []
-        self.last_message_time = 0
+        self.last_message_time = -fade_delay  # nothing queued yet, so the panel starts faded out
         self.entered_scroll_view = False
 
     def _resolve_colours(self, pairs):
@@ -27,7 +29,7 @@ class MessageLog:
 
     def _render_messages(self, messages, alpha, base_y, bottom_up=False):
         panel_rect = self.panel.rect
-        panel_surf = pygame.Surface((panel_rect.width, panel_rect.height), pygame.SRCALPHA)
+        panel_surf = get_surface_pool().get(panel_rect.size, pygame.SRCALPHA)
         panel_surf.fill((100, 100, 100, alpha * 50 // 255))
 
         y = base_y
@@ -50,7 +52,7 @@ class MessageLog:
         return panel_surf
 
     def _calculate_fade_alpha(self):
-        time_since = time.time() - self.last_message_time
+        time_since = get_ticks() / 1000 - self.last_message_time
         fade_duration = 1.0
 
         if time_since >= self.fade_delay:
@@ -72,7 +74,7 @@ class MessageLog:
         self.panel.scroll_offset = min(self.panel.scroll_offset, max_scroll)
 
     def queue(self, message):
-        self.last_message_time = time.time()
+        self.last_message_time = get_ticks() / 1000
 
         self.messages.append(self._resolve_colours(message))
         if len(self.messages) > self.max_history:
@@ -85,8 +87,8 @@ class MessageLog:
         pass
 
     def draw_floating(self, surface):
-        if self.panel.rect.collidepoint(pygame.mouse.get_pos()):
-            self.last_message_time = time.time()
+        if self.panel.rect.collidepoint(get_mouse_pos()):
+            self.last_message_time = get_ticks() / 1000
 
         alpha = self._calculate_fade_alpha()
         if alpha == 0:
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from data.item_data import ITEMS  # adjust path if needed
 from format import get_rarity_colour, get_colour_for_type
 from draw_helpers import draw_typed_text
+from game_clock import get_ticks
 
 @dataclass
 class PickupEntry:
@@ -19,7 +20,7 @@ class PickupLog:
         self.lifespan_ms = lifespan_ms
 
     def log(self, item_id, amount=1):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
 
         # Try to consolidate with recent identical entry
         for index, entry in enumerate(self.entries):
@@ -33,7 +34,7 @@ class PickupLog:
             self.entries.pop()
 
     def update(self):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
         self.entries = [
             entry for entry in self.entries
             if now - entry.timestamp < self.lifespan_ms
@@ -54,7 +55,7 @@ class PickupLog:
             draw_typed_text(surface, self.font, segments, x, y - index * 18, alpha=alpha)
     
     def _get_alpha(self, timestamp):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
         elapsed = now - timestamp
         remaining = self.lifespan_ms - elapsed
         fade_start = 1000  # Last second fades out
@@ -1,40 +1,108 @@
+from collections import deque
+
 import pygame
-import random
 
 from constants import FONT_SIZE
+from rng import get_rng
+from text_cache import blit_alpha, render_text, get_sys_font
+
+_rng = get_rng("effects")
 
-# Popups
+# Popups (times in seconds, speeds in px/second; tuned at 144 FPS)
 POPUP_DEFAULT_COLOUR = (255, 255, 255)
 POPUP_DAMAGE_COLOUR = (255, 255, 255)
 POPUP_CRIT_DAMAGE_COLOUR = (255, 255, 100)
-POPUP_DAMAGE_LIFETIME = 150
+POPUP_DAMAGE_LIFETIME = 150 / 144
 POPUP_CRIT_SIZE_BOOST = 10
-POPUP_DY = -0.4
+POPUP_DY = -0.4 * 144
+POPUP_JITTER = 5
+POPUP_MAX_ACTIVE = 4000  # oldest popups are recycled past this
+
+POPUP_LAYER_DAMAGE = 0
+POPUP_LAYER_XP = 1
 
 class Popup:
-    def __init__(self, x, y, text, colour=POPUP_DEFAULT_COLOUR, lifetime=POPUP_DAMAGE_LIFETIME, dy=POPUP_DY, font_size=FONT_SIZE):
-        self.x = x + random.randint(-5, 5)
-        self.y = y + random.randint(-5, 5)
+    __slots__ = ("x", "y", "text", "colour", "surface", "age", "lifetime", "dy")
+
+    def __init__(self):
+        self.surface = None
+
+    def reset(self, x, y, text, colour, lifetime, dy, font):
+        self.x = x + _rng.randint(-POPUP_JITTER, POPUP_JITTER)
+        self.y = y + _rng.randint(-POPUP_JITTER, POPUP_JITTER)
         self.text = str(text)
         self.colour = colour
-        self.lifetime_max = lifetime
+        self.surface = render_text(font, self.text, colour)
+        self.age = 0.0
         self.lifetime = lifetime
-        self.alpha = 255
         self.dy = dy
-        self.font = pygame.font.SysFont(None, font_size)
 
-    def update(self):
-        self.y += self.dy
-        self.lifetime -= 1
-        fade = max(0, self.lifetime / self.lifetime_max)
-        self.alpha = int(255 * fade**2)  # fade-out ease
-
-    def draw(self, surface, camera, font):
-        if self.lifetime > 0:
-            surf = self.font.render(self.text, True, self.colour)
-            faded = surf.convert_alpha()
-            faded.fill((255, 255, 255, self.alpha), special_flags=pygame.BLEND_RGBA_MULT)
-            surface.blit(faded, camera.apply((self.x, self.y)))
+    @property
+    def alpha(self):
+        fade = max(0.0, 1.0 - self.age / self.lifetime)
+        return int(255 * fade**2)  # fade-out ease
 
     def is_alive(self):
-        return self.lifetime > 0
+        return self.age < self.lifetime
+
+class PopupManager:
+    def __init__(self, max_active=POPUP_MAX_ACTIVE):
+        self.max_active = max_active
+        self.layers = (deque(), deque())  # drawn in order: damage numbers under XP popups; oldest first
+        self._free = []
+
+    def __len__(self):
+        return len(self.layers[POPUP_LAYER_DAMAGE]) + len(self.layers[POPUP_LAYER_XP])
+
+    def clear(self):
+        for layer in self.layers:
+            self._free.extend(layer)
+            layer.clear()
+
+    def spawn(self, x, y, text, colour=POPUP_DEFAULT_COLOUR, lifetime=POPUP_DAMAGE_LIFETIME, dy=POPUP_DY, font_size=FONT_SIZE, layer=POPUP_LAYER_DAMAGE):
+        popups = self.layers[layer]
+
+        if len(self) >= self.max_active:
+            oldest = popups if popups else self.layers[1 - layer]
+            popup = oldest.popleft()
+        elif self._free:
+            popup = self._free.pop()
+        else:
+            popup = Popup()
+
+        popup.reset(x, y, text, colour, lifetime, dy, get_sys_font(None, font_size))
+        popups.append(popup)
+        return popup
+
+    def spawn_damage(self, x, y, amount, colour=POPUP_DAMAGE_COLOUR):
+        return self.spawn(x, y, amount, colour)
+
+    def spawn_xp(self, x, y, label, colour):
+        return self.spawn(x, y, label, colour, layer=POPUP_LAYER_XP)
+
+    def update(self, dt):
+        free = self._free
+
+        for popups in self.layers:
+            # One pass round the deque: survivors go back on the end, keeping their order.
+            for _ in range(len(popups)):
+                popup = popups.popleft()
+                popup.age += dt
+                if popup.age < popup.lifetime:
+                    popup.y += popup.dy * dt
+                    popups.append(popup)
+                else:
+                    free.append(popup)
+
+    def draw(self, surface, camera):
+        offset_x, offset_y = camera.offset
+        width, height = surface.get_size()
+
+        for popups in self.layers:
+            for popup in popups:
+                x = popup.x + offset_x
+                y = popup.y + offset_y
+                if x >= width or y >= height or x + popup.surface.get_width() < 0 or y + popup.surface.get_height() < 0:
+                    continue
+
+                blit_alpha(surface, popup.surface, (x, y), popup.alpha)
@@ -6,6 +6,7 @@ from data.item_data import ITEMS
 from data.set_bonus_data import SET_BONUS_DATA
 from data.ability_data import ABILITY_DATA
 from data.counter_data import COUNTER_DATA
+from text_cache import render_text
 
 # Tooltip Styling
 TOOLTIP_BORDER_WIDTH = 1
@@ -595,12 +596,12 @@ def draw_tooltip_lines(screen, lines, font, pos):
 
     for line in lines:
         if isinstance(line, list):
-            parts = [(font.render(text, True, colour), colour) for text, colour in line]
+            parts = [(render_text(font, text, colour), colour) for text, colour in line]
             line_width = sum(part.get_width() for part, _ in parts)
             rendered_lines.append(parts)
         else:
             text, colour = line
-            part = font.render(text, True, colour)
+            part = render_text(font, text, colour)
             rendered_lines.append([(part, colour)])
             line_width = part.get_width()
 
@@ -1,12 +1,13 @@
 import pygame
 
 from gamestate import GameState
+from input_source import get_mouse_pos
 
 class TooltipContext:
     def __init__(self, *, font, player, pos=None, required_states=None, **kwargs):
         self.font = font
         self.player = player
-        self.pos = pos or pygame.mouse.get_pos()
+        self.pos = pos or get_mouse_pos()
         self.required_states = required_states or { GameState.PLAYING }
 
         # allow storing arbitrary extras like 'stat'
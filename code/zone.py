@@ -1,21 +1,46 @@
+import math
 import pygame
-import random
 
 from constants import *
 from utils import *
 from ui.tooltip_builder import *
 from enemy_classes import ENEMY_CLASSES
 from enemy import EnemyContext
-from particle import Particle
+from particle import ParticleSystem
+from spatial_grid import SpatialGrid
+from enemy_pool import EnemyPool
+from ai_lod import AILodScheduler, AI_LOD_MID
+from flow_field import FlowField
+from tile_grid import TileGrid
+from line_of_sight import LineOfSight
+from projectile import ProjectilePool
+from spawn_director import SpawnDirector, SPAWN_RESPAWN_DELAY, SPAWN_RATE
 from gamestate import GameState
 from utils import calculate_shake_intensity
 from data.ability_effects_data import ABILITY_EFFECTS_DATA
 from data.counter_data import COUNTER_DATA
+from data.obstacle_data import OBSTACLE_DATA
+from game_clock import get_ticks
+from input_source import get_mouse_pos
+from rng import get_rng
+from text_cache import blit_alpha, render_text
+from render_queue import get_render_queue
+from surface_pool import get_surface_pool
+
+ZONE_STATIC_CHUNK_SIZE = 512  # px; the static layer is pre-rendered lazily in square chunks
+PHOENIX_AURA_RING = ((255, 120, 0), 110, 4)  # colour, base radius, line width
+CLEAVE_RING = ((200, 0, 0), 2)  # colour, line width; the radius comes from ABILITY_DATA
+RING_FLICKER = 3  # rings flicker +-this many px, so that range of radii is pre-rendered
+ZONE_DRAW_MARGIN = 8  # px around the view, so HP bars poking out of an off-screen enemy still draw
+
+_combat_rng = get_rng("combat")
+_effects_rng = get_rng("effects")
 
 class Zone:
     def __init__(self, id, size, safe=True, num_enemies=0, enemy_spawn_table=[], num_resources=0, 
                  resource_node_spawn_table=[], connections=None, name="", 
-                 type="combat", requirements=None):
+                 type="combat", requirements=None, respawn_delay=SPAWN_RESPAWN_DELAY,
+                 spawn_rate=SPAWN_RATE, max_enemies=None, waves=None, obstacles=None):
         self.id = id
         self.size = size
         self.safe = safe
@@ -26,24 +51,68 @@ class Zone:
         self.type = type
         self.requirements = requirements
 
-        self.enemies = []
+        self.enemy_grid = SpatialGrid(size)
+        self.enemy_pool = EnemyPool(size)
+        self.flow_field = FlowField(size)
+
+        # Static obstacles: (rect, colour) for drawing, solid ones baked into tiles.
+        self.obstacles = []
+        solid_rects = []
+        for obstacle_type, x, y, w, h in obstacles or ():
+            data = OBSTACLE_DATA[obstacle_type]
+            rect = pygame.Rect(x, y, w, h)
+            self.obstacles.append((rect, data["colour"]))
+            if data.get("solid", True):
+                solid_rects.append(rect)
+
+        self.tiles = TileGrid.bake(size, solid_rects)
+        self.enemy_pool.tiles = self.tiles
+        if self.tiles.solid_tiles:
+            self.flow_field.set_blocked(self.tiles.downsample(self.flow_field.cell_size))
+        self.los = LineOfSight(self.tiles)
+        self.projectiles = ProjectilePool(size)
+        self.projectiles.tiles = self.tiles
+        self.dead_enemies = {}  # enemy id -> dead instances waiting to be reused
+        self.spawn_director = SpawnDirector(
+            self, enemy_spawn_table, respawn_delay=respawn_delay,
+            spawn_rate=spawn_rate, max_enemies=max_enemies, waves=waves
+        )
+        self.ai_lod = AILodScheduler()
         self.pending_enemy_results = []
 
         self.kill_counts = {}
 
         self.prepared = False
 
-        self.particles = []
+        self.particles = ParticleSystem()
 
         self.effect_hooks = []
 
+        # Floor, border, obstacles and portals, rendered once per portal lock state.
+        self._static_chunks = {}  # (chunk x, chunk y) -> Surface
+        self._static_locks = None
+        self._static_scale = 1.0
+
+    @property
+    def enemies(self):
+        # Live enemies, in pool slot order. Removal swaps the last enemy into the gap.
+        return self.enemy_pool.entities
+
     def prepare(self, player):
         if self.prepared:
             return
         
         self.prepared = True
-        self.spawn_initial_enemies(player)
+
+        pool = get_surface_pool()
+        colour, radius, width = PHOENIX_AURA_RING
+        pool.prerender_rings(colour, range(radius - RING_FLICKER, radius + RING_FLICKER + 1), width)
+        radius = ABILITY_DATA.get("cleave", {}).get("values", {}).get("radius", 100)
+        pool.prerender_rings(CLEAVE_RING[0], range(radius - RING_FLICKER, radius + RING_FLICKER + 1), CLEAVE_RING[1])
+
         self.create_portals()
+        self.spawn_director.prepare()
+        self.spawn_initial_enemies(player)
 
     def get_entry_point(self, exit_direction, margin=50):
         reverse = {
@@ -66,9 +135,8 @@ class Zone:
         else:
             return mid, mid  # Center fallback
 
-    def spawn_particles(self, x, y, colour, source_x, source_y, count, life_min, life_max, dt):
-        for _ in range(count):
-            self.particles.append(Particle(x, y, colour, source_x or x, source_y or y, life_min, life_max, dt))
+    def spawn_particles(self, x, y, colour, source_x, source_y, count, life_min, life_max):
+        self.particles.spawn(x, y, colour, source_x or x, source_y or y, count, life_min, life_max)
 
     def create_portals(self):
         margin = 16  
@@ -91,29 +159,28 @@ class Zone:
                 return False
         return True
 
-    def choose_enemy_type(self):
-        total = sum(weight for _, weight in self.enemy_spawn_table)
-        r = random.uniform(0, total)
-        accum = 0
-        for enemy_class, weight in self.enemy_spawn_table:
-            accum += weight
-            if r <= accum:
-                return enemy_class
-            
-        return self.enemy_spawn_table[0][0] # fallback
-
-    def spawn_enemy(self, player):
-        x = random.randint(0, self.size - 20)
-        y = random.randint(0, self.size - 20)
-        enemy_id = self.choose_enemy_type()
-        enemy_class = ENEMY_CLASSES[enemy_id]
-        enemy = enemy_class(x, y, player, self)
+    def spawn_enemy(self, player, enemy_id, x, y):
+        dead = self.dead_enemies.get(enemy_id)
+        if dead:
+            enemy = dead.pop()
+            enemy.reset(x, y, player)
+        else:
+            enemy = ENEMY_CLASSES[enemy_id](x, y, player, self)
+
+        self.enemy_grid.insert(enemy)
         return enemy
 
+    def despawn_enemy(self, enemy):
+        if enemy._pool is not self.enemy_pool:
+            return False  # already removed, e.g. killed twice in one flush
+
+        self.enemy_grid.remove(enemy)
+        self.enemy_pool.remove(enemy)
+        self.dead_enemies.setdefault(enemy.id, []).append(enemy)
+        return True
+
     def spawn_initial_enemies(self, player):
-        for _ in range(self.num_enemies):
-            enemy = self.spawn_enemy(player)
-            self.enemies.append(enemy)
+        self.spawn_director.spawn_initial(player)
 
     def check_portal_trigger(self, player, zones_by_id):
         for direction, rect in self.portals.items():
@@ -136,7 +203,7 @@ class Zone:
 
         crit = False
         if context["crit_chance"] > 0:
-            if random.random() < context["crit_chance"] / 100:
+            if _combat_rng.random() < context["crit_chance"] / 100:
                 damage *= 1 + context["crit_damage"] / 100
                 crit = True
 
@@ -146,7 +213,7 @@ class Zone:
         direction = pygame.Vector2(target.rect.center) - pygame.Vector2(player.rect.center)
         return direction.normalize() * knockback if direction.length_squared() > 0 else pygame.Vector2(0, 0)
 
-    def _spawn_combat_effects(self, camera, player, target, damage, crit, dt):
+    def _spawn_combat_effects(self, camera, player, target, damage, crit):
         if camera:
             camera.shake(calculate_shake_intensity(damage, crit), duration=0.2)
 
@@ -158,8 +225,7 @@ class Zone:
             source_y=player.pos.y,
             count=10,
             life_min=0.2,
-            life_max=0.3,
-            dt=dt
+            life_max=0.3
         )
 
     def process_combat(self, player, target, item, camera, dt):
@@ -176,7 +242,7 @@ class Zone:
             "effect_hooks": [],
             "zone": self,
             "dt": dt,
-            "mouse_pos": pygame.mouse.get_pos(),
+            "mouse_pos": get_mouse_pos(),
         }
 
         player.combat.apply_combat_phase("pre_damage", context)
@@ -199,7 +265,7 @@ class Zone:
         player.combat.apply_combat_phase("post_damage", context)
         self.effect_hooks.extend(context.get("effect_hooks", []))
 
-        self._spawn_combat_effects(camera, player, target, final_damage, result.final_hit, dt)
+        self._spawn_combat_effects(camera, player, target, final_damage, result.final_hit)
 
         if result.final_hit:
             player.combat.apply_combat_phase("on_kill", context)
@@ -232,56 +298,114 @@ class Zone:
                             counters["xp"] = counters.get("xp", 0) + result.final_xp.get("combat", 0)
                         player.update_active_item_metadata(metadata)
 
-            if result.final_hit:
-                self.enemies.remove(result.target)
-                self.enemies.append(self.spawn_enemy(result.attacker))
+            if result.final_hit and self.despawn_enemy(result.target):
+                self.spawn_director.on_kill(result.target)
 
         self.pending_enemy_results.clear()
 
     def update(self, dt, player, camera, sound_manager):
-        now = pygame.time.get_ticks()
+        now = get_ticks()
 
         self.effect_hooks = [
             hook for hook in self.effect_hooks
             if now - hook["start_time"] < ABILITY_EFFECTS_DATA.get(hook["type"], {}).get("duration", 1000)
         ]
 
+        self.spawn_director.update(player, now)
+        self.flow_field.update(*player.rect.center)
+
+        # Aggro checks in the FSM states hit this frame's LOS cache, answered in one batch.
+        self.los.new_frame()
+        if self.tiles.solid_tiles:
+            self.los.prime(self.enemy_pool, *player.rect.center)
+
         ctx = EnemyContext(self, player, camera, self.size)
         ctx.sound_manager = sound_manager
 
-        for enemy in self.enemies:
-            enemy.update(dt, ctx)
+        pooled = self.enemy_pool.entities
+        slots, dts = self.ai_lod.schedule(self.enemy_pool, dt, player.rect.center, camera)
+        for slot, enemy_dt in zip(slots, dts):
+            pooled[slot].update(enemy_dt, ctx)
 
-        for p in self.particles:
-            p.update(dt)
-        self.particles = [p for p in self.particles if not p.is_dead()]
+        # Far, off-screen enemies skip crowd separation; nobody sees them overlap.
+        separate = self.ai_lod.slots_within(AI_LOD_MID)
+        contact, moved = self.enemy_pool.step(dt, player.rect.center, separate)
 
-    def draw_portals(self, surface, camera, font, player, zones_by_id):
-        mouse_pos = pygame.mouse.get_pos()
-        
-        for direction, rect in self.portals.items():
-            # Get target zone
-            target_zone_id = self.connections.get(direction)
-            target_zone = zones_by_id.get(target_zone_id)
+        for slot in contact:
+            pooled[slot]._try_deal_contact_damage(player)
 
-            if not target_zone:
-                continue
+        for slot in moved:
+            enemy = pooled[slot]
+            enemy._sync_rect_to_pos()
+            self.enemy_grid.move(enemy)
+
+        self.projectiles.update(dt, player)
+        self.particles.update(dt)
 
-            screen_rect = camera.apply(rect)
+    def _portal_locks(self, player, zones_by_id):
+        """((direction, locked), ...) for every portal leading to a known zone."""
+        locks = []
+        for direction in self.portals:
+            target_zone = zones_by_id.get(self.connections.get(direction))
+            if target_zone:
+                locks.append((direction, not target_zone.player_meets_requirements(player)))
+        return tuple(locks)
 
-            locked = not target_zone.player_meets_requirements(player) if target_zone else False
-            colour = (255, 0, 0) if locked else (255, 255, 0)
+    def _render_static_chunk(self, chunk_rect):
+        surface = pygame.Surface(chunk_rect.size)
+        offset = (-chunk_rect.x, -chunk_rect.y)
 
-            # draw the portal
-            pygame.draw.rect(surface, colour, screen_rect, 2)
+        surface.fill((50, 50, 50))  # floor
+        pygame.draw.rect(surface, (200, 50, 50), pygame.Rect(0, 0, self.size, self.size).move(offset), 4)  # border
+
+        for rect, colour in self.obstacles:
+            if rect.colliderect(chunk_rect):
+                pygame.draw.rect(surface, colour, rect.move(offset))
+
+        for direction, locked in self._static_locks:
+            rect = self.portals[direction].move(offset)
+            pygame.draw.rect(surface, (255, 0, 0) if locked else (255, 255, 0), rect, 2)
 
             # mask with red tint if locked
             if locked:
-                overlay = pygame.Surface(screen_rect.size, pygame.SRCALPHA)
+                overlay = pygame.Surface(rect.size, pygame.SRCALPHA)
                 overlay.fill((255, 0, 0, 100))
-                surface.blit(overlay, screen_rect.topleft)
+                surface.blit(overlay, rect.topleft)
+
+        return surface
+
+    def draw_static_layer(self, surface, camera, player, zones_by_id):
+        locks = self._portal_locks(player, zones_by_id)
+        if locks != self._static_locks or camera.scale != self._static_scale:
+            self._static_chunks.clear()
+            self._static_locks = locks
+            self._static_scale = camera.scale
+
+        view = camera.view_rect().clip(pygame.Rect(0, 0, self.size, self.size))
+        if not view:
+            return
+
+        size = ZONE_STATIC_CHUNK_SIZE
+        for cy in range(view.top // size, (view.bottom - 1) // size + 1):
+            for cx in range(view.left // size, (view.right - 1) // size + 1):
+                chunk_rect = pygame.Rect(cx * size, cy * size, size, size).clip(0, 0, self.size, self.size)
+                chunk = self._static_chunks.get((cx, cy))
+                if chunk is None:
+                    chunk = self._render_static_chunk(chunk_rect)
+                    if camera.scale != 1.0:
+                        # Rounded up so neighbouring chunks never leave a gap between them.
+                        scaled = (math.ceil(chunk_rect.w * camera.scale), math.ceil(chunk_rect.h * camera.scale))
+                        chunk = pygame.transform.scale(chunk, scaled)
+                    self._static_chunks[(cx, cy)] = chunk
+                surface.blit(chunk, camera.apply(chunk_rect).topleft)
+
+    def queue_portal_tooltips(self, camera, zones_by_id):
+        mouse_pos = get_mouse_pos()
+        mouse_world = (mouse_pos[0] - camera.offset.x, mouse_pos[1] - camera.offset.y)
 
-            if screen_rect.collidepoint(mouse_pos):
+        for direction, rect in self.portals.items():
+            target_zone = zones_by_id.get(self.connections.get(direction))
+            if target_zone and rect.collidepoint(mouse_world):
                 queue_tooltip({
                     "type": "portal",
                     "data": {
@@ -295,12 +419,18 @@ class Zone:
     def queue_effect(self, effect_id, extra_data):
         hook = {
             "type": effect_id,
-            "start_time": pygame.time.get_ticks(),
+            "start_time": get_ticks(),
         }
         if extra_data:
             hook.update(extra_data)
         self.effect_hooks.append(hook)
 
+    def _ring_sprite(self, colour, radius, width, scale):
+        if scale != 1.0:
+            radius = max(1, round(radius * scale))
+            width = max(1, round(width * scale))
+        return get_surface_pool().ring(colour, radius, width)
+
     def render_effect_hooks(self, screen, camera, font, player, sound_manager):
         # Draw fiery ring around player if phoenix_aura is active
         has_phoenix_aura = any(
@@ -311,21 +441,19 @@ class Zone:
         if has_phoenix_aura:
             player_pos = camera.reverse(player.rect.center)
             # Flicker radius slightly for visual effect
-            base_radius = 110
-            radius_variation = random.randint(-3, 3)
+            colour, base_radius, width = PHOENIX_AURA_RING
+            radius_variation = _effects_rng.randint(-RING_FLICKER, RING_FLICKER)
             radius = base_radius + radius_variation
 
             # Flicker alpha slightly
-            alpha = random.randint(100, 200)
-
-            # Create surface for the ring
-            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (255, 120, 0, alpha), (radius, radius), radius, width=4)
+            alpha = _effects_rng.randint(100, 200)
 
-            # Blit centered on player
+            # Blit the cached ring centered on player
+            surf = self._ring_sprite(colour, radius, width, camera.scale)
             rect = surf.get_rect(center=player_pos)
-            screen.blit(surf, rect.topleft)
+            blit_alpha(screen, surf, rect.topleft, alpha)
 
+        view = camera.view_rect().inflate(ZONE_DRAW_MARGIN * 2, ZONE_DRAW_MARGIN * 2)
         for hook in self.effect_hooks:
             effect_id = hook["type"]
             data = ABILITY_EFFECTS_DATA.get(effect_id)
@@ -340,14 +468,16 @@ class Zone:
             extra_data = data.get("extra_data", {})
 
             if effect_id == "chain_lightning":
+                if not view.clipline(hook["from_pos"], hook["to_pos"]):
+                    continue
                 from_pos = camera.reverse(hook["from_pos"])
                 to_pos = camera.reverse(hook["to_pos"])
                 colour = extra_data.get("colour", (255, 255, 255))
                 jitter_lines = extra_data.get("jitter_lines", 3)
 
                 for _ in range(jitter_lines):
-                    offset_x = random.randint(-3, 3)
-                    offset_y = random.randint(-3, 3)
+                    offset_x = _effects_rng.randint(-3, 3)
+                    offset_y = _effects_rng.randint(-3, 3)
                     pygame.draw.line(
                         screen,
                         colour,
@@ -371,24 +501,23 @@ class Zone:
                     source_y=None,
                     count=count,
                     life_min=life_min,
-                    life_max=life_max,
-                    dt=0.016
+                    life_max=life_max
                 )
 
             elif effect_id == "cleave":
                 x, y = hook["x"], hook["y"]
                 radius = ABILITY_DATA.get("cleave", {}).get("values", {}).get("radius", 100)
+                if not view.colliderect(x - radius, y - radius, radius * 2, radius * 2):
+                    continue
 
                 # Flickering red ring
-                base_colour = (200, 0, 0)
-                alpha = random.randint(120, 200)
-                flicker = random.randint(-3, 3)
+                base_colour, width = CLEAVE_RING
+                alpha = _effects_rng.randint(120, 200)
+                flicker = _effects_rng.randint(-RING_FLICKER, RING_FLICKER)
                 radius += flicker
 
-                surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, (*base_colour, alpha), (radius, radius), radius, width=2)
-
-                screen.blit(surf, camera.apply(pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)).topleft)
+                surf = self._ring_sprite(base_colour, radius, width, camera.scale)
+                blit_alpha(screen, surf, camera.apply(pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)).topleft, alpha)
                 
             elif effect_id == "cleave_hit":
                 x, y = hook["x"], hook["y"]
@@ -402,59 +531,74 @@ class Zone:
                     source_x=None, source_y=None,
                     count=count,
                     life_min=life_min,
-                    life_max=life_max,
-                    dt=0.016
+                    life_max=life_max
                 )
 
 
-    def _draw_enemy_label(self, screen, camera, font, player, enemy):
+    def _draw_enemy_label(self, screen, camera, font, player, enemy, dist, max_dist):
         enemy_screen_rect = camera.apply(enemy.rect)
         label_text = f"[Lv. {enemy.level}] {enemy.name}"
 
-        dist = player.distance_to(enemy)
-
-        max_dist = 300
-        if dist > max_dist:
-            return
-        
         min_alpha = 0  # lowest alpha
         alpha = max(min_alpha, 255 - int((dist / max_dist) * 255))
 
         player_level = player.skills.get_skill_level("combat")
         colour = get_enemy_level_colour(enemy.level, player_level)
 
-        font_surf = font.render(label_text, True, colour)
-        font_surf.set_alpha(alpha)
+        font_surf = render_text(font, label_text, colour)
 
         label_x = enemy_screen_rect.centerx - font_surf.get_width() // 2
         label_y = enemy_screen_rect.top - font_surf.get_height() - 4
-        screen.blit(font_surf, (label_x, label_y))
-
-    def draw(self, screen, camera, font, player, zones_by_id, sound_manager):
-        zone_rect = pygame.Rect(0, 0, self.size, self.size)
-        pygame.draw.rect(screen, (50, 50, 50), camera.apply(zone_rect))  # fill
-        pygame.draw.rect(screen, (200, 50, 50), camera.apply(zone_rect), 4)  # border
-
-        for enemy in self.enemies:
-            enemy.draw(screen, camera, font)
-
-            if camera.apply(enemy.rect).collidepoint(pygame.mouse.get_pos()):
-                queue_tooltip({
-                    "type": "enemy",
-                    "data": {
-                        "enemy_label": [enemy.level, enemy.name],
-                        "hp": enemy.combat.hp,
-                        "drop_table": enemy.drop_table
-                    },
-                    "position": pygame.mouse.get_pos(),
-                    "required_states": {GameState.PLAYING}
-                })
-
-            self._draw_enemy_label(screen, camera, font, player, enemy)
-
-        self.draw_portals(screen, camera, font, player, zones_by_id)
-
-        for p in self.particles:
-            p.draw(screen, camera)
-
-        self.render_effect_hooks(screen, camera, font, player, sound_manager)
\ No newline at end of file
+        blit_alpha(screen, font_surf, (label_x, label_y), alpha)
+
+    def draw_enemy_labels(self, screen, camera, font, player):
+        label_max_dist = 300
+        px, py = player.rect.center
+        for enemy in self.enemy_grid.query_radius(px, py, label_max_dist):
+            ex, ey = enemy.rect.center
+            dist = math.hypot(ex - px, ey - py)
+            self._draw_enemy_label(screen, camera, font, player, enemy, dist, label_max_dist)
+
+    def draw(self, screen, camera, font, player, zones_by_id):
+        self.draw_static_layer(screen, camera, player, zones_by_id)
+
+        view = camera.view_rect()
+        # Only what the grid finds on screen is drawn, however big the zone's population.
+        margin = ZONE_DRAW_MARGIN
+        if DEBUG_DRAW_ATTACK_RADIUS and len(self.enemy_pool):
+            margin += int(self.enemy_pool.attack_radius[:len(self.enemy_pool)].max())
+        visible = self.enemy_grid.query_rect(view.inflate(margin * 2, margin * 2))
+        queue = get_render_queue()
+        for enemy in visible:
+            enemy.submit_sprites(queue)
+        queue.flush(screen, camera)
+
+        if DEBUG_DRAW_ATTACK_RADIUS:
+            for enemy in visible:
+                enemy.debug_draw_attack_radius(screen, camera)
+
+        self.projectiles.draw(screen, camera)
+
+        mouse_pos = get_mouse_pos()
+        mouse_world_x = mouse_pos[0] - camera.offset.x
+        mouse_world_y = mouse_pos[1] - camera.offset.y
+
+        for enemy in self.enemy_grid.query_point(mouse_world_x, mouse_world_y):
+            queue_tooltip({
+                "type": "enemy",
+                "data": {
+                    "enemy_label": [enemy.level, enemy.name],
+                    "hp": enemy.combat.hp,
+                    "drop_table": enemy.drop_table
+                },
+                "position": mouse_pos,
+                "required_states": {GameState.PLAYING}
+            })
+
+        # Below render scale 1 labels are drawn after the upscale so text stays crisp.
+        if camera.scale == 1.0:
+            self.draw_enemy_labels(screen, camera, font, player)
+
+        self.queue_portal_tooltips(camera, zones_by_id)
+
+        self.particles.draw(screen, camera)
\ No newline at end of file
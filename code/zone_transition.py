@@ -1,4 +1,6 @@
 import pygame
+from text_cache import blit_alpha, render_text
+from surface_pool import get_surface_pool
 
 class ZoneTransition:
     def __init__(self, viewport_width, viewport_height, font, subtitle_font):
@@ -76,32 +78,29 @@ class ZoneTransition:
     def draw(self, screen):
         # Fade rectangle
         if self.alpha > 0:
-            fade_surface = pygame.Surface((self.viewport_width, self.viewport_height), pygame.SRCALPHA)
+            fade_surface = get_surface_pool().get((self.viewport_width, self.viewport_height), pygame.SRCALPHA)
             fade_surface.fill((0, 0, 0, self.alpha))
             screen.blit(fade_surface, (0, 0))
 
         # Zone title
         if self.zone_title_alpha > 0 and self.current_zone_name:
-            title_surf = self.font.render(self.current_zone_name, True, (255, 255, 255))
-            title_surf.set_alpha(self.zone_title_alpha)
+            title_surf = render_text(self.font, self.current_zone_name, (255, 255, 255))
             title_rect = title_surf.get_rect(center=(self.viewport_width // 2, self.viewport_height // 4))
-            screen.blit(title_surf, title_rect)
+            blit_alpha(screen, title_surf, title_rect, self.zone_title_alpha)
 
         # Boss intro
         if self.boss_intro_data and self.boss_intro_alpha > 0:
             name, subtitle = self.boss_intro_data
 
             # Name
-            name_surf = self.font.render(name, True, (255, 255, 255))
-            name_surf.set_alpha(self.boss_intro_alpha)
+            name_surf = render_text(self.font, name, (255, 255, 255))
             name_rect = name_surf.get_rect(center=(self.viewport_width // 2, self.viewport_height // 3))
-            screen.blit(name_surf, name_rect)
+            blit_alpha(screen, name_surf, name_rect, self.boss_intro_alpha)
 
             # Subtitle
-            subtitle_surf = self.subtitle_font.render(subtitle, True, (200, 200, 200))
-            subtitle_surf.set_alpha(self.boss_intro_alpha)
+            subtitle_surf = render_text(self.subtitle_font, subtitle, (200, 200, 200))
             subtitle_rect = subtitle_surf.get_rect(center=(self.viewport_width // 2, self.viewport_height // 3 + self.font.get_height()))
-            screen.blit(subtitle_surf, subtitle_rect)
+            blit_alpha(screen, subtitle_surf, subtitle_rect, self.boss_intro_alpha)
 
     def is_active(self):
         return self.direction != 0